@@ -0,0 +1,92 @@
+"""Synthetic slide decks for benchmarks.
+
+Usage: python benchmarks/deck_generator.py OUTPUT_DIR [--slides 200] [--size 2400]
+"""
+
+import argparse
+import os
+import random
+
+from PIL import Image
+
+SEED = 42
+
+WORDS = (
+    "Pipeline Qualität Sicherheit Tests Feedback Build Review Deployment "
+    "Container Abhängigkeiten Shift Left Steroide Entwickler Automatisierung "
+    "Linting Coverage Secrets Scanner Policy Artefakt Release Monitoring"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _slide(rng: random.Random, num: int, images: list[str]) -> str:
+    blocks = [f"# Folie {num}: {_sentence(rng, 3)[:-1]}", _sentence(rng, 14)]
+    kind = num % 5
+    if kind == 0:
+        blocks.append("\n".join(f"- {_sentence(rng, 6)}" for _ in range(5)))
+    elif kind == 1:
+        rows = ["| Stufe | Dauer | Befund |", "|---|---|---|"]
+        rows += [
+            f"| {rng.choice(WORDS)} | {rng.randint(1, 90)}s | ok |" for _ in range(6)
+        ]
+        blocks.append("\n".join(rows))
+    elif kind == 2:
+        code = "\n".join(f"step_{i} = run('{rng.choice(WORDS)}')" for i in range(8))
+        blocks.append(f"```python\n{code}\n```")
+    elif kind == 3:
+        blocks.append("\n".join(f"{i}. {_sentence(rng, 5)}" for i in range(1, 6)))
+    else:
+        blocks.append(f"> {_sentence(rng, 20)}")
+    blocks.extend(f"![Abbildung](images/{name})" for name in images)
+    return "\n\n".join(blocks) + "\n"
+
+
+def _image_pool(images_dir: str, count: int, image_size: int) -> list[str]:
+    os.makedirs(images_dir, exist_ok=True)
+    pool = []
+    for i in range(count):
+        name = f"bench-{i:03d}.jpg"
+        # Rauschen komprimiert schlecht: realistischer Worst Case für Fotos
+        img = Image.effect_noise((image_size, image_size * 3 // 4), 40 + i % 40)
+        img.convert("RGB").save(os.path.join(images_dir, name), quality=90)
+        pool.append(name)
+    return pool
+
+
+def generate_deck(
+    slides_dir: str,
+    slides: int,
+    images_per_slide: int = 1,
+    image_size: int = 2400,
+    distinct_images: int = 20,
+):
+    """Write ``slides`` Markdown slides and their JPEG images to ``slides_dir``.
+
+    At most ``distinct_images`` image files are generated and reused across
+    slides, which keeps generating large decks fast. Output is deterministic.
+    """
+    rng = random.Random(SEED)
+    count = min(distinct_images, slides * images_per_slide)
+    pool = _image_pool(os.path.join(slides_dir, "images"), count, image_size)
+    for num in range(1, slides + 1):
+        images = [pool[(num + i) % len(pool)] for i in range(images_per_slide)]
+        path = os.path.join(slides_dir, f"{num:04d}_slide.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(_slide(rng, num, images if pool else []))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output_dir")
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--images", type=int, default=1, help="images per slide")
+    parser.add_argument("--size", type=int, default=2400, help="image width in px")
+    args = parser.parse_args()
+    generate_deck(args.output_dir, args.slides, args.images, args.size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Peak memory of a PDF export for a synthetic, image-heavy deck.
+
+Usage: python benchmarks/pdf_memory.py [--slides 40] [--images 2] [--size 2400]
+
+Reports wall time, the Python heap peak (tracemalloc) and the peak RSS
+(VmHWM, see rss.py) of this process and of the largest render worker.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from deck_generator import generate_deck
+from rss import ChildPeakRss, peak_rss_mb
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slides", type=int, default=40)
+    parser.add_argument("--images", type=int, default=2, help="images per slide")
+    parser.add_argument("--size", type=int, default=2400, help="image width in px")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        slides_dir = os.path.join(temp_dir, "slides")
+        generate_deck(
+            slides_dir, args.slides, args.images, args.size, args.slides * args.images
+        )
+        os.environ["PDF_CACHE_DIR"] = os.path.join(temp_dir, "pdf-cache")
+        os.environ["ASSET_CACHE_DIR"] = os.path.join(temp_dir, "asset-cache")
+
+        sys.path.insert(0, SRC_DIR)
+        import app  # pylint: disable=import-outside-toplevel
+
+        rss_before = peak_rss_mb()
+        tracemalloc.start()
+        start = time.perf_counter()
+        with ChildPeakRss() as workers:
+            app.schedule_pdf_build(slides_dir).result()
+        elapsed = time.perf_counter() - start
+        _, heap_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        key = app.deck_version(slides_dir)
+        pdf_size = os.path.getsize(app.PDF_CACHE.path(key))
+        self_rss = peak_rss_mb()
+
+    print(f"slides:              {args.slides} x {args.images} images")
+    print(f"export time:         {elapsed:.2f} s")
+    print(f"pdf size:            {pdf_size / 2**20:.1f} MiB")
+    print(f"python heap peak:    {heap_peak / 2**20:.1f} MiB")
+    print(f"peak rss (process):  {self_rss:.1f} MiB (before: {rss_before:.1f})")
+    print(f"peak rss (worker):   {workers.peak_mb:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
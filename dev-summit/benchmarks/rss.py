@@ -0,0 +1,65 @@
+"""Peak resident set size of a process, read from /proc.
+
+``getrusage().ru_maxrss`` is inherited across fork and exec, so a freshly
+spawned child would report its parent's high-water mark. ``VmHWM`` in
+/proc/<pid>/status starts over with every exec.
+"""
+
+import os
+import threading
+
+
+def peak_rss_mb(pid="self") -> float | None:
+    """``VmHWM`` of ``pid`` in MiB, ``None`` if the process is gone."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024  # Angabe in kB
+    except (FileNotFoundError, ProcessLookupError):
+        pass
+    return None
+
+
+def _children(parent: int) -> list[int]:
+    children = []
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", encoding="ascii") as f:
+                # PPid ist Feld 4; der Name in Klammern kann Leerzeichen enthalten
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (FileNotFoundError, ProcessLookupError, IndexError, ValueError):
+            continue
+        if ppid == parent:
+            children.append(int(name))
+    return children
+
+
+class ChildPeakRss:
+    """Samples the peak RSS of every child process while the context is active.
+
+    Children are polled every ``interval`` seconds; the largest ``VmHWM``
+    seen for a single child is available as :attr:`peak_mb`.
+    """
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        parent = os.getpid()
+        while not self._stop.wait(self.interval):
+            for pid in _children(parent):
+                self.peak_mb = max(self.peak_mb, peak_rss_mb(pid) or 0.0)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
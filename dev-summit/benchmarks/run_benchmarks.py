@@ -0,0 +1,271 @@
+"""Benchmark suite with stored baselines and regression thresholds.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 10,200] [--update-baseline]
+
+For every deck size a synthetic deck is generated and each scenario runs in a
+fresh interpreter, so "cold" really means empty in-process caches. Peak RSS
+is VmHWM of the scenario process, which starts over with its exec (unlike
+ru_maxrss, which would include the runner's own deck generation).
+
+Results are compared with benchmarks/baselines.json; a metric that got worse
+than its baseline by more than --threshold (default 25%) and --min-delta makes
+the run fail. Baselines are only meaningful for the host they were recorded on.
+A scenario that crashes or runs longer than --timeout is reported as failed and
+also fails the run.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from deck_generator import generate_deck
+from rss import peak_rss_mb
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, "..", "src")
+BASELINES = os.path.join(BENCH_DIR, "baselines.json")
+SLIDE_REQUESTS = 200
+QR_CODES = 50
+STARTUP_RUNS = 5
+# Obergrenze pro Szenario und Deckgröße in Sekunden
+SCENARIO_TIMEOUT = 1800
+
+
+def _percentile(values, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_show_slide() -> dict:
+    import app  # pylint: disable=import-outside-toplevel
+
+    client = app.app.test_client()
+    total = len(app.get_slide_files())
+    cold = _timed(lambda: client.get("/slide/1"))
+    rng = random.Random(1)
+    warm = [
+        _timed(lambda: client.get(f"/slide/{rng.randint(1, total)}"))
+        for _ in range(SLIDE_REQUESTS)
+    ]
+    return {
+        "show_slide.cold_ms": cold,
+        "show_slide.p50_ms": statistics.median(warm),
+        "show_slide.p95_ms": _percentile(warm, 0.95),
+        "show_slide.peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def bench_export_pdf() -> dict:
+    import app  # pylint: disable=import-outside-toplevel
+
+    app.PDF_WAIT_SECONDS = 3600
+    client = app.app.test_client()
+
+    def export():
+        response = client.get("/export/pdf")
+        assert response.status_code == 200, response.status_code
+        response.close()
+
+    return {
+        "export_pdf.cold_ms": _timed(export),
+        "export_pdf.warm_ms": _timed(export),
+        "export_pdf.peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def bench_qr_code() -> dict:
+    from qr_codes import generate_qr_code  # pylint: disable=import-outside-toplevel
+
+    urls = [f"https://host-{i}.example.com/export/pdf" for i in range(QR_CODES)]
+    cold = [_timed(lambda url=url: generate_qr_code(url, "svg")) for url in urls]
+    warm = [_timed(lambda url=url: generate_qr_code(url, "svg")) for url in urls]
+    return {
+        "qr_code.cold_ms": statistics.mean(cold),
+        "qr_code.warm_ms": statistics.mean(warm),
+    }
+
+
+def bench_static_export() -> dict:
+    import generate_static  # pylint: disable=import-outside-toplevel
+
+    return {
+        "static_export.cold_ms": _timed(generate_static.render_static_html),
+        "static_export.noop_ms": _timed(generate_static.render_static_html),
+        "static_export.peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _startup_ms(code: str) -> float:
+    # Frischer Interpreter pro Lauf: misst Import-Zeit ohne warme Module
+    runs = []
+    for _ in range(STARTUP_RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, check=True)
+        runs.append((time.perf_counter() - start) * 1000)
+    return statistics.median(runs)
+
+
+def bench_startup() -> dict:
+    first_slide = "; ".join(
+        [
+            "import app",
+            "assert app.app.test_client().get('/slide/1').status_code == 200",
+        ]
+    )
+    return {
+        "startup.interpreter_ms": _startup_ms("pass"),
+        "startup.import_app_ms": _startup_ms("import app"),
+        "startup.first_slide_ms": _startup_ms(first_slide),
+        "startup.import_generate_static_ms": _startup_ms("import generate_static"),
+    }
+
+
+SCENARIOS = {
+    "startup": bench_startup,
+    "show_slide": bench_show_slide,
+    "export_pdf": bench_export_pdf,
+    "qr_code": bench_qr_code,
+    "static_export": bench_static_export,
+}
+
+
+def _run_scenario(name: str, slides_dir: str, work_dir: str, results):
+    # Eigene Caches pro Szenario, damit "cold" wirklich kalt ist
+    os.environ.update(
+        {
+            "SLIDES_DIR": slides_dir,
+            "OUTPUT_DIR": os.path.join(work_dir, "docs"),
+            "PDF_CACHE_DIR": os.path.join(work_dir, "pdf-cache"),
+            "ASSET_CACHE_DIR": os.path.join(work_dir, "asset-cache"),
+            "PDF_WARMUP": "false",
+        }
+    )
+    sys.path.insert(0, SRC_DIR)
+    results.put(SCENARIOS[name]())
+
+
+def _run_isolated(context, name, slides_dir, work_dir, timeout: float):
+    """Run one scenario in a fresh interpreter; returns (metrics, failure)."""
+    channel = context.Queue()
+    process = context.Process(
+        target=_run_scenario, args=(name, slides_dir, work_dir, channel)
+    )
+    process.start()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            metrics = channel.get(timeout=1)
+            break
+        except queue.Empty:
+            # Abgestürzt (kein Ergebnis mehr zu erwarten) oder hängt
+            if not process.is_alive():
+                process.join()
+                if channel.empty():
+                    return None, f"exit code {process.exitcode}"
+            if time.monotonic() > deadline:
+                process.terminate()
+                process.join()
+                return None, f"timed out after {timeout:.0f} s"
+    process.join()
+    return metrics, None
+
+
+def run(sizes, scenarios, image_size: int, timeout: float = SCENARIO_TIMEOUT):
+    """Run every scenario per deck size; returns the results and failed runs."""
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    failures = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            slides_dir = os.path.join(temp_dir, "slides")
+            generate_deck(slides_dir, size, image_size=image_size)
+            for name in scenarios:
+                metrics, failure = _run_isolated(
+                    context, name, slides_dir, os.path.join(temp_dir, name), timeout
+                )
+                if failure is not None:
+                    failures.append(f"{name}@{size}: {failure}")
+                    print(f"{name}@{size}: FAILED ({failure})", flush=True)
+                    continue
+                for metric, value in metrics.items():
+                    results[f"{metric}@{size}"] = round(value, 3)
+                    print(f"{metric}@{size}: {value:.2f}", flush=True)
+    return results, failures
+
+
+def compare(
+    results: dict, baselines: dict, threshold: float, min_delta: float
+) -> list[str]:
+    """Return a message for every metric worse than baseline * (1 + threshold).
+
+    Differences below ``min_delta`` (ms or MiB) are ignored as noise.
+    """
+    regressions = []
+    for metric, value in sorted(results.items()):
+        baseline = baselines.get(metric)
+        if baseline is None:
+            continue
+        if value - baseline > max(baseline * threshold, min_delta):
+            change = (value / baseline - 1) * 100 if baseline else float("inf")
+            regressions.append(
+                f"{metric}: {value:.2f} vs {baseline:.2f} (+{change:.0f}%)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,200", help="e.g. 10,200,2000")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--image-size", type=int, default=2400)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--min-delta", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=SCENARIO_TIMEOUT)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results, failures = run(
+        sizes, args.scenarios.split(","), args.image_size, args.timeout
+    )
+    if failures:
+        print("Failed scenarios:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES, encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    if args.update_baseline:
+        baselines.update(results)
+        with open(BASELINES, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baselines written to {BASELINES}")
+        return
+
+    regressions = compare(results, baselines, args.threshold, args.min_delta)
+    if regressions:
+        print("Regressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("No regressions" if baselines else "No baselines recorded yet")
+
+
+if __name__ == "__main__":
+    main()
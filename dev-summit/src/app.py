@@ -1,31 +1,98 @@
-import base64
-import io
-import mimetypes
+import hashlib
+import hmac
 import os
 import re
+import threading
+import time
 
-import markdown
-import qrcode
 from flask import (
     Flask,
     Response,
     abort,
+    g,
+    jsonify,
+    make_response,
     redirect,
-    render_template_string,
+    render_template,
     request,
+    send_file,
     send_from_directory,
     url_for,
 )
-from weasyprint import HTML
+from werkzeug.security import safe_join
+
+from asset_manifest import IMMUTABLE_MAX_AGE, AssetManifest, strip_fingerprint
+from deck import DeckCache, file_digest
+from deck_artifact import DeckArtifact
+from image_assets import (
+    PRINT_DPI,
+    asset_url,
+    responsive_images,
+    web_variant,
+)
+from memory_budget import MEMORY_BUDGET
+from metrics import (
+    CACHE_REQUESTS,
+    METRICS_DIR,
+    PDF_PHASE_SECONDS,
+    REGISTRY,
+    RENDER_PHASE_SECONDS,
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    RESPONSE_BYTES,
+    FunctionMetric,
+)
+from pdf_builder import PdfBuildScheduler
+from pdf_cache import PdfCache, deck_fingerprint, media_files
+from pdf_fragments import (
+    format_slide_selection,
+    fragment_key,
+    merge_pdfs,
+    parse_slide_selection,
+)
+from pdf_render import render_fragments
+from precompress import (
+    COMPRESSIBLE_MIMETYPES,
+    ENCODINGS,
+    MIN_SIZE,
+    CompressedCache,
+)
+from profiler import SamplingProfiler
+from qr_codes import QR_FORMAT, generate_qr_code
+from search_index import get_search_index
+from slide_index import get_index
+from stylesheets import (
+    PRINT_CSS,
+    SCREEN_CSS,
+    SCREEN_JS,
+    find_stylesheet,
+    stylesheet,
+)
 
 app = Flask(__name__)
-SLIDES_DIR = os.path.join(os.path.dirname(__file__), "slides")
+SLIDES_DIR = os.environ.get(
+    "SLIDES_DIR", os.path.join(os.path.dirname(__file__), "slides")
+)
+# Verzeichnis mit weiteren Decks, je Unterverzeichnis unter /deck/<name>/ erreichbar
+DECKS_DIR = os.environ.get("DECKS_DIR")
+DECK_NAME_REGEX = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "template.html")
 
+IMAGES_URL_PREFIX = "/slide/images/"
 IMAGE_REGEX = r'src=["\"](\/slide\/images\/|\.\/images\/|images\/)([^"\"]+)["\"]'
 
-HEADERS = {
-    "Content-Disposition": "attachment; filename=devsummit_praesentation.pdf",
-}
+PDF_FILENAME = "devsummit_praesentation.pdf"
+PDF_BUILDING_HTML = """
+    <h2>
+        Das PDF wird gerade erstellt. Bitte in wenigen Sekunden erneut laden.
+    </h2>
+    """
+QR_CODE_HTML = """
+        <div class="qr-code-container">
+            <img src="{qr_code_data_url}" alt="QR Code für Slide Download">
+            <p>Scan to download slides</p>
+        </div>
+        """
 NO_SLIDES_FOUND_HTML = """
     <h2>
         Keine Folien gefunden. Lege Markdown-Dateien im slides/-Verzeichnis an.
@@ -33,227 +100,761 @@ NO_SLIDES_FOUND_HTML = """
     """
 
 # Cache for PDF and QR code to avoid regenerating on every request
-PDF_CACHE = None
-QR_CACHE = {}
+PDF_CACHE = PdfCache()
+# Single-flight background builds; requests wait up to PDF_WAIT_SECONDS, then 202
+PDF_BUILDER = PdfBuildScheduler()
+PDF_WAIT_SECONDS = float(os.environ.get("PDF_WAIT_SECONDS", "10"))
+PDF_RETRY_AFTER = int(os.environ.get("PDF_RETRY_AFTER", "5"))
+# Ad-hoc-Auswahlen (?slides=) haben 2^n mögliche Schlüssel: nur die zuletzt
+# genutzten behalten
+PDF_SELECTION_CACHE_SIZE = int(os.environ.get("PDF_SELECTION_CACHE_SIZE", "32"))
+# WebP-Varianten für Browser, die image/webp explizit akzeptieren
+IMAGE_WEBP = os.environ.get("IMAGE_WEBP", "true").lower() == "true"
+# Basis-URL des Presenter-Sync-Servers (sync_server.py), leer = kein Sync
+SYNC_URL = os.environ.get("SYNC_URL", "").rstrip("/")
+# Öffentliche Basis-URLs (kommagetrennt), für die warm_up() QR-Codes vorberechnet
+PUBLIC_URLS = [
+    url.strip().rstrip("/")
+    for url in os.environ.get("PUBLIC_URLS", "").split(",")
+    if url.strip()
+]
+# Compiled slide HTML and page template, revalidated via mtime/content hash
+DECK_CACHE = DeckCache()
+# gzip/brotli-kodierte Antworten, nach Inhalts-Hash
+COMPRESSED = CompressedCache()
+# ?profile=<PROFILE_TOKEN> schreibt ein Sampling-Profil des Requests nach PROFILE_DIR
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+# Jeden PDF-Build profilieren (sonst nur Builds profilierter Requests)
+PROFILE_PDF_BUILDS = os.environ.get("PROFILE_PDF_BUILDS", "false").lower() == "true"
+# Mit compile_deck.py erzeugtes Artefakt: der Standard-Foliensatz wird dann
+# per mmap daraus ausgeliefert statt aus SLIDES_DIR gerendert
+DECK_ARTIFACT = os.environ.get("DECK_ARTIFACT", "")
+ARTIFACT = DeckArtifact(DECK_ARTIFACT) if DECK_ARTIFACT else None
+# Maximale Trefferzahl für /search
+SEARCH_LIMIT = int(os.environ.get("SEARCH_LIMIT", "20"))
+# Gesetzt, sobald warm_up() alle Caches gefüllt hat (/readyz)
+READY = threading.Event()
+
+FunctionMetric(
+    "devsummit_memory_budget_bytes",
+    "Estimated bytes held by the in-memory caches.",
+    "gauge",
+    lambda: [({}, MEMORY_BUDGET.used)],
+)
+FunctionMetric(
+    "devsummit_memory_budget_evictions_total",
+    "Cache entries evicted to stay within MEMORY_BUDGET_MB.",
+    "counter",
+    lambda: [({}, MEMORY_BUDGET.evictions)],
+)
+
+
+@app.url_value_preprocessor
+def _pull_deck(endpoint, values):  # pylint: disable=unused-argument
+    # /deck/<deck>/...: Deck-Name für _slides_dir() und url_for() merken
+    g.deck = values.pop("deck", None) if values else None
+
+
+@app.url_defaults
+def _add_deck(endpoint, values):
+    if g.get("deck") and app.url_map.is_endpoint_expecting(endpoint, "deck"):
+        values.setdefault("deck", g.deck)
+
+
+def _slides_dir() -> str:
+    """Slides directory of the deck addressed by the current request."""
+    deck = g.get("deck")
+    if deck is None:
+        return SLIDES_DIR
+    if not DECKS_DIR or not DECK_NAME_REGEX.match(deck):
+        abort(404)
+    slides_dir = os.path.join(DECKS_DIR, deck)
+    if not os.path.isdir(slides_dir):
+        abort(404)
+    return slides_dir
+
+
+def list_decks() -> list[str]:
+    """Names of the decks below ``DECKS_DIR``."""
+    if not DECKS_DIR or not os.path.isdir(DECKS_DIR):
+        return []
+    with os.scandir(DECKS_DIR) as entries:
+        return sorted(
+            entry.name
+            for entry in entries
+            if entry.is_dir() and DECK_NAME_REGEX.match(entry.name)
+        )
 
 
 @app.route("/slide/images/<path:filename>")
+@app.route("/deck/<deck>/slide/images/<path:filename>")
 def slide_images(filename):
-    # Liefert Bilder aus slides/images/ aus
-    return send_from_directory(os.path.join(SLIDES_DIR, "images"), filename)
+    # Liefert Bilder aus slides/images/ aus, mit ?w= als verkleinerte Variante
+    slides_dir = _slides_dir()
+    filename, immutable = _unfingerprint(slides_dir, "images", filename)
+    images_dir = os.path.join(slides_dir, "images")
+    width = request.args.get("w", type=int)
+    if not width:
+        response = send_from_directory(images_dir, filename)
+        if response.mimetype in COMPRESSIBLE_MIMETYPES:
+            # z.B. SVG-Logos: komprimiert aus dem Cache statt als Datei-Stream
+            response.direct_passthrough = False
+            response = _compressed(response)
+        return _cache_headers(response, immutable)
+
+    path = safe_join(images_dir, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    webp = IMAGE_WEBP and "image/webp" in request.accept_mimetypes.values()
+    response = send_file(
+        web_variant(path, width, webp=webp),
+        mimetype="image/webp" if webp else None,
+        conditional=True,
+    )
+    response.vary.add("Accept")
+    return _cache_headers(response, immutable)
 
 
 # Route für Videos
 @app.route("/slide/videos/<path:filename>")
+@app.route("/deck/<deck>/slide/videos/<path:filename>")
 def slide_videos(filename):
     # Liefert Videos aus slides/videos/ aus
-    return send_from_directory(os.path.join(SLIDES_DIR, "videos"), filename)
+    slides_dir = _slides_dir()
+    filename, immutable = _unfingerprint(slides_dir, "videos", filename)
+    response = send_from_directory(os.path.join(slides_dir, "videos"), filename)
+    return _cache_headers(response, immutable)
+
+
+def asset_manifest(slides_dir: str | None = None) -> AssetManifest:
+    """Return the fingerprinted-URL manifest for the media of ``slides_dir``."""
+    slides_dir = slides_dir or SLIDES_DIR
+
+    def build():
+        manifest = AssetManifest.build(slides_dir)
+        return manifest, manifest.paths
+
+    return DECK_CACHE.derived(("manifest", slides_dir), build)
+
+
+def _unfingerprint(slides_dir: str, media: str, filename: str) -> tuple[str, bool]:
+    """Map a fingerprinted file name to the original; flag current hashes."""
+    original = asset_manifest(slides_dir).resolve(f"{media}/{filename}")
+    if original is not None:
+        return original[len(media) + 1 :], True
+    # Veralteter Hash: aktuellen Inhalt ausliefern, aber nicht als immutable
+    stripped = strip_fingerprint(filename)
+    if stripped is not None and not os.path.exists(
+        os.path.join(slides_dir, media, filename)
+    ):
+        return stripped, False
+    return filename, False
+
+
+def _compressed(response):
+    """Encode a compressible response with brotli/gzip as negotiated."""
+    response.vary.add("Accept-Encoding")
+    if (
+        response.direct_passthrough
+        or response.status_code != 200
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    encoding = request.accept_encodings.best_match(ENCODINGS)
+    data = response.get_data()
+    if encoding is None or len(data) < MIN_SIZE:
+        return response
+
+    response.set_data(COMPRESSED.get(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    etag, _ = response.get_etag()
+    if etag:
+        # Kodierte Bytes unterscheiden sich vom Original: nur schwaches ETag
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def _cache_headers(response, immutable: bool):
+    if immutable:
+        # send_from_directory setzt no-cache, das würde immutable aushebeln
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    return response
 
 
 def get_slide_files():
+    return list(get_index(SLIDES_DIR).files())
 
-    files = [f for f in os.listdir(SLIDES_DIR) if f.endswith(".md")]
 
-    def extract_number(filename):
-        match = re.match(r"(\d+)", os.path.splitext(filename)[0])
-        return int(match.group(1)) if match else 0
+@app.route("/")
+@app.route("/deck/<deck>/")
+def index():
+    if not get_index(_slides_dir()).files():
+        return NO_SLIDES_FOUND_HTML
+    return redirect(url_for("show_slide", slide_num=1))
 
-    files = sorted(files, key=extract_number)
-    return files
+
+@app.route("/decks")
+def deck_list():
+    return jsonify(
+        decks=[
+            {"name": name, "url": url_for("index", deck=name)} for name in list_decks()
+        ]
+    )
+
+
+@app.route("/search")
+@app.route("/deck/<deck>/search")
+def search():
+    """Slides matching ``?q=`` as JSON, with links to ``show_slide``."""
+    query = request.args.get("q", "").strip()
+    slides_dir = _slides_dir()
+    search_index = get_search_index(slides_dir)
+    if not search_index.synced:
+        # z.B. ein Deck, das erst nach dem Aufwärmen hinzukam
+        sync_search_index(slides_dir)
+    results = search_index.search(query, SEARCH_LIMIT)
+    for result in results:
+        result["url"] = url_for("show_slide", slide_num=result["num"])
+    return jsonify(query=query, results=results)
 
 
-def generate_qr_code(url):
-    """Generate QR code for the given URL and return as data URL."""
-    cache_key = url
-    if cache_key in QR_CACHE:
-        return QR_CACHE[cache_key]
+def sync_search_index(slides_dir: str):
+    """Re-index the slides of ``slides_dir`` whose content changed.
 
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
+    Runs on warm-up and when the deck watcher sees a change, never per query.
+    """
+    files = get_index(slides_dir).files()
+    get_search_index(slides_dir).sync(
+        files,
+        lambda filename: file_digest(os.path.join(slides_dir, filename)),
+        # max_age=0: the HTML must match the digest it is indexed under
+        lambda filename: DECK_CACHE.slide_html(
+            os.path.join(slides_dir, filename), max_age=0
+        ),
     )
-    qr.add_data(url)
-    qr.make(fit=True)
 
-    img = qr.make_image(fill_color="black", back_color="white")
 
-    # Convert PIL image to data URL
-    img_buffer = io.BytesIO()
-    img.save(img_buffer, format="PNG")
-    img_buffer.seek(0)
+@app.route("/healthz")
+def healthz():
+    return "ok"
 
-    img_data = base64.b64encode(img_buffer.read()).decode("utf-8")
-    data_url = f"data:image/png;base64,{img_data}"
 
-    QR_CACHE[cache_key] = data_url
-    return data_url
+@app.route("/readyz")
+def readyz():
+    # Erst bereit, wenn Folien, Templates und PDF vorberechnet sind
+    if not READY.is_set():
+        return Response(
+            "warming up", status=503, headers={"Retry-After": str(PDF_RETRY_AFTER)}
+        )
+    return "ready"
 
 
-@app.route("/")
-def index():
-    files = get_slide_files()
-    if not files:
-        return NO_SLIDES_FOUND_HTML
-    return redirect(url_for("show_slide", slide_num=1))
+@app.route("/metrics")
+def metrics():
+    return Response(REGISTRY.render(METRICS_DIR), mimetype="text/plain; version=0.0.4")
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc()
+
+
+@app.after_request
+def _record_request(response):
+    # Unbekannte URLs unter einem Label, sonst wächst die Kardinalität unbegrenzt
+    endpoint = request.endpoint or "unmatched"
+    started = g.get("request_started")
+    if started is not None:
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - started,
+            endpoint=endpoint,
+            status=response.status_code,
+        )
+    RESPONSE_BYTES.inc(response.content_length or 0, endpoint=endpoint)
+    return response
+
+
+@app.teardown_request
+def _finish_request(exc):  # pylint: disable=unused-argument
+    if g.pop("request_started", None) is not None:
+        REQUESTS_IN_FLIGHT.dec()
+    _write_profile()
+
+
+@app.before_request
+def _serve_from_artifact():
+    if ARTIFACT is None or g.get("deck") is not None:
+        return None
+    key = request.path
+    if request.query_string:
+        key += "?" + request.query_string.decode("latin-1")
+    entry = ARTIFACT.get(key)
+    if entry is None:
+        return None
+
+    variant = _artifact_variant(entry)
+    length = entry["variants"][variant][1]
+    response = Response(
+        ARTIFACT.chunks(entry, variant),
+        status=entry["status"],
+        headers=entry["headers"],
+        direct_passthrough=True,
+    )
+    response.content_length = length
+    if variant in ENCODINGS:
+        response.headers["Content-Encoding"] = variant
+    if len(entry["variants"]) > 1:
+        response.vary.add(
+            "Accept" if "webp" in entry["variants"] else "Accept-Encoding"
+        )
+    offset = entry["variants"][variant][0]
+    response.set_etag(f"{ARTIFACT.meta['version'][:16]}-{offset}")
+    # Byte-Ranges nur für unkodierte Antworten, z.B. das PDF
+    return response.make_conditional(
+        request, accept_ranges=variant == "identity", complete_length=length
+    )
+
+
+def _artifact_variant(entry: dict) -> str:
+    variants = entry["variants"]
+    if "webp" in variants and "image/webp" in request.accept_mimetypes.values():
+        return "webp"
+    encoding = request.accept_encodings.best_match(
+        [name for name in ENCODINGS if name in variants]
+    )
+    return encoding or "identity"
+
+
+@app.before_request
+def _start_profile():
+    token = request.args.get("profile")
+    if PROFILE_TOKEN and token and hmac.compare_digest(token, PROFILE_TOKEN):
+        g.profiler = SamplingProfiler(label=request.endpoint or "unmatched").start()
+
+
+@app.after_request
+def _attach_profile(response):
+    path = _write_profile()
+    if path:
+        response.headers["X-Profile"] = os.path.basename(path)
+    return response
+
+
+def _write_profile() -> str | None:
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return None
+    profiler.stop()
+    path = profiler.write(f"request-{profiler.label}")
+    app.logger.info("Request profile: %s", path)
+    return path
 
 
 @app.route("/slide/<int:slide_num>")
+@app.route("/deck/<deck>/slide/<int:slide_num>")
 def show_slide(slide_num):
-    files = get_slide_files()
+    slides_dir = _slides_dir()
+    files = get_index(slides_dir).files()
     total = len(files)
     if slide_num < 1 or slide_num > total:
         abort(404)
-    filename = files[slide_num - 1]
-    with open(os.path.join(SLIDES_DIR, filename), encoding="utf-8") as f:
-        md_content = f.read()
-    html_content = markdown.markdown(md_content, extensions=["extra"])
+    html_content = _slide_content(slides_dir, files[slide_num - 1], _images_url())
 
     # Generate QR code for the final slide
     qr_code_data_url = None
     if slide_num == total:  # Last slide
         # Generate QR code for PDF download
         pdf_url = request.url_root.rstrip("/") + url_for("export_pdf")
-        qr_code_data_url = generate_qr_code(pdf_url)
+        qr_code_data_url = generate_qr_code(pdf_url, QR_FORMAT)
 
     prev_slide = slide_num - 1 if slide_num > 1 else None
     next_slide = slide_num + 1 if slide_num < total else None
-    # Template-Pfad relativ zu src
-    template_path = os.path.join(os.path.dirname(__file__), "template.html")
-    with open(template_path, encoding="utf-8") as tpl:
-        template_content = tpl.read()
-    return render_template_string(
-        template_content,
-        content=html_content,
-        slide_num=slide_num,
-        total_slides=total,
-        prev_slide=prev_slide,
-        next_slide=next_slide,
-        qr_code_data_url=qr_code_data_url,
-    )
+    with RENDER_PHASE_SECONDS.time(phase="template"):
+        page = render_template(
+            _page_template(slides_dir),
+            content=html_content,
+            slide_num=slide_num,
+            total_slides=total,
+            prev_slide=prev_slide,
+            next_slide=next_slide,
+            qr_code_data_url=qr_code_data_url,
+            sync_url=SYNC_URL,
+            sync_deck=g.get("deck") or "",
+            stylesheet_url=url_for(
+                "stylesheet_file", filename=stylesheet(SCREEN_CSS).fingerprinted
+            ),
+            script_url=url_for(
+                "stylesheet_file", filename=stylesheet(SCREEN_JS).fingerprinted
+            ),
+        )
+    return _compressed(make_response(page))
+
+
+@app.route("/styles/<filename>")
+def stylesheet_file(filename):
+    """Minified stylesheets and the page script; fingerprinted names are cached
+    for a year."""
+    sheet = find_stylesheet(filename)
+    immutable = sheet is not None
+    if sheet is None and filename in (SCREEN_CSS, PRINT_CSS, SCREEN_JS):
+        sheet = stylesheet(filename)
+    if sheet is None:
+        abort(404)
+    response = make_response(sheet.data)
+    response.mimetype = "text/javascript" if filename.endswith(".js") else "text/css"
+    response.set_etag(sheet.fingerprinted)
+    if not immutable:
+        response.cache_control.no_cache = True
+    return _cache_headers(_compressed(response), immutable).make_conditional(request)
+
+
+@app.route("/deck.json")
+@app.route("/deck/<deck>/deck.json")
+def deck_bundle():
+    """All slides of the deck as HTML fragments for client-side navigation."""
+    slides_dir = _slides_dir()
+    files = get_index(slides_dir).files()
+    images_url = _images_url()
+    slides = [
+        {
+            "num": idx,
+            "url": url_for("show_slide", slide_num=idx),
+            "html": _slide_content(slides_dir, filename, images_url),
+        }
+        for idx, filename in enumerate(files, 1)
+    ]
+    if slides:
+        pdf_url = request.url_root.rstrip("/") + url_for("export_pdf")
+        slides[-1]["html"] += QR_CODE_HTML.format(
+            qr_code_data_url=generate_qr_code(pdf_url, QR_FORMAT)
+        )
+
+    response = jsonify(total=len(slides), slides=slides)
+    response.set_etag(hashlib.sha256(response.get_data()).hexdigest())
+    response.cache_control.no_cache = True
+    return _compressed(response).make_conditional(request)
+
+
+def _images_url() -> str:
+    # /slide/images/ bzw. /deck/<name>/slide/images/
+    return url_for("index").rstrip("/") + IMAGES_URL_PREFIX
+
+
+def _slide_content(
+    slides_dir: str, filename: str, images_url: str = IMAGES_URL_PREFIX
+) -> str:
+    """Slide HTML for the browser, with responsive images and fingerprinted URLs."""
+    path = os.path.join(slides_dir, filename)
+    images_dir = os.path.join(slides_dir, "images")
+    manifest = asset_manifest(slides_dir)
+
+    def build():
+        html_content = DECK_CACHE.slide_html(path, max_age=0)
+        with RENDER_PHASE_SECONDS.time(phase="images"):
+            html_content, image_paths = responsive_images(
+                html_content, images_dir, images_url
+            )
+        return manifest.rewrite(html_content), [path, *image_paths]
+
+    return DECK_CACHE.derived(("web", path, images_url, manifest.version), build)
+
+
+def _page_template(slides_dir: str):
+    """Compiled page template with fingerprinted logo URLs."""
+    manifest = asset_manifest(slides_dir)
+
+    def build():
+        with open(TEMPLATE_PATH, encoding="utf-8") as tpl:
+            template_content = manifest.rewrite(tpl.read())
+        return app.jinja_env.from_string(template_content), [TEMPLATE_PATH]
+
+    return DECK_CACHE.derived(("template", TEMPLATE_PATH, manifest.version), build)
 
 
 @app.route("/export/pdf")
+@app.route("/deck/<deck>/export/pdf")
 def export_pdf():
-    global PDF_CACHE  # pylint: disable=global-statement
-
-    # Return cached PDF if available
-    if PDF_CACHE is not None:
-        return Response(
-            PDF_CACHE,
-            mimetype="application/pdf",
-            headers=HEADERS,
+    slides_dir = _slides_dir()
+    # ?slides=3-7 exportiert nur einen Folienbereich
+    slides = None
+    download_name = PDF_FILENAME
+    if request.args.get("slides"):
+        total = len(get_index(slides_dir).files())
+        try:
+            slides = parse_slide_selection(request.args["slides"], total)
+        except ValueError:
+            abort(400)
+        if slides == tuple(range(1, total + 1)):
+            slides = None
+        else:
+            selection = format_slide_selection(slides)
+            download_name = PDF_FILENAME.replace(".pdf", f"_folien_{selection}.pdf")
+    key = _pdf_key(slides_dir, slides)
+
+    # Client hat diese Deck-Version bereits: kein Build, kein Body
+    if key in request.if_none_match:
+        return Response(status=304, headers={"ETag": f'"{key}"'})
+
+    # Return cached PDF if available (shared across workers and restarts).
+    # Die Datei wird sofort geöffnet: löscht ein anderer Prozess sie danach
+    # (prune/evict), bleibt der offene Handle gültig.
+    cache = _pdf_cache(slides)
+    pdf = _open_pdf(cache, key)
+    CACHE_REQUESTS.inc(cache="pdf", result="miss" if pdf is None else "hit")
+    if pdf is not None:
+        cache.touch(key)
+    # Zweiter Versuch, falls das PDF zwischen Build und Öffnen verdrängt wurde
+    for _ in range(2):
+        if pdf is not None:
+            break
+        future = schedule_pdf_build(
+            slides_dir, key, slides, profile="profiler" in g or PROFILE_PDF_BUILDS
         )
+        if future is not None:
+            try:
+                future.result(timeout=PDF_WAIT_SECONDS)
+            except TimeoutError:
+                return _pdf_building()
+        pdf = _open_pdf(cache, key)
+    if pdf is None:
+        return _pdf_building()
+
+    stat = os.fstat(pdf.fileno())
+    # die Datei wird per wsgi.file_wrapper (sendfile) gestreamt
+    response = send_file(
+        pdf,
+        mimetype="application/pdf",
+        as_attachment=True,
+        download_name=download_name,
+        etag=key,
+        last_modified=stat.st_mtime,
+    )
+    response.content_length = stat.st_size
+    # ETag/Last-Modified, 304 und Range-Anfragen (206)
+    return response.make_conditional(
+        request, accept_ranges=True, complete_length=stat.st_size
+    )
 
-    files = get_slide_files()
-    slides_html = []
-    images_dir = os.path.abspath(os.path.join(SLIDES_DIR, "images"))
-
-    # PDF-optimiertes CSS (kein position: fixed, keine Viewport-Größen)
-    pdf_css = """
-    @page { size: A4 landscape; margin: 1cm; }
-    body { font-family: sans-serif; background: #fff; color: #222; }
-    .slide {
-        width: 100%;
-        min-height: 15cm;
-        margin: 0 0 1cm 0;
-        background: #fff;
-        padding: 2em 2em 1em 2em;
-        border-radius: 10px;
-        box-shadow: 0 0 20px #ccc8;
-        display: block;
-        position: relative;
-        page-break-after: always;
-    }
-    h2 { margin-top: 0; }
-    img { max-width: 90%; height: auto; margin: 1em 0; }
-    .materna-logo {
-        position: fixed;
-        right: 2em;
-        bottom: 2em;
-        width: 100px;
-        max-width: 15vw;
-        max-height: 12vh;
-        height: auto;
-        z-index: 101;
-        /* Für PDF: auf jeder Seite anzeigen */
-        display: block;
-    }
-    .summit-logo {
-        position: absolute;
-        top: 2em;
-        right: 2em;
-        width: 100px;
-        max-width: 15vw;
-        max-height: 12vh;
-        height: auto;
-        z-index: 100;
-    }
-    ul, ol { margin-top: 1em; margin-bottom: 1em; }
-    li { margin-bottom: 0.7em; }
+
+def _open_pdf(cache: PdfCache, key: str):
+    try:
+        return open(cache.path(key), "rb")  # pylint: disable=consider-using-with
+    except FileNotFoundError:
+        return None
+
+
+def _pdf_building() -> Response:
+    # Build läuft noch im Hintergrund: später erneut versuchen
+    return Response(
+        PDF_BUILDING_HTML, status=202, headers={"Retry-After": str(PDF_RETRY_AFTER)}
+    )
+
+
+def deck_version(slides_dir: str | None = None) -> str:
+    """Content hash of the deck (slides, media and print settings)."""
+    return _pdf_key(slides_dir or SLIDES_DIR)
+
+
+def _pdf_key(slides_dir: str, slides=None) -> str:
+    print_css = stylesheet(PRINT_CSS).fingerprinted
+
+    def build():
+        files = get_index(slides_dir).files()
+        images_dir = os.path.abspath(os.path.join(slides_dir, "images"))
+        paths = [os.path.join(slides_dir, f) for f in files]
+        fingerprint = deck_fingerprint(
+            paths, images_dir, print_css, f"print-dpi:{PRINT_DPI}"
+        )
+        # Verzeichnisse mit: neue oder gelöschte Dateien ändern deren mtime
+        dirs = [slides_dir, *(root for root, _, _ in os.walk(images_dir))]
+        return fingerprint, paths + dirs + media_files(images_dir)
+
+    # Nicht bei jeder Anfrage (auch 304) das Medienverzeichnis durchlaufen
+    key = DECK_CACHE.derived(("pdf_key", slides_dir, print_css, PRINT_DPI), build)
+    if slides is None:
+        return key
+    selection = format_slide_selection(slides)
+    return hashlib.sha256(f"{key}:slides={selection}".encode()).hexdigest()
+
+
+def schedule_pdf_build(
+    slides_dir: str | None = None,
+    key: str | None = None,
+    slides=None,
+    profile: bool = PROFILE_PDF_BUILDS,
+):
+    """Start building the PDF for ``slides_dir`` in the background (single-flight).
+
+    ``slides`` restricts the export to these 1-based slide numbers. With
+    ``profile`` the build is sampled and written to ``PROFILE_DIR``. Returns
+    the future of the running build, or ``None`` if the PDF is cached.
     """
+    slides_dir = slides_dir or SLIDES_DIR
+    key = key or _pdf_key(slides_dir, slides)
+    if _pdf_cache(slides).contains(key):
+        return None
+
+    def build():
+        if not profile:
+            return render_pdf_to_cache(slides_dir, key, slides)
+        # Fragmente im eigenen Prozess setzen, damit das Layout im Profil landet
+        with SamplingProfiler(label="pdf-build") as profiler:
+            result = render_pdf_to_cache(slides_dir, key, slides, workers=1)
+        app.logger.info("PDF build profile: %s", profiler.write("pdf-build"))
+        return result
 
-    # Logos als Base64 einbetten
-    def logo_data_url(filename):
-        path = os.path.join(images_dir, filename)
-        if not os.path.exists(path):
-            return ""
-        mime, _ = mimetypes.guess_type(path)
-        with open(path, "rb") as img_f:
-            b64 = base64.b64encode(img_f.read()).decode("utf-8")
-        return f"data:{mime};base64,{b64}"
+    return PDF_BUILDER.submit(key, build)
 
-    materna_logo = logo_data_url("materna-logo.png")
-    summit_logo = logo_data_url("summit-logo.svg")
 
-    slides_html = _prepare_slides(files, images_dir, summit_logo)
+def render_pdf_to_cache(slides_dir: str, key: str, slides=None, workers=None) -> str:
+    """Render the PDF for ``slides_dir`` into the PDF cache under ``key``.
 
-    pdf_html = f"""<!DOCTYPE html>
+    After a full-deck build, PDFs of outdated versions of the hosted decks
+    are deleted.
+    """
+    cache = _pdf_cache(slides)
+    # Dateisperre: parallele Worker-Prozesse rendern dieselbe Version nur einmal
+    with cache.lock(key):
+        if not cache.contains(key):
+            # Direkt in eine Spool-Datei schreiben, nie das ganze PDF im Speicher
+            with cache.spool(key) as target:
+                _render_pdf(slides_dir, slides, target, workers)
+    if slides is None:
+        current = {deck_version(deck_dir) for deck_dir, _ in hosted_decks()}
+        PDF_CACHE.prune(current | {key})
+    return key
+
+
+def _pdf_cache(slides=None) -> PdfCache:
+    if slides is None:
+        return PDF_CACHE
+    return PdfCache(
+        os.path.join(PDF_CACHE.cache_dir, "selections"), PDF_SELECTION_CACHE_SIZE
+    )
+
+
+def warm_up(slides_dir: str | None = None, build_pdf: bool = True):
+    """Fill slide, template, QR code and PDF caches, then mark the app ready.
+
+    Without ``slides_dir`` the default deck and every deck below ``DECKS_DIR``
+    are warmed. Under gunicorn this runs in the master before the workers are
+    forked, so every worker starts with hot caches.
+    """
+    decks = [(slides_dir, None)] if slides_dir else hosted_decks()
+    if ARTIFACT is not None and not slides_dir:
+        # Der Standard-Foliensatz kommt fertig aus dem Artefakt
+        decks = [(deck_dir, deck) for deck_dir, deck in decks if deck is not None]
+    for deck_dir, deck in decks:
+        _warm_deck(deck_dir, deck, build_pdf)
+    READY.set()
+
+
+def hosted_decks() -> list[tuple[str, str | None]]:
+    """``(slides_dir, deck_name)`` of the default deck and all named decks."""
+    return [(SLIDES_DIR, None)] + [
+        (os.path.join(DECKS_DIR, name), name) for name in list_decks()
+    ]
+
+
+def _warm_deck(slides_dir: str, deck: str | None, build_pdf: bool):
+    files = get_index(slides_dir).files()
+    with app.test_request_context():
+        g.deck = deck
+        images_url = _images_url()
+    for filename in files:
+        _slide_content(slides_dir, filename, images_url)
+    _page_template(slides_dir)
+    sync_search_index(slides_dir)
+    for base_url in PUBLIC_URLS:
+        with app.test_request_context(base_url=base_url):
+            g.deck = deck
+            pdf_url = request.url_root.rstrip("/") + url_for("export_pdf")
+            generate_qr_code(pdf_url, QR_FORMAT, pin=True)
+    if build_pdf and files:
+        future = schedule_pdf_build(slides_dir)
+        if future is not None:
+            future.result()
+
+
+def _render_pdf(slides_dir: str, slides, target, workers=None):
+    files = get_index(slides_dir).files()
+    images_dir = os.path.abspath(os.path.join(slides_dir, "images"))
+    # Logos und Bilder als deck-asset:-URLs, aufgelöst durch den url_fetcher
+    materna_logo = _img_to_asset_url(images_dir, "materna-logo.png")
+    summit_logo = _img_to_asset_url(images_dir, "summit-logo.svg")
+
+    fragments = _fragment_cache(slides_dir)
+
+    # Jede Folie einzeln rendern und nach Inhalts-Hash cachen
+    with PDF_PHASE_SECONDS.time(phase="prepare"):
+        slides_html = _prepare_slides(files, images_dir, summit_logo, slides_dir)
+        jobs = []
+        for num in slides or range(1, len(files) + 1):
+            pdf_html = _pdf_document(materna_logo, slides_html[num - 1])
+            key = fragment_key(pdf_html, images_dir, f"print-dpi:{PRINT_DPI}")
+            jobs.append((key, pdf_html))
+    _render_fragments(fragments, jobs, images_dir, workers)
+
+    with PDF_PHASE_SECONDS.time(phase="merge"):
+        merge_pdfs([fragments.path(key) for key, _ in jobs], target)
+    if slides is None:
+        # Fragmente geänderter oder gelöschter Folien werden nicht mehr gebraucht
+        fragments.prune(key for key, _ in jobs)
+
+
+def _render_fragments(fragments: PdfCache, jobs, images_dir: str, workers=None):
+    rendered = render_fragments(fragments, jobs, images_dir, workers)
+    for layout, write in rendered:
+        PDF_PHASE_SECONDS.observe(layout, phase="layout")
+        PDF_PHASE_SECONDS.observe(write, phase="write")
+    CACHE_REQUESTS.inc(len(jobs) - len(rendered), cache="pdf_fragment", result="hit")
+    CACHE_REQUESTS.inc(len(rendered), cache="pdf_fragment", result="miss")
+
+
+def _fragment_cache(slides_dir: str) -> PdfCache:
+    # Pro Foliensatz, damit das Aufräumen nur dessen Fragmente betrifft
+    deck = hashlib.sha256(os.path.abspath(slides_dir).encode()).hexdigest()[:16]
+    return PdfCache(os.path.join(PDF_CACHE.cache_dir, "fragments", deck))
+
+
+def _pdf_document(materna_logo: str, slide_html: str) -> str:
+    return f"""<!DOCTYPE html>
 <html lang="de">
 <head>
     <meta charset="UTF-8">
     <title>DevSummit 2025 PDF Export</title>
-    <style>{pdf_css}</style>
+    <style>{stylesheet(PRINT_CSS).text}</style>
 </head>
 <body>
     <img src="{materna_logo}" alt="Materna Logo" class="materna-logo">
-    {''.join(slides_html)}
+    {slide_html}
 </body>
 </html>"""
-    pdf = HTML(string=pdf_html).write_pdf()
-
-    # Cache the PDF for future requests
-    PDF_CACHE = pdf
-
-    return Response(
-        pdf,
-        mimetype="application/pdf",
-        headers=HEADERS,
-    )
 
 
-def _img_to_data_url(img_path):
-    if not os.path.exists(img_path):
+def _img_to_asset_url(images_dir: str, img_file: str) -> str:
+    if not os.path.exists(os.path.join(images_dir, img_file)):
         return ""
-    mime, _ = mimetypes.guess_type(img_path)
-    with open(img_path, "rb") as img_f:
-        b64 = base64.b64encode(img_f.read()).decode("utf-8")
-    return f"data:{mime};base64,{b64}"
+    return asset_url(img_file)
 
 
-def _prepare_slides(files: list[str], images_dir: str, summit_logo: str):
+def _prepare_slides(
+    files: list[str], images_dir: str, summit_logo: str, slides_dir: str
+):
     slides_html = []
     for idx, filename in enumerate(files, 1):
-        with open(os.path.join(SLIDES_DIR, filename), encoding="utf-8") as f:
-            md_content = f.read()
-        html_content = markdown.markdown(md_content, extensions=["extra"])
+        # max_age=0: the PDF must match the fingerprint computed for its key
+        html_content = DECK_CACHE.slide_html(
+            os.path.join(slides_dir, filename), max_age=0
+        )
 
         def replace_img(match):
-            img_file = match.group(2)
-            img_path = os.path.join(images_dir, img_file)
-            data_url = _img_to_data_url(img_path)
-            return f'src="{data_url}"'
+            return f'src="{_img_to_asset_url(images_dir, match.group(2))}"'
 
         html_content = re.sub(IMAGE_REGEX, replace_img, html_content)
         slide_html = '<div class="slide">'
@@ -265,4 +866,19 @@ def _prepare_slides(files: list[str], images_dir: str, summit_logo: str):
 
 if __name__ == "__main__":
     debug_mode = os.environ.get("FLASK_DEBUG", "false").lower() == "true"
+    watch_interval = float(os.environ.get("SLIDES_WATCH_INTERVAL", "0"))
+    if watch_interval > 0:
+
+        def deck_changed(slide_index):
+            # Bei geändertem Foliensatz Suche und PDF direkt im Hintergrund erneuern
+            sync_search_index(slide_index.slides_dir)
+            schedule_pdf_build(slide_index.slides_dir)
+
+        get_index(SLIDES_DIR).start_watcher(watch_interval, on_change=deck_changed)
+    threading.Thread(
+        target=warm_up,
+        kwargs={"build_pdf": os.environ.get("PDF_WARMUP", "true").lower() == "true"},
+        name="warm-up",
+        daemon=True,
+    ).start()
     app.run(host="0.0.0.0", port=8080, debug=debug_mode)
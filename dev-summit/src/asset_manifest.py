@@ -0,0 +1,91 @@
+import hashlib
+import os
+import re
+
+from deck import file_digest
+
+# Asset-Manifest: ordnet jeder Mediendatei eine URL mit Inhalts-Hash zu
+# (images/logo.png -> images/logo.<hash>.png), damit Browser sie unbegrenzt
+# cachen dürfen.
+
+MEDIA_DIRS = ("images", "videos")
+HASH_LENGTH = 12
+IMMUTABLE_MAX_AGE = 31536000
+
+FINGERPRINT_REGEX = re.compile(rf"^(.+)\.([0-9a-f]{{{HASH_LENGTH}}})(\.[^./]+)$")
+# Nur eigene Verweise: images/..., ./images/..., /slide/images/... und
+# /deck/<name>/slide/images/..., nicht https://cdn.example/images/...
+MEDIA_REF_REGEX = re.compile(
+    r"(?<![\w/.:-])((?:(?:/deck/[\w.-]+)?/slide/|\.{1,2}/)?(?:images|videos)/)"
+    r"([^\"'\s?#,)]+)"
+)
+
+
+def fingerprinted_name(rel_path: str, digest: str) -> str:
+    stem, ext = os.path.splitext(rel_path)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+class AssetManifest:
+    """Mapping of media paths (``images/logo.png``) to fingerprinted paths."""
+
+    def __init__(self, entries: dict[str, str], paths: list[str]):
+        self.entries = entries
+        self.paths = paths
+        self._originals = {v: k for k, v in entries.items()}
+        sha = hashlib.sha256()
+        for rel_path in sorted(entries):
+            sha.update(f"{rel_path}={entries[rel_path]}\n".encode())
+        self.version = sha.hexdigest()[:HASH_LENGTH]
+
+    @classmethod
+    def build(cls, media_root: str) -> "AssetManifest":
+        """Hash every file in the media directories below ``media_root``.
+
+        ``paths`` lists the directories and files the manifest depends on.
+        """
+        entries = {}
+        paths = []
+        for media in MEDIA_DIRS:
+            media_dir = os.path.join(media_root, media)
+            paths.append(media_dir)
+            for root, dirs, filenames in os.walk(media_dir):
+                dirs.sort()
+                paths.extend(os.path.join(root, d) for d in dirs)
+                for filename in sorted(filenames):
+                    if filename.startswith("."):
+                        continue
+                    path = os.path.join(root, filename)
+                    rel_path = os.path.relpath(path, media_root).replace(os.sep, "/")
+                    entries[rel_path] = fingerprinted_name(rel_path, file_digest(path))
+                    paths.append(path)
+        return cls(entries, paths)
+
+    def url(self, rel_path: str) -> str:
+        """Return the fingerprinted path for ``rel_path`` (unchanged if unknown)."""
+        return self.entries.get(rel_path, rel_path)
+
+    def resolve(self, fingerprinted: str) -> str | None:
+        """Return the original path for a current fingerprinted path."""
+        return self._originals.get(fingerprinted)
+
+    def rewrite(self, html: str) -> str:
+        """Replace references to known media files with fingerprinted paths."""
+
+        def replace(match):
+            prefix, name = match.groups()
+            media = prefix.rstrip("/").rsplit("/", 1)[-1]
+            rel_path = f"{media}/{name}"
+            if rel_path not in self.entries:
+                return match.group(0)
+            return prefix + self.entries[rel_path][len(media) + 1 :]
+
+        return MEDIA_REF_REGEX.sub(replace, html)
+
+
+def strip_fingerprint(filename: str) -> str | None:
+    """Return ``filename`` without its content hash, or ``None`` if it has none."""
+    match = FINGERPRINT_REGEX.match(filename)
+    if match is None:
+        return None
+    return match.group(1) + match.group(3)
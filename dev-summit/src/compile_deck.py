@@ -0,0 +1,117 @@
+import argparse
+import os
+import re
+import time
+from urllib.parse import urljoin
+
+import app
+from deck_artifact import DeckArtifactWriter
+from precompress import ENCODINGS, MIN_SIZE, compress
+
+# Kompiliert den Foliensatz (SLIDES_DIR) in ein Deck-Artefakt für DECK_ARTIFACT:
+#
+#   python compile_deck.py [-o deck.artifact] [--base-url https://summit.example]
+#
+# Die App wird per Test-Client abgefragt, das Artefakt enthält also genau die
+# Antworten, die sie sonst zur Laufzeit erzeugen würde. Der QR-Code der letzten
+# Folie zeigt auf --base-url (Standard: erste PUBLIC_URLS oder localhost:8080).
+
+DEFAULT_OUTPUT = os.environ.get("DECK_ARTIFACT", "deck.artifact")
+# Bild-, Video- und Stylesheet-URLs in Seiten, srcset-Listen und deck.json,
+# absolut oder relativ zur Seite (die Logos im Template: images/...)
+ASSET_URL_REGEX = re.compile(
+    r"(?<=[\"'(,\s])(?:\.{0,2}/)?(?:slide/images|slide/videos|images|videos|styles)"
+    r"/[^\"'\s,)\\]+"
+)
+ASSET_PREFIXES = ("/slide/images/", "/slide/videos/", "/styles/")
+# Header, die mit der Antwort gespeichert und wieder ausgeliefert werden
+STORED_HEADERS = ("Content-Type", "Cache-Control", "Content-Disposition", "Location")
+
+
+def _fetch(client, url: str, base_url: str, accept: str = "*/*"):
+    response = client.get(
+        url,
+        base_url=base_url,
+        headers={"Accept-Encoding": "identity", "Accept": accept},
+    )
+    data = response.get_data()
+    response.close()
+    return response, data
+
+
+def _encoded_variants(data: bytes, mimetype: str) -> dict:
+    variants = {"identity": data}
+    if mimetype in app.COMPRESSIBLE_MIMETYPES and len(data) >= MIN_SIZE:
+        for encoding in ENCODINGS:
+            encoded = compress(data, encoding)
+            if len(encoded) < len(data):
+                variants[encoding] = encoded
+    return variants
+
+
+def _add(writer, client, url: str, base_url: str, optional: bool = False):
+    response, data = _fetch(client, url, base_url)
+    if optional and response.status_code == 404:
+        # z.B. ein Logo, das es in diesem Foliensatz nicht gibt
+        return None
+    if response.status_code not in (200, 302):
+        raise RuntimeError(f"{url}: HTTP {response.status_code}")
+    variants = _encoded_variants(data, response.mimetype)
+    if "?w=" in url and app.IMAGE_WEBP:
+        webp, webp_data = _fetch(client, url, base_url, accept="image/webp,*/*")
+        if webp.mimetype == "image/webp":
+            variants["webp"] = webp_data
+    headers = {
+        name: response.headers[name]
+        for name in STORED_HEADERS
+        if name in response.headers
+    }
+    writer.add(url, variants, status=response.status_code, headers=headers)
+    return data
+
+
+def _asset_urls(page_url: str, text: str) -> set[str]:
+    """Asset URLs referenced by ``text``, resolved against ``page_url``."""
+    urls = (urljoin(page_url, ref) for ref in ASSET_URL_REGEX.findall(text))
+    return {url for url in urls if url.startswith(ASSET_PREFIXES)}
+
+
+def compile_deck(output: str = DEFAULT_OUTPUT, base_url: str | None = None) -> int:
+    """Write the artifact for ``app.SLIDES_DIR``; returns the number of entries."""
+    base_url = base_url or (app.PUBLIC_URLS or ["http://localhost:8080"])[0]
+    total = len(app.get_slide_files())
+    # PDF vorab bauen, sonst antwortet /export/pdf nach PDF_WAIT_SECONDS mit 202
+    future = app.schedule_pdf_build()
+    if future is not None:
+        future.result()
+
+    client = app.app.test_client()
+    pages = ["/", "/deck.json", *(f"/slide/{num}" for num in range(1, total + 1))]
+    meta = {"version": app.deck_version(), "base_url": base_url, "total": total}
+    with DeckArtifactWriter(output, meta) as writer:
+        assets = set()
+        for url in pages:
+            data = _add(writer, client, url, base_url)
+            assets.update(_asset_urls(url, data.decode("utf-8")))
+        for url in sorted(assets):
+            _add(writer, client, url, base_url, optional=True)
+        if total:
+            _add(writer, client, "/export/pdf", base_url)
+        return len(writer.entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the deck into one artifact")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--base-url", help="public URL for the QR code")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries = compile_deck(args.output, args.base_url)
+    size = os.path.getsize(args.output) / 2**20
+    elapsed = time.perf_counter() - start
+    print(f"{entries} entries, {size:.1f} MiB in {elapsed:.1f} s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import hashlib
+import os
+import threading
+import time
+
+import markdown
+
+from memory_budget import MEMORY_BUDGET, estimate_size
+from metrics import RENDER_PHASE_SECONDS
+
+# Kompilierter Foliensatz: gerendertes Slide-HTML und vorkompilierte Templates
+# bleiben im Speicher und werden nur bei geänderter mtime/Inhalt neu erzeugt.
+
+RECHECK_INTERVAL = float(os.environ.get("DECK_RECHECK_INTERVAL", "1.0"))
+
+# Pfad -> ((mtime_ns, size), sha256) für file_digest(), älteste fliegen zuerst
+_DIGESTS = {}
+_DIGESTS_LOCK = threading.Lock()
+DIGEST_CACHE_SIZE = int(os.environ.get("DIGEST_CACHE_SIZE", "10000"))
+
+
+def _signature(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _signature_or_none(path: str) -> tuple[int, int] | None:
+    try:
+        return _signature(path)
+    except FileNotFoundError:
+        return None
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of ``path``, memoized by mtime and size."""
+    signature = _signature(path)
+    cached = _DIGESTS.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+    with _DIGESTS_LOCK:
+        _DIGESTS.pop(path, None)
+        _DIGESTS[path] = (signature, digest)
+        while len(_DIGESTS) > DIGEST_CACHE_SIZE:
+            del _DIGESTS[next(iter(_DIGESTS))]
+    return digest
+
+
+def clear_digests():
+    with _DIGESTS_LOCK:
+        _DIGESTS.clear()
+
+
+class _Entry:  # pylint: disable=too-few-public-methods
+    __slots__ = ("signature", "digest", "value", "checked_at")
+
+    def __init__(self, signature, digest, value, checked_at):
+        self.signature = signature
+        self.digest = digest
+        self.value = value
+        self.checked_at = checked_at
+
+
+class DeckCache:
+    """Cache for compiled slide HTML and page templates.
+
+    Entries are revalidated at most every ``recheck_interval`` seconds. A changed
+    mtime only triggers a recompile if the content hash changed as well. Memory
+    is accounted against ``budget``, which may evict least recently used
+    entries; they are simply compiled again on the next access.
+    """
+
+    def __init__(self, recheck_interval: float = RECHECK_INTERVAL, budget=None):
+        self.recheck_interval = recheck_interval
+        self.budget = budget if budget is not None else MEMORY_BUDGET
+        self._entries = {}
+        self._md = markdown.Markdown(extensions=["extra"])
+        self._md_lock = threading.Lock()
+
+    def slide_html(self, path: str, max_age: float | None = None) -> str:
+        """Return the Markdown file at ``path`` rendered to HTML.
+
+        ``max_age`` overrides the recheck interval, e.g. ``0`` to revalidate
+        when the result has to match a freshly computed content hash.
+        """
+        return self._get(("slide", path), path, self._compile_markdown, max_age)
+
+    def derived(self, key, build, max_age: float | None = None):
+        """Return a value derived from files, rebuilt when one of them changes.
+
+        ``build()`` returns ``(value, paths)``; the value is rebuilt once the
+        mtime or size of any of ``paths`` differs from when it was built.
+        """
+        if max_age is None:
+            max_age = self.recheck_interval
+        key = ("derived", key)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.budget.touch(self, key)
+            if now - entry.checked_at < max_age:
+                return entry.value
+            if all(_signature_or_none(p) == sig for p, sig in entry.signature):
+                entry.checked_at = now
+                return entry.value
+
+        value, paths = build()
+        deps = tuple((p, _signature_or_none(p)) for p in paths)
+        self._store(key, _Entry(deps, None, value, now))
+        return value
+
+    def clear(self):
+        for key in list(self._entries):
+            self.budget.release(self, key)
+        self._entries.clear()
+        clear_digests()
+
+    def evict(self, key):
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key, entry: _Entry):
+        self._entries[key] = entry
+        self.budget.charge(self, key, estimate_size(entry.value))
+
+    def _get(self, key, path, compile_fn, max_age=None):
+        if max_age is None:
+            max_age = self.recheck_interval
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.budget.touch(self, key)
+            if now - entry.checked_at < max_age:
+                return entry.value
+
+        signature = _signature(path)
+        if entry is not None and entry.signature == signature:
+            entry.checked_at = now
+            return entry.value
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry is not None and entry.digest == digest:
+            entry.signature = signature
+            entry.checked_at = now
+            return entry.value
+
+        value = compile_fn(raw.decode("utf-8"))
+        self._store(key, _Entry(signature, digest, value, now))
+        return value
+
+    def _compile_markdown(self, md_content: str) -> str:
+        # Markdown-Instanzen sind nicht threadsicher, werden aber wiederverwendet
+        with self._md_lock, RENDER_PHASE_SECONDS.time(phase="markdown"):
+            return self._md.reset().convert(md_content)
@@ -0,0 +1,128 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+# Vorkompilierter Foliensatz als eine unveränderliche Datei: alle Antworten der
+# App (Seiten, deck.json, Bilder samt Varianten, PDF) hintereinander, dahinter
+# ein JSON-Index mit Offsets. Die App mappt die Datei per mmap und liefert
+# Slices daraus aus; Worker auf demselben Host teilen sich den Page-Cache.
+#
+# Aufbau: MAGIC | Index-Offset, Index-Länge (<QQ) | Daten ... | Index (JSON)
+
+MAGIC = b"DSDECK01"
+HEADER = struct.Struct("<QQ")
+DATA_START = len(MAGIC) + HEADER.size
+# Blockgröße beim Ausliefern; WSGI-Server verlangen bytes, keine memoryviews
+CHUNK_SIZE = 256 * 1024
+
+
+class ArtifactError(ValueError):
+    """Raised for files that are not valid deck artifacts."""
+
+
+class DeckArtifactWriter:
+    """Streams responses into a new artifact; the file appears on ``close()``.
+
+    Use as a context manager. Each entry has one or more variants (identity,
+    ``br``, ``gzip``, ``webp``) that are written immediately, so only the
+    index is kept in memory.
+    """
+
+    def __init__(self, path: str, meta: dict | None = None):
+        self.path = path
+        self.meta = meta or {}
+        self.entries = {}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        self._file = os.fdopen(fd, "wb")
+        self._file.write(MAGIC + HEADER.pack(0, 0))
+
+    def add(self, key: str, variants: dict, status: int = 200, headers=None):
+        """Store the response for ``key`` (path plus query string)."""
+        stored = {}
+        for name, data in variants.items():
+            stored[name] = [self._file.tell(), len(data)]
+            self._file.write(data)
+        self.entries[key] = {
+            "status": status,
+            "headers": dict(headers or {}),
+            "variants": stored,
+        }
+
+    def close(self):
+        index = json.dumps(
+            {"meta": self.meta, "entries": self.entries}, sort_keys=True
+        ).encode("utf-8")
+        offset = self._file.tell()
+        self._file.write(index)
+        self._file.seek(len(MAGIC))
+        self._file.write(HEADER.pack(offset, len(index)))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        os.unlink(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class DeckArtifact:
+    """Read-only, memory-mapped view of an artifact written by the writer."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:  # leere Datei
+                raise ArtifactError(f"{path}: empty file") from exc
+        if self._mmap[: len(MAGIC)] != MAGIC or len(self._mmap) < DATA_START:
+            self._mmap.close()
+            raise ArtifactError(f"{path}: not a deck artifact")
+        offset, length = HEADER.unpack_from(self._mmap, len(MAGIC))
+        index = json.loads(self._mmap[offset : offset + length])
+        self.meta = index["meta"]
+        self.entries = index["entries"]
+        self._view = memoryview(self._mmap)
+
+    def get(self, key: str) -> dict | None:
+        return self.entries.get(key)
+
+    def data(self, entry: dict, variant: str = "identity") -> memoryview:
+        """Zero-copy slice of the mapped file holding ``variant`` of ``entry``."""
+        offset, length = entry["variants"][variant]
+        return self._view[offset : offset + length]
+
+    def chunks(self, entry: dict, variant: str = "identity", size: int = CHUNK_SIZE):
+        """Yield ``variant`` of ``entry`` as ``bytes`` blocks of at most ``size``.
+
+        Each block is copied out of the mapping only when the server asks for
+        it, so large entries such as the PDF are never held in memory at once.
+        """
+        view = self.data(entry, variant)
+        try:
+            for start in range(0, len(view), size):
+                yield bytes(view[start : start + size])
+        finally:
+            view.release()
+
+    def close(self):
+        """Unmap the file; slices returned by ``data()`` must be released first."""
+        self._view.release()
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return len(self.entries)
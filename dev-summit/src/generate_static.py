@@ -1,52 +1,313 @@
+import hashlib
+import json
 import os
 import re
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 
 import markdown
 
-from app import generate_qr_code
+import qr_codes
+from asset_manifest import MEDIA_DIRS, AssetManifest
+from deck import file_digest
+from precompress import SUFFIXES, is_compressible, write_precompressed
+from qr_codes import QR_FORMAT, generate_qr_code
+from slide_index import get_index
+from stylesheets import SCREEN_CSS, SCREEN_JS, stylesheet
 
 # Statisches HTML-Export-Skript für die Slides
 # Nutzt das gleiche Template wie die Flask-App
 
-SLIDES_DIR = os.path.join(os.path.dirname(__file__), "slides")
+SLIDES_DIR = os.environ.get(
+    "SLIDES_DIR", os.path.join(os.path.dirname(__file__), "slides")
+)
 TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "template.html")
-OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "../../", "docs")
-
-
-def render_static_html():
+OUTPUT_DIR = os.environ.get(
+    "OUTPUT_DIR", os.path.join(os.path.dirname(__file__), "../../", "docs")
+)
+
+# Eingabe-Hashes des letzten Builds für inkrementelle Neuerzeugung
+BUILD_MANIFEST = ".build-manifest.json"
+# Alle Folien als JSON für die clientseitige Navigation
+DECK_BUNDLE = "deck.json"
+# Stylesheets mit Inhalts-Hash, relativ zu OUTPUT_DIR
+STYLES_DIR = "styles"
+STATIC_BUILD_WORKERS = int(os.environ.get("STATIC_BUILD_WORKERS", os.cpu_count() or 1))
+# Basis-URL des Presenter-Sync-Servers, leer = kein Sync
+SYNC_URL = os.environ.get("SYNC_URL", "").rstrip("/")
+# Ziel des QR-Codes auf der letzten Folie
+QR_PDF_URL = os.environ.get("STATIC_PDF_URL", "http://localhost:8080/export/pdf")
+# deck.json ändert sich bei jeder Folienänderung; q11 kostet bei großen Decks
+# Sekunden, q5 ist ein Bruchteil davon bei kaum größerer Datei
+BUNDLE_BROTLI_QUALITY = int(os.environ.get("BUNDLE_BROTLI_QUALITY", "5"))
+# Unterhalb dieser Seitenzahl lohnt sich der Start eines Prozess-Pools nicht
+PARALLEL_THRESHOLD = 16
+
+
+def render_static_html() -> list[str]:
+    """Build the static site incrementally and return the written page names.
+
+    Only slides whose inputs (slide source, template, asset manifest, position
+    in the deck) changed since the last build are rendered again.
+    """
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR)
 
-    copy_media()
+    previous = _load_build_manifest()
+    manifest = AssetManifest.build(SLIDES_DIR)
+    media = copy_media(manifest, previous.get("media"))
+    styles = write_styles(previous.get("styles", []))
     content_template = get_template_content()
+    template_hash = hashlib.sha256(content_template.encode("utf-8")).hexdigest()
 
     files = get_slide_files()
     total = len(files)
-    for idx, filename in enumerate(files, 1):
+    # Fragmente unveränderter Folien stammen aus dem letzten deck.json
+    fragments = _load_deck_fragments()
+    pages, jobs = _changed_slides(
+        files, previous.get("pages", {}), template_hash, manifest, fragments
+    )
+
+    written = _write_pages(
+        _render_pages(content_template, manifest, jobs, total), fragments
+    )
 
-        html_content = get_html_content(filename)
-        page = prepare_page(content_template, html_content, idx, total)
+    # Folien, die es nicht mehr gibt, entfernen
+    removed = set(previous.get("pages", {})) - set(pages)
+    _remove_outputs(removed)
 
-        # store first slide as index.html
-        if idx == 1:
-            index_path = os.path.join(OUTPUT_DIR, "index.html")
-            with open(index_path, "w", encoding="utf-8") as out:
+    if written or removed or not os.path.exists(os.path.join(OUTPUT_DIR, DECK_BUNDLE)):
+        write_deck_bundle(files, manifest, fragments)
+
+    _save_build_manifest({"pages": pages, "media": media, "styles": styles})
+    return written
+
+
+def write_deck_bundle(files, manifest: AssetManifest, fragments=None):
+    """Write all slides as HTML fragments to deck.json for client-side navigation.
+
+    ``fragments`` maps slide numbers to already rendered fragments; only the
+    missing ones are rendered here. An unchanged bundle is not rewritten.
+    """
+    fragments = fragments or {}
+    total = len(files)
+    slides = []
+    for idx, filename in enumerate(files, 1):
+        html = fragments.get(idx)
+        if html is None:
+            html = _slide_fragment(get_html_content(filename), idx, total, manifest)
+        slides.append({"num": idx, "url": f"slide{idx}.html", "html": html})
+    data = json.dumps({"total": total, "slides": slides}, ensure_ascii=False).encode(
+        "utf-8"
+    )
+
+    path = os.path.join(OUTPUT_DIR, DECK_BUNDLE)
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return
+    except FileNotFoundError:
+        pass
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(data)
+    os.replace(f"{path}.tmp", path)
+    write_precompressed(path, BUNDLE_BROTLI_QUALITY)
+
+
+def _slide_fragment(html_content: str, idx: int, total: int, manifest) -> str:
+    return manifest.rewrite(html_content + _generate_qr_code_html(idx == total))
+
+
+def _load_deck_fragments() -> dict:
+    try:
+        with open(os.path.join(OUTPUT_DIR, DECK_BUNDLE), encoding="utf-8") as f:
+            deck = json.load(f)
+        return {slide["num"]: slide["html"] for slide in deck["slides"]}
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+        return {}
+
+
+def _remove_outputs(out_names):
+    for out_name in out_names:
+        out_path = os.path.join(OUTPUT_DIR, out_name)
+        for path in [out_path, *_compressed_siblings(out_path)]:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def _write_pages(rendered, fragments: dict) -> list[str]:
+    written = []
+    for idx, (page, fragment) in rendered:
+        fragments[idx] = fragment
+        for out_name in _outputs(idx):
+            out_path = os.path.join(OUTPUT_DIR, out_name)
+            with open(out_path, "w", encoding="utf-8") as out:
                 out.write(page)
+            write_precompressed(out_path)
+            written.append(out_name)
+    return written
 
-        out_path = os.path.join(OUTPUT_DIR, f"slide{idx}.html")
-        with open(out_path, "w", encoding="utf-8") as out:
-            out.write(page)
 
+def _changed_slides(files, previous_pages, template_hash, manifest, fragments):
+    """Return the input hash per page and the ``(filename, idx)`` jobs to render.
 
-def copy_media():
-    for media in ["images", "videos"]:
-        src = os.path.join(SLIDES_DIR, media)
-        dst = os.path.join(OUTPUT_DIR, media)
-        if os.path.exists(src):
+    Changed pages are dropped from ``fragments``; pages without a fragment
+    are rendered again.
+    """
+    total = len(files)
+    pages = {}
+    jobs = []
+    for idx, filename in enumerate(files, 1):
+        out_name = f"slide{idx}.html"
+        pages[out_name] = _page_hash(filename, idx, total, template_hash, manifest)
+        if (
+            previous_pages.get(out_name) != pages[out_name]
+            or idx not in fragments
+            or not all(
+                os.path.exists(os.path.join(OUTPUT_DIR, name)) for name in _outputs(idx)
+            )
+        ):
+            fragments.pop(idx, None)
+            jobs.append((filename, idx))
+    return pages, jobs
+
+
+def _outputs(idx: int) -> list[str]:
+    # store first slide also as index.html
+    return [f"slide{idx}.html", "index.html"] if idx == 1 else [f"slide{idx}.html"]
+
+
+def _page_hash(filename, idx, total, template_hash, manifest) -> str:
+    inputs = [
+        file_digest(os.path.join(SLIDES_DIR, filename)),
+        template_hash,
+        manifest.version,
+        file_digest(__file__),
+        stylesheet(SCREEN_CSS).fingerprinted,
+        stylesheet(SCREEN_JS).fingerprinted,
+        SYNC_URL,
+        str(idx),
+        str(total),
+    ]
+    if idx == total:
+        # Die letzte Seite enthält den QR-Code
+        inputs += [QR_PDF_URL, QR_FORMAT, file_digest(qr_codes.__file__)]
+    return hashlib.sha256("\n".join(inputs).encode("utf-8")).hexdigest()
+
+
+def _render_page(job) -> tuple[str, str]:
+    """Render one page and its deck.json fragment from a single Markdown pass."""
+    slides_dir, content_template, manifest, filename, idx, total = job
+    html_content = get_html_content(filename, slides_dir)
+    page = prepare_page(content_template, html_content, idx, total)
+    return manifest.rewrite(page), _slide_fragment(html_content, idx, total, manifest)
+
+
+def _render_pages(content_template, manifest, jobs, total):
+    args = [
+        (SLIDES_DIR, content_template, manifest, filename, idx, total)
+        for filename, idx in jobs
+    ]
+    indexes = [idx for _, idx in jobs]
+    if STATIC_BUILD_WORKERS > 1 and len(jobs) >= PARALLEL_THRESHOLD:
+        # Große Decks auf mehrere Prozesse verteilen
+        chunksize = max(1, len(jobs) // (STATIC_BUILD_WORKERS * 4))
+        with ProcessPoolExecutor(max_workers=STATIC_BUILD_WORKERS) as pool:
+            yield from zip(indexes, pool.map(_render_page, args, chunksize=chunksize))
+    else:
+        yield from zip(indexes, map(_render_page, args))
+
+
+def _load_build_manifest() -> dict:
+    try:
+        with open(os.path.join(OUTPUT_DIR, BUILD_MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_build_manifest(data: dict):
+    path = os.path.join(OUTPUT_DIR, BUILD_MANIFEST)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def write_styles(previous: list[str]) -> list[str]:
+    """Write the screen stylesheet and page script; return the written paths.
+
+    Files from ``previous`` that are no longer current are removed.
+    """
+    current = []
+    for name in (SCREEN_CSS, SCREEN_JS):
+        sheet = stylesheet(name)
+        path = os.path.join(OUTPUT_DIR, STYLES_DIR, sheet.fingerprinted)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(sheet.data)
+            write_precompressed(path)
+        current.extend(
+            os.path.relpath(written, OUTPUT_DIR)
+            for written in [path, *_compressed_siblings(path)]
+        )
+    current.sort()
+    for stale in set(previous) - set(current):
+        stale_path = os.path.join(OUTPUT_DIR, stale)
+        if os.path.exists(stale_path):
+            os.unlink(stale_path)
+    return current
+
+
+def copy_media(
+    manifest: AssetManifest | None = None, previous: list[str] | None = None
+) -> list[str]:
+    """Place media under their fingerprinted names and return those paths.
+
+    Files already present under their hashed name are unchanged and skipped;
+    ``previous`` (from the last build) is used to remove stale files. Without
+    it the media directories are rebuilt from scratch.
+    """
+    manifest = manifest or AssetManifest.build(SLIDES_DIR)
+    if previous is None:
+        for media in MEDIA_DIRS:
+            dst = os.path.join(OUTPUT_DIR, media)
             if os.path.exists(dst):
                 shutil.rmtree(dst)
-            shutil.copytree(src, dst)
+        previous = []
+
+    current = []
+    for rel_path, fingerprinted in manifest.entries.items():
+        dst = os.path.join(OUTPUT_DIR, fingerprinted)
+        if not os.path.exists(dst):
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            _link_or_copy(os.path.join(SLIDES_DIR, rel_path), dst)
+            if is_compressible(dst):
+                write_precompressed(dst)
+        current.append(fingerprinted)
+        current.extend(
+            os.path.relpath(path, OUTPUT_DIR) for path in _compressed_siblings(dst)
+        )
+    current.sort()
+
+    for stale in set(previous) - set(current):
+        stale_path = os.path.join(OUTPUT_DIR, stale)
+        if os.path.exists(stale_path):
+            os.unlink(stale_path)
+    return current
+
+
+def _compressed_siblings(path: str) -> list[str]:
+    siblings = [path + suffix for suffix in SUFFIXES.values()]
+    return [sibling for sibling in siblings if os.path.exists(sibling)]
+
+
+def _link_or_copy(src: str, dst: str):
+    try:
+        os.link(src, dst)
+    except OSError:
+        # z.B. anderes Dateisystem: normale Kopie
+        shutil.copy2(src, dst)
 
 
 def get_template_content() -> str:
@@ -56,18 +317,11 @@ def get_template_content() -> str:
 
 
 def get_slide_files():
-    files = [f for f in os.listdir(SLIDES_DIR) if f.endswith(".md")]
-
-    def extract_number(filename):
-        match = re.match(r"(\d+)", os.path.splitext(filename)[0])
-        return int(match.group(1)) if match else 0
-
-    files = sorted(files, key=extract_number)
-    return files
+    return list(get_index(SLIDES_DIR).files())
 
 
-def get_html_content(filename: str) -> str:
-    with open(os.path.join(SLIDES_DIR, filename), encoding="utf-8") as f:
+def get_html_content(filename: str, slides_dir: str | None = None) -> str:
+    with open(os.path.join(slides_dir or SLIDES_DIR, filename), encoding="utf-8") as f:
         md_content = f.read()
     html_content = markdown.markdown(md_content, extensions=["extra"])
 
@@ -82,10 +336,7 @@ def _generate_qr_code_html(is_final_slide: bool) -> str:
         return ""
 
     # Generate QR code for PDF download in static context
-    # Using localhost URL for static generation - this will work for development
-    # In production, this would need to be updated with the actual domain
-    pdf_url = "http://localhost:8080/export/pdf"  # Default for local development
-    qr_code_data_url = generate_qr_code(pdf_url)
+    qr_code_data_url = generate_qr_code(QR_PDF_URL, QR_FORMAT)
     return f"""
         <div class="qr-code-container">
             <img src="{qr_code_data_url}" alt="QR Code für Slide Download">
@@ -118,6 +369,15 @@ def prepare_page(content_template: str, html_content: str, idx: int, total: int)
     page = page.replace("{{ content|safe }}", html_content)
     page = page.replace("{{ slide_num }}", str(idx))
     page = page.replace("{{ total_slides }}", str(total))
+    page = page.replace("{{ url_for('deck_bundle') }}", DECK_BUNDLE)
+    page = page.replace("{{ sync_url }}", SYNC_URL)
+    page = page.replace("{{ sync_deck }}", "")
+    page = page.replace(
+        "{{ stylesheet_url }}", f"{STYLES_DIR}/{stylesheet(SCREEN_CSS).fingerprinted}"
+    )
+    page = page.replace(
+        "{{ script_url }}", f"{STYLES_DIR}/{stylesheet(SCREEN_JS).fingerprinted}"
+    )
 
     prev_slide = idx - 1 if idx > 1 else None
     next_slide = idx + 1 if idx < total else None
@@ -0,0 +1,126 @@
+# pylint: disable=invalid-name  # gunicorn erwartet Einstellungen in Kleinschreibung
+import contextlib
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+
+# Produktionsstart: gunicorn -c gunicorn.conf.py app:app
+#
+# Die App wird im Master geladen und vorgewärmt (Folien, Templates, QR-Codes,
+# PDF), erst danach werden die Worker geforkt. Bei geändertem Foliensatz
+# (SLIDES_WATCH_INTERVAL) schickt ein Watcher-Prozess dem Master SIGHUP; der
+# wärmt neu vor und tauscht die Worker unterbrechungsfrei aus.
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+worker_class = "gthread"
+preload_app = True
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-"
+
+# Schnappschüsse der Metriken aller Worker, /metrics summiert sie (metrics.py).
+# Vor dem Import der App setzen; bei einem Reload bleibt das Verzeichnis gleich
+if "METRICS_DIR" not in os.environ:
+    os.environ["METRICS_DIR"] = tempfile.mkdtemp(prefix="devsummit-metrics-")
+
+
+def when_ready(server):
+    # pylint: disable-next=import-outside-toplevel
+    import metrics
+
+    metrics.clear_snapshots()
+    _warm_up(server)
+
+    interval = float(os.environ.get("SLIDES_WATCH_INTERVAL", "0"))
+    if interval > 0:
+        server.deck_watcher_pid = _start_deck_watcher(server, interval)
+
+
+def on_reload(server):
+    # Läuft im Master, bevor die neuen Worker geforkt werden (SIGHUP)
+    _warm_up(server)
+
+
+def on_exit(server):
+    pid = getattr(server, "deck_watcher_pid", None)
+    if pid is not None:
+        with contextlib.suppress(ProcessLookupError):
+            os.kill(pid, signal.SIGTERM)
+
+
+def _warm_up(server):
+    # pylint: disable=import-outside-toplevel
+    import app as deck_app
+    import metrics
+
+    server.log.info("Warming up caches")
+    deck_app.warm_up(build_pdf=os.environ.get("PDF_WARMUP", "true").lower() == "true")
+    # Zähler aus dem Vorwärmen zählen einmal, nicht einmal pro Worker
+    metrics.REGISTRY.write_snapshot(metrics.METRICS_DIR, "master")
+
+
+def _start_deck_watcher(server, interval: float) -> int:
+    # Eigener Prozess statt Thread: im Master liefe er beim Fork jedes Workers
+    # mit (Sperren, Cache-Dicts mitten in der Änderung)
+    master = os.getpid()
+    pid = os.fork()
+    if pid:
+        return pid
+    for sig in (*server.SIGNALS, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    try:
+        _watch_deck(server, master, interval)
+    finally:
+        os._exit(0)  # pylint: disable=protected-access
+
+
+def _watch_deck(server, master: int, interval: float):
+    # pylint: disable-next=import-outside-toplevel
+    import app as deck_app
+
+    def versions():
+        return [deck_app.deck_version(d) for d, _ in deck_app.hosted_decks()]
+
+    version = versions()
+    # Endet mit dem Master (dann ist init bzw. ein Subreaper der Elternprozess)
+    while os.getppid() == master:
+        time.sleep(interval)
+        current = versions()
+        if current == version:
+            continue
+        version = current
+        server.log.info("Deck changed, reloading workers")
+        # Der Master wärmt in on_reload() vor und tauscht dann die Worker aus
+        os.kill(master, signal.SIGHUP)
+
+
+def post_fork(server, worker):  # pylint: disable=unused-argument
+    # pylint: disable=import-outside-toplevel
+    import app as deck_app
+    import metrics
+    from pdf_builder import PdfBuildScheduler
+
+    # Threads des Masters überleben den Fork nicht: eigener Build-Pool pro Worker
+    deck_app.PDF_BUILDER = PdfBuildScheduler()
+    # Geerbte Werte stehen schon im Schnappschuss des Masters
+    metrics.REGISTRY.reset()
+    metrics.start_flusher()
+
+
+def worker_exit(server, worker):  # pylint: disable=unused-argument
+    # pylint: disable-next=import-outside-toplevel
+    import metrics
+
+    metrics.REGISTRY.write_snapshot(metrics.METRICS_DIR)
+
+
+def child_exit(server, worker):  # pylint: disable=unused-argument
+    # pylint: disable-next=import-outside-toplevel
+    import metrics
+
+    metrics.mark_process_dead(worker.pid)
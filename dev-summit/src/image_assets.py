@@ -0,0 +1,242 @@
+import os
+import pathlib
+import re
+import tempfile
+from urllib.parse import unquote
+
+from deck import file_digest
+
+# Abgeleitete Bild-Varianten für PDF-Export und Browser: skaliert, neu
+# komprimiert und auf der Platte nach Quell-Hash zwischengespeichert.
+
+ASSET_CACHE_DIR = os.environ.get(
+    "ASSET_CACHE_DIR", os.path.join(tempfile.gettempdir(), "devsummit-asset-cache")
+)
+PRINT_DPI = int(os.environ.get("PDF_IMAGE_DPI", "150"))
+# A4 quer abzüglich 1cm Seitenrand links und rechts
+PRINT_WIDTH_CM = 27.7
+JPEG_QUALITY = 85
+ASSET_SCHEME = "deck-asset:"
+
+RASTER_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".bmp", ".tif", ".tiff"}
+
+# Breiten-Buckets für responsive Browser-Varianten (srcset)
+WIDTH_BUCKETS = (320, 640, 1024, 1600)
+IMG_TAG_REGEX = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+SRC_ATTR_REGEX = re.compile(
+    r'\bsrc=["\'](\/slide\/images\/|\.\/images\/|images\/)([^"\']+)["\']'
+)
+
+# Quell-Hash -> (Breite, Höhe)
+_DIMENSIONS = {}
+
+
+def print_width_px(dpi: int = PRINT_DPI) -> int:
+    return round(PRINT_WIDTH_CM / 2.54 * dpi)
+
+
+def _has_alpha(img) -> bool:
+    return img.mode in ("RGBA", "LA", "PA") or (
+        img.mode == "P" and "transparency" in img.info
+    )
+
+
+def _write_atomic(cache_dir: str, path: str, write):
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _derive(
+    src_path: str, variant_id: str, max_width: int, webp: bool, cache_dir: str
+) -> str:
+    ext = os.path.splitext(src_path)[1].lower()
+    stem = os.path.join(cache_dir, f"{file_digest(src_path)}-{variant_id}")
+    for variant_ext in (".webp",) if webp else (".jpg", ".png", ext):
+        if os.path.exists(stem + variant_ext):
+            return stem + variant_ext
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Pillow erst beim ersten Bild laden
+    from PIL import Image  # pylint: disable=import-outside-toplevel
+
+    with Image.open(src_path) as img:
+        # JPEG-Quellen direkt verkleinert dekodieren
+        img.draft("RGB", (max_width, max_width * img.height // max(img.width, 1)))
+        resized = img.width > max_width
+        if resized:
+            height = max(1, round(img.height * max_width / img.width))
+            img = img.resize((max_width, height), Image.Resampling.LANCZOS)
+
+        if webp:
+            variant_ext, save_kwargs = ".webp", {"format": "WEBP", "quality": 80}
+        elif _has_alpha(img) or img.mode == "P":
+            variant_ext, save_kwargs = ".png", {"format": "PNG", "optimize": True}
+        else:
+            img = img.convert("RGB")
+            variant_ext = ".jpg"
+            save_kwargs = {
+                "format": "JPEG",
+                "quality": JPEG_QUALITY,
+                "optimize": True,
+                "progressive": True,
+            }
+        path = stem + variant_ext
+        _write_atomic(cache_dir, path, lambda f: img.save(f, **save_kwargs))
+
+    if not resized and not webp and os.path.getsize(path) >= os.path.getsize(src_path):
+        # Neu kodiert nicht kleiner: Original übernehmen
+        os.unlink(path)
+        path = stem + ext
+        with open(src_path, "rb") as src:
+            _write_atomic(cache_dir, path, lambda f: f.write(src.read()))
+    return path
+
+
+def print_variant(
+    src_path: str, dpi: int = PRINT_DPI, cache_dir: str = ASSET_CACHE_DIR
+) -> str:
+    """Return the path of a print-optimized copy of the image at ``src_path``.
+
+    Raster images wider than the printable A4 landscape width at ``dpi`` are
+    downscaled; opaque images are stored as JPEG, images with transparency or
+    a palette as optimized PNG. The smaller of variant and original is kept.
+    Vector and unknown formats are returned unchanged.
+    """
+    if os.path.splitext(src_path)[1].lower() not in RASTER_EXTENSIONS:
+        return src_path
+    return _derive(src_path, f"{dpi}dpi", print_width_px(dpi), False, cache_dir)
+
+
+def width_bucket(width: int) -> int:
+    """Round ``width`` up to the next entry of ``WIDTH_BUCKETS``."""
+    for bucket in WIDTH_BUCKETS:
+        if width <= bucket:
+            return bucket
+    return WIDTH_BUCKETS[-1]
+
+
+def image_size(path: str) -> tuple[int, int] | None:
+    """Return the intrinsic ``(width, height)`` of a raster image, memoized by hash."""
+    if os.path.splitext(path)[1].lower() not in RASTER_EXTENSIONS:
+        return None
+    digest = file_digest(path)
+    size = _DIMENSIONS.get(digest)
+    if size is None:
+        # Nur der Header wird gelesen, nicht die Pixeldaten
+        from PIL import Image  # pylint: disable=import-outside-toplevel
+
+        with Image.open(path) as img:
+            size = img.size
+        _DIMENSIONS[digest] = size
+    return size
+
+
+def web_variant(
+    src_path: str, width: int, webp: bool = False, cache_dir: str = ASSET_CACHE_DIR
+) -> str:
+    """Return a browser rendition of ``src_path`` at most ``width`` pixels wide.
+
+    The width is rounded up to a bucket. Without WebP the original is returned
+    when it is not wider than the bucket.
+    """
+    size = image_size(src_path)
+    if size is None:
+        return src_path
+    bucket = width_bucket(width)
+    if size[0] <= bucket and not webp:
+        return src_path
+    variant_id = f"w{bucket}"
+    return _derive(src_path, variant_id, bucket, webp, cache_dir)
+
+
+def _srcset(url: str, width: int) -> str:
+    candidates = [
+        f"{url}?w={bucket} {bucket}w" for bucket in WIDTH_BUCKETS if bucket < width
+    ]
+    if width <= WIDTH_BUCKETS[-1]:
+        candidates.append(f"{url} {width}w")
+    return ", ".join(candidates)
+
+
+def responsive_images(html: str, images_dir: str, url_prefix: str):
+    """Add ``srcset``, ``width``/``height`` and lazy loading to slide images.
+
+    Returns the rewritten HTML and the image paths it depends on.
+    """
+    used_paths = []
+
+    def rewrite_tag(match):
+        tag = match.group(0)
+        src = SRC_ATTR_REGEX.search(tag)
+        if src is None:
+            return tag
+        filename = src.group(2)
+        path = os.path.join(images_dir, filename)
+        if not os.path.isfile(path) or image_size(path) is None:
+            return tag
+        used_paths.append(path)
+        width, height = image_size(path)
+        url = url_prefix + filename
+
+        attrs = [f'srcset="{_srcset(url, width)}"']
+        fixed_width = re.search(r'\bwidth=["\']?(\d+)["\']?[\s/>]', tag)
+        attrs.append(
+            f'sizes="{fixed_width.group(1)}px"' if fixed_width else 'sizes="95vw"'
+        )
+        if not re.search(r"\b(width|height)=", tag):
+            attrs.append(f'width="{width}" height="{height}"')
+        if "loading=" not in tag:
+            attrs.append('loading="lazy"')
+        if "decoding=" not in tag:
+            attrs.append('decoding="async"')
+        tag = tag[: src.start()] + f'src="{url}"' + tag[src.end() :]
+        return tag[:4] + " " + " ".join(attrs) + tag[4:]
+
+    return IMG_TAG_REGEX.sub(rewrite_tag, html), used_paths
+
+
+def asset_url(filename: str) -> str:
+    """Return the ``deck-asset:`` URL used in PDF HTML for an image file name."""
+    return f"{ASSET_SCHEME}{filename}"
+
+
+def resolve_asset_url(url: str, images_dir: str) -> str:
+    """Map a ``deck-asset:`` URL to a ``file://`` URL of its print variant."""
+    if not url.startswith(ASSET_SCHEME):
+        return url
+    images_dir = os.path.realpath(images_dir)
+    path = os.path.realpath(os.path.join(images_dir, unquote(url[len(ASSET_SCHEME) :])))
+    if os.path.commonpath([images_dir, path]) != images_dir:
+        raise ValueError(f"Asset outside of images directory: {url}")
+    return pathlib.Path(print_variant(path)).as_uri()
+
+
+def pdf_url_fetcher(images_dir: str):
+    """Return a WeasyPrint ``url_fetcher`` that serves print variants.
+
+    ``deck-asset:`` URLs are resolved to the cached variant on disk and then
+    fetched by WeasyPrint's default fetcher like any other file.
+    """
+    # pylint: disable=import-outside-toplevel
+    try:
+        from weasyprint import default_url_fetcher
+    except ImportError:  # WeasyPrint >= 67: class-based fetchers
+        from weasyprint.urls import URLFetcher
+
+        class _AssetFetcher(URLFetcher):  # pylint: disable=too-few-public-methods
+            def fetch(self, url, headers=None):
+                return super().fetch(resolve_asset_url(url, images_dir), headers)
+
+        return _AssetFetcher()
+
+    def fetch(url):
+        return default_url_fetcher(resolve_asset_url(url, images_dir))
+
+    return fetch
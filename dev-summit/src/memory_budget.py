@@ -0,0 +1,65 @@
+import os
+import threading
+from collections import OrderedDict
+
+# Gemeinsames Speicherbudget für alle In-Memory-Caches (alle Decks): die am
+# längsten nicht genutzten Einträge werden cache-übergreifend verdrängt.
+
+MEMORY_BUDGET_MB = float(os.environ.get("MEMORY_BUDGET_MB", "256"))
+# Schätzwert für Objekte ohne einfach bestimmbare Größe (Templates, Manifeste)
+DEFAULT_ENTRY_SIZE = 4096
+
+
+def estimate_size(value) -> int:
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_size(item) for item in value)
+    return DEFAULT_ENTRY_SIZE
+
+
+class MemoryBudget:
+    """LRU accounting of entries from several caches against one byte limit.
+
+    Caches ``charge()`` new entries and ``touch()`` them on hits; once the
+    budget is exceeded the least recently used entries of any cache are
+    handed back to their owner's ``evict(key)``.
+    """
+
+    def __init__(self, max_bytes: int = int(MEMORY_BUDGET_MB * 2**20)):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self.evictions = 0
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+    def charge(self, owner, key, size: int):
+        evicted = []
+        with self._lock:
+            self.used -= self._lru.pop((owner, key), 0)
+            self._lru[(owner, key)] = size
+            self.used += size
+            # Der neue Eintrag selbst bleibt immer erhalten
+            while self.used > self.max_bytes and len(self._lru) > 1:
+                entry, old_size = self._lru.popitem(last=False)
+                self.used -= old_size
+                evicted.append(entry)
+            self.evictions += len(evicted)
+        # Außerhalb der Sperre, damit Owner eigene Sperren nehmen können
+        for evicted_owner, evicted_key in evicted:
+            evicted_owner.evict(evicted_key)
+
+    def touch(self, owner, key):
+        with self._lock:
+            if (owner, key) in self._lru:
+                self._lru.move_to_end((owner, key))
+
+    def release(self, owner, key):
+        with self._lock:
+            self.used -= self._lru.pop((owner, key), 0)
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+
+MEMORY_BUDGET = MemoryBudget()
@@ -0,0 +1,315 @@
+import bisect
+import contextlib
+import json
+import os
+import threading
+import time
+
+# Prometheus-Metriken im Textformat, ohne Client-Bibliothek. Jede Beobachtung
+# kostet ein perf_counter() und eine kurze Sperre, das bleibt dauerhaft an.
+#
+# Unter gunicorn hat jeder Worker-Prozess eigene Werte. Mit METRICS_DIR (setzt
+# gunicorn.conf.py) schreibt jeder Prozess alle METRICS_FLUSH_INTERVAL Sekunden
+# einen Schnappschuss <pid>.json dorthin; /metrics summiert alle Schnappschüsse.
+# Werte anderer Worker sind also bis zu METRICS_FLUSH_INTERVAL alt. Zähler
+# beendeter Worker bleiben in dead.json erhalten, ihre Gauges entfallen.
+
+METRICS_DIR = os.environ.get("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "5"))
+DEAD_WORKERS = "dead.json"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+class Registry:
+    """Collection of metrics rendered together by :meth:`render`."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self, directory: str | None = None) -> str:
+        """Text exposition of this process, or of all snapshots in ``directory``."""
+        if directory:
+            self.write_snapshot(directory)
+            families = _merge(_read_snapshots(directory))
+        else:
+            families = self.snapshot()
+        lines = []
+        for family in families:
+            lines.append(f"# HELP {family['name']} {family['documentation']}")
+            lines.append(f"# TYPE {family['name']} {family['kind']}")
+            for name, labels, value in family["samples"]:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> list[dict]:
+        return [
+            {
+                "name": metric.name,
+                "documentation": metric.documentation,
+                "kind": metric.kind,
+                "samples": [list(sample) for sample in metric.samples()],
+            }
+            for metric in self._metrics
+        ]
+
+    def write_snapshot(self, directory: str, name: str | None = None):
+        """Write this process's values to ``<directory>/<name or pid>.json``."""
+        _write_json(
+            os.path.join(directory, f"{name or os.getpid()}.json"), self.snapshot()
+        )
+
+    def reset(self):
+        """Forget all values, e.g. those a forked worker inherited."""
+        for metric in self._metrics:
+            metric.reset()
+
+
+def _write_json(path: str, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.{os.getpid()}.tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(f"{path}.{os.getpid()}.tmp", path)
+
+
+def _load_snapshot(path: str) -> list[dict]:
+    # Ein Worker kann zwischen listdir() und open() beendet worden sein
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def _read_snapshots(directory: str) -> list[list[dict]]:
+    return [
+        _load_snapshot(os.path.join(directory, filename))
+        for filename in sorted(os.listdir(directory))
+        if filename.endswith(".json")
+    ]
+
+
+def _merge(snapshots) -> list[dict]:
+    """Sum samples with the same name and labels across snapshots."""
+    families = {}
+    for snapshot in snapshots:
+        for family in snapshot:
+            merged = families.setdefault(family["name"], {**family, "samples": {}})
+            for name, labels, value in family["samples"]:
+                key = (name, tuple(labels.items()))
+                merged["samples"][key] = merged["samples"].get(key, 0) + value
+    return [
+        {
+            **family,
+            "samples": [
+                [name, dict(labels), value]
+                for (name, labels), value in family["samples"].items()
+            ],
+        }
+        for family in families.values()
+    ]
+
+
+def mark_process_dead(pid: int, directory: str | None = None):
+    """Fold the counters of an exited worker into ``dead.json``; drop its gauges."""
+    directory = directory or METRICS_DIR
+    path = os.path.join(directory, f"{pid}.json")
+    if not os.path.exists(path):
+        return
+    dead = os.path.join(directory, DEAD_WORKERS)
+    snapshot = [family for family in _load_snapshot(path) if family["kind"] != "gauge"]
+    _write_json(dead, _merge([_load_snapshot(dead), snapshot]))
+    os.unlink(path)
+
+
+def clear_snapshots(directory: str | None = None):
+    """Remove the snapshots of a previous server run."""
+    directory = directory or METRICS_DIR
+    with contextlib.suppress(FileNotFoundError):
+        for filename in os.listdir(directory):
+            if filename.endswith(".json"):
+                os.unlink(os.path.join(directory, filename))
+
+
+def start_flusher(
+    registry=None, directory: str | None = None, interval: float | None = None
+):
+    """Write snapshots of ``registry`` every ``interval`` seconds in the background."""
+    registry = registry or REGISTRY
+    directory = directory or METRICS_DIR
+    interval = interval or METRICS_FLUSH_INTERVAL
+
+    def flush():
+        while True:
+            registry.write_snapshot(directory)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=flush, name="metrics-flusher", daemon=True)
+    thread.start()
+    return thread
+
+
+REGISTRY = Registry()
+
+
+class _Metric:  # pylint: disable=too-few-public-methods
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> dict:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, self._labels(key), value
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bucket bounds in seconds."""
+
+    kind = "histogram"
+
+    def __init__(self, *args, buckets=DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = [
+                (key, list(counts), total)
+                for key, (counts, total) in self._values.items()
+            ]
+        for key, counts, total in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {
+                    **labels,
+                    "le": _format_value(bound),
+                }, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class FunctionMetric(_Metric):  # pylint: disable=too-few-public-methods
+    """Metric whose samples are read from ``collect()`` at scrape time.
+
+    ``collect()`` returns ``(labels, value)`` pairs.
+    """
+
+    def __init__(self, name, documentation, kind, collect, registry=REGISTRY):
+        super().__init__(name, documentation, registry=registry)
+        self.kind = kind
+        self.collect = collect
+
+    def samples(self):
+        for labels, value in self.collect():
+            yield self.name, labels, value
+
+
+REQUEST_LATENCY = Histogram(
+    "devsummit_request_duration_seconds",
+    "Request latency per endpoint.",
+    ("endpoint", "status"),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "devsummit_requests_in_flight", "Requests currently being handled."
+)
+RESPONSE_BYTES = Counter(
+    "devsummit_response_bytes_total", "Response body bytes per endpoint.", ("endpoint",)
+)
+RENDER_PHASE_SECONDS = Histogram(
+    "devsummit_render_phase_seconds",
+    "Slide rendering phases: markdown and images on cache misses, template per page.",
+    ("phase",),
+)
+PDF_PHASE_SECONDS = Histogram(
+    "devsummit_pdf_phase_seconds",
+    "PDF build phases: prepare, layout and write per fragment, merge.",
+    ("phase",),
+)
+CACHE_REQUESTS = Counter(
+    "devsummit_cache_requests_total", "Cache lookups by result.", ("cache", "result")
+)
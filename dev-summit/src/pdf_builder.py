@@ -0,0 +1,41 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Single-flight PDF-Builds: pro Schlüssel läuft höchstens ein Build, alle
+# weiteren Anfragen warten auf dasselbe Future.
+
+PDF_BUILD_WORKERS = int(os.environ.get("PDF_BUILD_WORKERS", "1"))
+
+
+class PdfBuildScheduler:
+    """Deduplicates PDF builds by key and runs them in a background pool."""
+
+    def __init__(self, max_workers: int = PDF_BUILD_WORKERS):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pdf-build"
+        )
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, build) -> Future:
+        """Run ``build()`` for ``key`` unless a build for it is already running."""
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(build)
+            self._pending[key] = future
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return future
+
+    def pending(self, key: str) -> Future | None:
+        return self._pending.get(key)
+
+    def _forget(self, key: str, future: Future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
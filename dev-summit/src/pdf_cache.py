@@ -0,0 +1,151 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+import time
+
+from deck import file_digest
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Inhaltsadressierter PDF-Cache auf der Platte, gemeinsam für alle Worker-Prozesse
+# und über Neustarts hinweg. Schlüssel ist ein Hash über Folien, Bilder und CSS.
+
+PDF_CACHE_DIR = os.environ.get(
+    "PDF_CACHE_DIR", os.path.join(tempfile.gettempdir(), "devsummit-pdf-cache")
+)
+
+
+def media_files(media_dir: str) -> list[str]:
+    """Every file below ``media_dir``, in a stable order."""
+    paths = []
+    for root, dirs, filenames in os.walk(media_dir):
+        dirs.sort()
+        paths.extend(os.path.join(root, filename) for filename in sorted(filenames))
+    return paths
+
+
+def deck_fingerprint(slide_paths, media_dir: str, *extra: str) -> str:
+    """Hash the slide sources, every file below ``media_dir`` and ``extra`` strings.
+
+    The slide order is part of the fingerprint because slide numbers are
+    rendered into the PDF.
+    """
+    sha = hashlib.sha256()
+    for path in slide_paths:
+        sha.update(f"slide:{os.path.basename(path)}:{file_digest(path)}\n".encode())
+    for path in media_files(media_dir):
+        rel_path = os.path.relpath(path, media_dir)
+        sha.update(f"media:{rel_path}:{file_digest(path)}\n".encode())
+    for value in extra:
+        sha.update(b"extra:")
+        sha.update(hashlib.sha256(value.encode("utf-8")).digest())
+    return sha.hexdigest()
+
+
+class PdfCache:
+    """PDF files stored as ``<key>.pdf`` in ``cache_dir``, written atomically.
+
+    With ``max_entries`` the cache keeps only that many PDFs and evicts the
+    least recently used ones (by atime, see :meth:`touch`) after each write.
+    """
+
+    def __init__(self, cache_dir: str = PDF_CACHE_DIR, max_entries: int | None = None):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def contains(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def keys(self) -> list[str]:
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return []
+        return [name[:-4] for name in names if name.endswith(".pdf")]
+
+    def touch(self, key: str):
+        """Mark ``key`` as recently used for the LRU eviction.
+
+        Only the atime is set; the mtime is the Last-Modified of the download.
+        """
+        path = self.path(key)
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+
+    def prune(self, keep) -> list[str]:
+        """Delete every PDF (and its lock file) whose key is not in ``keep``."""
+        keep = set(keep)
+        removed = [key for key in self.keys() if key not in keep]
+        for key in removed:
+            self._remove(key)
+        return removed
+
+    def evict(self, newest: str | None = None) -> list[str]:
+        """Delete the least recently used PDFs beyond ``max_entries``.
+
+        ``newest`` (the PDF just written) is never evicted.
+        """
+        if self.max_entries is None:
+            return []
+        entries = [(float("inf"), newest)] if newest is not None else []
+        for key in self.keys():
+            if key == newest:
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                entries.append((os.stat(self.path(key)).st_atime_ns, key))
+        entries.sort(reverse=True)
+        removed = [key for _, key in entries[self.max_entries :]]
+        for key in removed:
+            self._remove(key)
+        return removed
+
+    def _remove(self, key: str):
+        # Eine parallel gehaltene Sperre bleibt gültig (offener Deskriptor);
+        # schlimmstenfalls wird dieselbe Datei ein zweites Mal gebaut
+        for path in (self.path(key), self._lock_path(key)):
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+
+    def _lock_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f".{key}.lock")
+
+    @contextlib.contextmanager
+    def lock(self, key: str):
+        """Hold an exclusive lock for ``key`` across all processes on this host."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._lock_path(key), "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextlib.contextmanager
+    def spool(self, key: str):
+        """Yield a binary file that atomically becomes ``<key>.pdf`` on success.
+
+        Output is streamed to a temporary file in the cache directory and only
+        moved into place via ``os.replace`` once it was written completely.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict(newest=key)
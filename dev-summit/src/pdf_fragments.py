@@ -0,0 +1,276 @@
+import functools
+import hashlib
+import io
+import os
+import re
+from urllib.parse import unquote
+
+from deck import file_digest
+from image_assets import ASSET_SCHEME
+
+# Ein PDF-Fragment pro Folie, nach Inhalts-Hash gecacht. Das Gesamt-PDF (oder
+# ein Folienbereich) entsteht durch Zusammenfügen der Fragmente, sodass nach
+# einer Änderung nur die betroffene Folie neu gerendert wird. Das Zusammenfügen
+# schreibt Objekt für Objekt, statt das ganze Dokument im Speicher aufzubauen.
+
+ASSET_URL_REGEX = re.compile(re.escape(ASSET_SCHEME) + r"([^\"'\s)]+)")
+SELECTION_REGEX = re.compile(r"^(\d+)(?:-(\d*))?$")
+
+
+def parse_slide_selection(selection: str, total: int) -> tuple[int, ...]:
+    """Parse ``"3-7"``, ``"2,5-"`` or ``"4"`` into sorted 1-based slide numbers.
+
+    Raises ``ValueError`` for malformed input or numbers outside the deck.
+    """
+    slides = set()
+    for part in selection.replace(" ", "").split(","):
+        match = SELECTION_REGEX.match(part)
+        if match is None:
+            raise ValueError(f"Invalid slide selection: {selection!r}")
+        start = int(match.group(1))
+        if match.group(2) is None:
+            end = start
+        else:
+            end = int(match.group(2)) if match.group(2) else total
+        if not 1 <= start <= end <= total:
+            raise ValueError(f"Slides {part} outside of 1-{total}")
+        slides.update(range(start, end + 1))
+    return tuple(sorted(slides))
+
+
+def format_slide_selection(slides) -> str:
+    """Inverse of :func:`parse_slide_selection` with ranges collapsed, e.g. ``3-7``."""
+    parts = []
+    start = prev = None
+    for num in sorted(slides):
+        if prev is not None and num == prev + 1:
+            prev = num
+            continue
+        if start is not None:
+            parts.append(str(start) if start == prev else f"{start}-{prev}")
+        start = prev = num
+    if start is not None:
+        parts.append(str(start) if start == prev else f"{start}-{prev}")
+    return ",".join(parts)
+
+
+def fragment_key(html: str, images_dir: str, *extra: str) -> str:
+    """Hash a slide's PDF HTML together with every image it references."""
+    sha = hashlib.sha256(html.encode("utf-8"))
+    for filename in sorted(set(ASSET_URL_REGEX.findall(html))):
+        path = os.path.join(images_dir, unquote(filename))
+        if os.path.isfile(path):
+            sha.update(f"\nasset:{filename}:{file_digest(path)}".encode())
+    for value in extra:
+        sha.update(f"\nextra:{value}".encode("utf-8"))
+    return sha.hexdigest()
+
+
+@functools.cache
+def _pypdf():
+    import pypdf  # pylint: disable=import-outside-toplevel
+
+    return pypdf
+
+
+def _ref(num: int):
+    return _pypdf().generic.IndirectObject(num, 0, None)
+
+
+def _dictionary(entries: dict):
+    generic = _pypdf().generic
+    return generic.DictionaryObject(
+        {generic.NameObject(key): value for key, value in entries.items()}
+    )
+
+
+def merge_pdfs(paths, target):
+    """Concatenate the PDF files at ``paths`` into the binary file ``target``.
+
+    Objects are copied one fragment at a time and written out immediately, so
+    memory stays at the size of the largest fragment instead of the whole
+    deck. Identical objects, e.g. the logos in every fragment, are written
+    once; bookmarks are carried over.
+    """
+    merger = _StreamingMerger(target)
+    for path in paths:
+        merger.append(path)
+    merger.finish()
+
+
+class _StreamingMerger:
+    """Writes a PDF object by object; keeps only offsets and digests."""
+
+    PAGES = 1
+    CATALOG = 2
+
+    def __init__(self, target):
+        self._target = target
+        self._position = 0
+        # Objektnummer -> Byte-Offset, 1 und 2 sind Seitenbaum und Katalog
+        self._offsets = [None, None, None]
+        self._digests = {}
+        self._kids = []
+        self._outline = []
+        self._write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    def append(self, path: str):
+        reader = _pypdf().PdfReader(path)
+        mapping = {}
+        pages = [page.indirect_reference.idnum for page in reader.pages]
+        for idnum in pages:
+            # Seitennummern vorab vergeben, Annotationen verweisen zurück
+            mapping[idnum] = self._allocate()
+            self._kids.append(mapping[idnum])
+        for idnum in pages:
+            self._copy(reader.get_object(idnum), idnum, mapping, set())
+        self._outline.extend(self._outline_items(reader, reader.outline, mapping))
+
+    def finish(self):
+        generic = _pypdf().generic
+        pages = {
+            "/Type": generic.NameObject("/Pages"),
+            "/Kids": generic.ArrayObject(_ref(num) for num in self._kids),
+            "/Count": generic.NumberObject(len(self._kids)),
+        }
+        self._write_object(self.PAGES, _dictionary(pages))
+        catalog = {"/Type": generic.NameObject("/Catalog"), "/Pages": _ref(self.PAGES)}
+        if self._outline:
+            catalog["/Outlines"] = _ref(self._write_outline())
+        self._write_object(self.CATALOG, _dictionary(catalog))
+
+        xref = self._position
+        lines = [f"xref\n0 {len(self._offsets)}\n", "0000000000 65535 f \n"]
+        lines.extend(f"{offset:010d} 00000 n \n" for offset in self._offsets[1:])
+        lines.append(
+            f"trailer\n<< /Size {len(self._offsets)} /Root {self.CATALOG} 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n"
+        )
+        self._write("".join(lines).encode("ascii"))
+
+    def _copy(self, obj, idnum, mapping, active) -> int:
+        """Write the object ``idnum`` after everything it references."""
+        active.add(idnum)
+        obj = self._remap(obj, mapping, active)
+        active.discard(idnum)
+        num = mapping.get(idnum)
+        if num is not None:
+            # Seite oder Teil eines Zyklus: Nummer steht schon fest
+            self._write_object(num, obj)
+            return num
+        data = self._serialize(obj)
+        digest = hashlib.sha256(data).digest()
+        num = self._digests.get(digest)
+        if num is None:
+            num = self._digests[digest] = self._allocate()
+            self._write_serialized(num, data)
+        mapping[idnum] = num
+        return num
+
+    def _remap(self, obj, mapping, active):
+        generic = _pypdf().generic
+        if isinstance(obj, generic.IndirectObject):
+            num = mapping.get(obj.idnum)
+            if num is None and obj.idnum in active:
+                num = mapping[obj.idnum] = self._allocate()
+            if num is None:
+                target = obj.get_object()
+                if target is None:
+                    return generic.NullObject()
+                num = self._copy(target, obj.idnum, mapping, active)
+            return _ref(num)
+        if isinstance(obj, generic.StreamObject):
+            copy = generic.StreamObject()
+            copy.set_data(obj._data)  # pylint: disable=protected-access
+        elif isinstance(obj, generic.DictionaryObject):
+            copy = generic.DictionaryObject()
+        elif isinstance(obj, generic.ArrayObject):
+            return generic.ArrayObject(
+                self._remap(item, mapping, active) for item in obj
+            )
+        else:
+            return obj
+        for key, value in obj.items():
+            if key == "/Parent" and obj.get("/Type") == "/Page":
+                copy[key] = _ref(self.PAGES)
+            elif key != "/Length" or not isinstance(copy, generic.StreamObject):
+                copy[key] = self._remap(value, mapping, active)
+        return copy
+
+    def _outline_items(self, reader, outline, mapping) -> list:
+        items = []
+        for entry in outline:
+            if isinstance(entry, list):
+                if items:
+                    items[-1][2].extend(self._outline_items(reader, entry, mapping))
+                continue
+            page = reader.get_destination_page_number(entry)
+            if page is None:
+                continue
+            ref = reader.pages[page].indirect_reference
+            dest = [_ref(mapping[ref.idnum]), *entry.dest_array[1:]]
+            items.append((entry.title, dest, []))
+        return items
+
+    def _write_outline(self) -> int:
+        generic = _pypdf().generic
+        root = self._allocate()
+        first, last, count = self._write_outline_level(self._outline, root)
+        outlines = {
+            "/Type": generic.NameObject("/Outlines"),
+            "/First": _ref(first),
+            "/Last": _ref(last),
+            "/Count": generic.NumberObject(count),
+        }
+        self._write_object(root, _dictionary(outlines))
+        return root
+
+    def _write_outline_level(self, items, parent: int) -> tuple[int, int, int]:
+        generic = _pypdf().generic
+        nums = [self._allocate() for _ in items]
+        count = len(items)
+        for position, (title, dest, children) in enumerate(items):
+            item = {
+                "/Title": generic.TextStringObject(title),
+                "/Parent": _ref(parent),
+                "/Dest": generic.ArrayObject(dest),
+            }
+            if position > 0:
+                item["/Prev"] = _ref(nums[position - 1])
+            if position < len(items) - 1:
+                item["/Next"] = _ref(nums[position + 1])
+            if children:
+                first, last, descendants = self._write_outline_level(
+                    children, nums[position]
+                )
+                item.update(
+                    {
+                        "/First": _ref(first),
+                        "/Last": _ref(last),
+                        "/Count": generic.NumberObject(descendants),
+                    }
+                )
+                count += descendants
+            self._write_object(nums[position], _dictionary(item))
+        return nums[0], nums[-1], count
+
+    def _allocate(self) -> int:
+        self._offsets.append(None)
+        return len(self._offsets) - 1
+
+    @staticmethod
+    def _serialize(obj) -> bytes:
+        buffer = io.BytesIO()
+        obj.write_to_stream(buffer)
+        return buffer.getvalue()
+
+    def _write_object(self, num: int, obj):
+        self._write_serialized(num, self._serialize(obj))
+
+    def _write_serialized(self, num: int, data: bytes):
+        self._offsets[num] = self._position
+        self._write(b"%d 0 obj\n%s\nendobj\n" % (num, data))
+
+    def _write(self, data: bytes):
+        self._target.write(data)
+        self._position += len(data)
@@ -0,0 +1,69 @@
+import functools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from image_assets import pdf_url_fetcher
+from pdf_cache import PdfCache
+
+# Layout der PDF-Fragmente. WeasyPrint ist CPU-gebunden und single-threaded,
+# fehlende Folien werden daher auf einen Prozess-Pool verteilt.
+
+PDF_RENDER_WORKERS = int(os.environ.get("PDF_RENDER_WORKERS", os.cpu_count() or 1))
+# Unterhalb dieser Anzahl fehlender Fragmente lohnt sich kein Prozess-Start
+PARALLEL_THRESHOLD = 4
+
+
+@functools.cache
+def _html_class():
+    # WeasyPrint (Pango/Cairo) erst beim ersten PDF laden, nicht beim Start
+    from weasyprint import HTML  # pylint: disable=import-outside-toplevel
+
+    return HTML
+
+
+def render_fragment(
+    cache_dir: str, key: str, html: str, images_dir: str
+) -> tuple[float, float]:
+    """Lay out one PDF fragment and stream it into the cache at ``cache_dir``.
+
+    Returns the seconds spent on layout and on writing the PDF.
+    """
+    cache = PdfCache(cache_dir)
+    start = time.perf_counter()
+    document = _html_class()(
+        string=html, url_fetcher=pdf_url_fetcher(images_dir)
+    ).render()
+    laid_out = time.perf_counter()
+    with cache.spool(key) as f:
+        document.write_pdf(f)
+    return laid_out - start, time.perf_counter() - laid_out
+
+
+def _render_job(job) -> tuple[float, float]:
+    return render_fragment(*job)
+
+
+def render_fragments(
+    cache: PdfCache, jobs, images_dir: str, workers=None
+) -> list[tuple[float, float]]:
+    """Render the ``(key, html)`` jobs whose fragment is missing from ``cache``.
+
+    With more than one worker and enough missing fragments they are laid out
+    in a process pool; the workers write straight into the cache, so only
+    their timings cross the process boundary. Returns the ``(layout, write)``
+    seconds of every rendered fragment.
+    """
+    workers = PDF_RENDER_WORKERS if workers is None else workers
+    missing = {key: html for key, html in jobs if not cache.contains(key)}
+    args = [(cache.cache_dir, key, html, images_dir) for key, html in missing.items()]
+    if workers > 1 and len(args) >= PARALLEL_THRESHOLD:
+        workers = min(workers, len(args))
+        chunksize = max(1, len(args) // (workers * 4))
+        # spawn statt fork: der Aufrufer ist meist ein Thread eines Web-Workers
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            return list(pool.map(_render_job, args, chunksize=chunksize))
+    return [_render_job(job) for job in args]
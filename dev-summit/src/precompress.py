@@ -0,0 +1,114 @@
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from memory_budget import MEMORY_BUDGET
+
+try:
+    import brotli
+except ImportError:  # Brotli ist optional (kommt i.d.R. über WeasyPrint mit)
+    brotli = None
+
+# Vorkomprimierte Varianten (gzip/brotli) für HTML, SVG und andere Textformate,
+# als .gz/.br-Geschwister im statischen Export und als Cache in der Flask-App.
+
+COMPRESSIBLE_EXTENSIONS = {".html", ".svg", ".css", ".js", ".json", ".txt", ".xml"}
+COMPRESSIBLE_MIMETYPES = {
+    "text/html",
+    "image/svg+xml",
+    "text/css",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "text/plain",
+}
+# Kleinere Antworten lohnen die Kompression nicht
+MIN_SIZE = 512
+# Statischer Export: einmal, dafür maximal komprimieren. Zur Laufzeit (App)
+# zählt die Latenz, q5 liegt meist nur wenige Prozent über q11.
+BROTLI_QUALITY_STATIC = 11
+BROTLI_QUALITY_DYNAMIC = int(os.environ.get("BROTLI_QUALITY_DYNAMIC", "5"))
+
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def compress(data: bytes, encoding: str, quality: int = BROTLI_QUALITY_STATIC) -> bytes:
+    """Encode ``data``; ``quality`` applies to brotli only."""
+    if encoding == "br":
+        return brotli.compress(data, quality=quality)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def is_compressible(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def write_precompressed(path: str, quality: int = BROTLI_QUALITY_STATIC) -> list[str]:
+    """Write ``.br``/``.gz`` siblings of ``path`` and return their paths.
+
+    Siblings that would not be smaller than the original are not written and
+    stale ones are removed. ``quality`` is the brotli quality.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    written = []
+    for encoding in ENCODINGS:
+        sibling = path + SUFFIXES[encoding]
+        compressed = (
+            compress(data, encoding, quality) if len(data) >= MIN_SIZE else None
+        )
+        if compressed is None or len(compressed) >= len(data):
+            if os.path.exists(sibling):
+                os.unlink(sibling)
+            continue
+        with open(sibling + ".tmp", "wb") as f:
+            f.write(compressed)
+        os.replace(sibling + ".tmp", sibling)
+        written.append(sibling)
+    return written
+
+
+class CompressedCache:
+    """Bounded LRU cache of compressed bodies, keyed by content hash and encoding.
+
+    Besides ``max_entries`` the bodies count against the shared memory
+    ``budget``.
+    """
+
+    def __init__(self, max_entries: int = 512, budget=None):
+        self.max_entries = max_entries
+        self.budget = budget if budget is not None else MEMORY_BUDGET
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, data: bytes, encoding: str) -> bytes:
+        key = (hashlib.blake2b(data, digest_size=16).digest(), encoding)
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+        if compressed is not None:
+            self.budget.touch(self, key)
+            return compressed
+        compressed = compress(data, encoding, BROTLI_QUALITY_DYNAMIC)
+        evicted = []
+        with self._lock:
+            self._entries[key] = compressed
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+        for old_key in evicted:
+            self.budget.release(self, old_key)
+        self.budget.charge(self, key, len(compressed))
+        return compressed
+
+    def evict(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
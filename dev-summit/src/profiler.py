@@ -0,0 +1,143 @@
+import argparse
+import collections
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Sampling-Profiler für einzelne Requests und PDF-Builds. Ein Hintergrund-Thread
+# liest in festen Abständen den Stack des profilierten Threads aus; das Ergebnis
+# wird im "folded"-Format geschrieben (flamegraph.pl, speedscope, inferno).
+#
+#   python profiler.py [-o static.folded]   profiliert render_static_html()
+#
+# PDF-Builds: PROFILE_PDF_BUILDS=true oder ?profile=<PROFILE_TOKEN> (app.py).
+
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", "0.005"))
+PROFILE_DIR = os.environ.get(
+    "PROFILE_DIR", os.path.join(tempfile.gettempdir(), "devsummit-profiles")
+)
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+def _fold(frame) -> str:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """Samples the stack of one thread from a background thread.
+
+    Use as a context manager; the thread entering it is profiled. The overhead
+    is one ``sys._current_frames()`` call per ``interval``.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL, label: str = "main"):
+        self.interval = interval
+        self.label = label
+        self.stacks = collections.Counter()
+        self.thread_id = None
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._sampler.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            # pylint: disable-next=protected-access
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[f"{self.label};{_fold(frame)}"] += 1
+
+    def folded(self) -> str:
+        """The samples as ``frame;frame;... count`` lines, root frame first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+    def write(self, name: str, directory: str | None = None) -> str:
+        """Write the folded stacks to ``<directory>/<name>-<time>.folded``."""
+        directory = directory or PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(
+            directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.folded"
+        )
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            f.write(self.folded())
+        os.replace(f"{path}.tmp", path)
+        return path
+
+
+def profile_static_build(
+    output_dir: str | None = None, interval: float = PROFILE_INTERVAL
+) -> SamplingProfiler:
+    """Profile a full ``render_static_html()`` run in this process."""
+    import generate_static  # pylint: disable=import-outside-toplevel
+
+    # Alles im Hauptprozess rendern, sonst fehlen die Seiten im Profil
+    generate_static.STATIC_BUILD_WORKERS = 1
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Leeres Ausgabeverzeichnis: voller statt inkrementeller Build
+        generate_static.OUTPUT_DIR = output_dir or temp_dir
+        with SamplingProfiler(interval, label="static") as profiler:
+            generate_static.render_static_html()
+    return profiler
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sampling profile of render_static_html() as folded stacks"
+    )
+    parser.add_argument("-o", "--output", help="folded stacks file")
+    parser.add_argument("--interval", type=float, default=PROFILE_INTERVAL)
+    parser.add_argument(
+        "--output-dir", help="static output directory (default: empty temp dir)"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    profiler = profile_static_build(args.output_dir, args.interval)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(profiler.folded())
+        path = args.output
+    else:
+        path = profiler.write("static")
+    print(f"{profiler.samples} samples in {elapsed:.2f} s -> {path}")
+
+
+if __name__ == "__main__":
+    main()
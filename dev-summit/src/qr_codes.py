@@ -0,0 +1,138 @@
+import base64
+import io
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import quote
+
+from metrics import CACHE_REQUESTS
+
+# QR-Codes für den PDF-Download auf der letzten Folie. Der Cache ist begrenzt,
+# damit beliebige Host-Header den Speicher nicht unbegrenzt wachsen lassen.
+
+QR_CACHE_SIZE = int(os.environ.get("QR_CACHE_SIZE", "64"))
+# Format für die Folien: "svg" (skalierbar, komprimiert gut) oder "png"
+QR_FORMAT = os.environ.get("QR_FORMAT", "svg")
+BOX_SIZE = 10
+BORDER = 4
+
+
+class QrCodeCache:
+    """Bounded LRU cache of QR code data URLs with hit/miss counters.
+
+    Pinned entries, precomputed for the public URLs at startup, are never
+    evicted.
+    """
+
+    def __init__(self, max_entries: int = QR_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._pinned = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._pinned.get(key)
+            if value is None:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        CACHE_REQUESTS.inc(cache="qr", result="miss" if value is None else "hit")
+        return value
+
+    def put(self, key, value, pin: bool = False):
+        with self._lock:
+            if pin:
+                self._entries.pop(key, None)
+                self._pinned[key] = value
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pinned.clear()
+            self.hits = self.misses = 0
+
+    def __contains__(self, key) -> bool:
+        return key in self._pinned or key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._pinned) + len(self._entries)
+
+
+QR_CACHE = QrCodeCache()
+
+
+def _svg(matrix) -> str:
+    # Zusammenhängende Module einer Zeile als eine Linie der Breite 1
+    size = len(matrix)
+    runs = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < size:
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < size and row[x]:
+                x += 1
+            runs.append(f"M{start} {y}.5h{x - start}")
+    pixels = size * BOX_SIZE
+    return (
+        f"<svg xmlns='http://www.w3.org/2000/svg' width='{pixels}' "
+        f"height='{pixels}' viewBox='0 0 {size} {size}' shape-rendering='crispEdges'>"
+        f"<rect width='{size}' height='{size}' fill='white'/>"
+        f"<path stroke='black' d='{''.join(runs)}'/></svg>"
+    )
+
+
+def _png(qr) -> str:
+    img = qr.make_image(fill_color="black", back_color="white")
+    img_buffer = io.BytesIO()
+    img.save(img_buffer, format="PNG")
+    return base64.b64encode(img_buffer.getvalue()).decode("utf-8")
+
+
+def generate_qr_code(url: str, fmt: str = "png", pin: bool = False) -> str:
+    """Generate a QR code for ``url`` and return it as a data URL.
+
+    ``fmt`` is ``"png"`` or ``"svg"``; ``pin`` keeps the result in the cache
+    regardless of the LRU limit.
+    """
+    key = (url, fmt)
+    data_url = QR_CACHE.get(key)
+    if data_url is not None:
+        if pin:
+            QR_CACHE.put(key, data_url, pin=True)
+        return data_url
+
+    # qrcode/PIL erst laden, wenn wirklich ein Code erzeugt wird
+    import qrcode  # pylint: disable=import-outside-toplevel
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=BOX_SIZE,
+        border=BORDER,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+
+    if fmt == "svg":
+        svg = _svg(qr.get_matrix())
+        data_url = "data:image/svg+xml," + quote(svg, safe=" '/:=.,-")
+    else:
+        data_url = f"data:image/png;base64,{_png(qr)}"
+
+    QR_CACHE.put(key, data_url, pin=pin)
+    return data_url
@@ -0,0 +1,177 @@
+import bisect
+import heapq
+import html
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+# Volltextsuche über die gerenderten Folien. Ein invertierter Index (Token ->
+# Folie -> Häufigkeit) wird pro Foliensatz gehalten und nur für Folien mit
+# geändertem Inhalt neu aufgebaut; eine Suche ist danach ein paar
+# Dictionary-Zugriffe. Abgeglichen wird beim Aufwärmen und vom Deck-Watcher,
+# nicht bei der Suche.
+
+# Umlaute wie in der deutschen Ersatzschreibung: "Übersicht" == "Uebersicht"
+UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+TOKEN_REGEX = re.compile(r"\w+")
+TAG_REGEX = re.compile(r"<[^>]+>")
+TITLE_REGEX = re.compile(r"<h[1-3][^>]*>(.*?)</h[1-3]>", re.IGNORECASE | re.DOTALL)
+# Überschriften zählen bei der Gewichtung mehrfach
+TITLE_WEIGHT = 3
+MIN_PREFIX = 2
+# Obergrenze für die Token, auf die ein Präfix erweitert wird
+MAX_PREFIX_TERMS = 32
+
+
+def normalize(text: str) -> str:
+    """Casefold, spell umlauts as ae/oe/ue and drop remaining accents."""
+    text = text.casefold().translate(UMLAUTS)
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_REGEX.findall(normalize(text))
+
+
+def html_text(fragment: str) -> str:
+    return html.unescape(TAG_REGEX.sub(" ", fragment))
+
+
+class _Document:  # pylint: disable=too-few-public-methods
+    __slots__ = ("digest", "title", "terms")
+
+    def __init__(self, digest: str, title: str, terms: Counter):
+        self.digest = digest
+        self.title = title
+        self.terms = terms
+
+
+class SearchIndex:
+    """Inverted index over the slides of one deck.
+
+    :meth:`sync` re-tokenizes only slides whose content digest changed;
+    queries never touch the slides. The last query term also matches as a
+    prefix.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._documents = {}
+        self._order = {}
+        self._vocabulary = []
+        self.synced = False
+        self._lock = threading.Lock()
+
+    def sync(self, files, slide_digest, slide_html):
+        """Bring the index in line with ``files`` (in slide order).
+
+        ``slide_digest(filename)`` identifies the content of a slide, e.g. its
+        ``file_digest``; only slides with a new digest are rendered with
+        ``slide_html(filename)`` and re-indexed.
+        """
+        with self._lock:
+            current = set(files)
+            changed = False
+            for filename in set(self._documents) - current:
+                self._remove(filename)
+                changed = True
+            for filename in files:
+                digest = slide_digest(filename)
+                document = self._documents.get(filename)
+                if document is None or document.digest != digest:
+                    self._remove(filename)
+                    self._add(filename, digest, slide_html(filename))
+                    changed = True
+            if changed:
+                self._vocabulary = sorted(self._postings)
+            self._order = {filename: num for num, filename in enumerate(files, 1)}
+            self.synced = True
+
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        """Slides containing all query terms, best first.
+
+        Each result has the 1-based slide ``num``, its ``title`` and ``score``.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            scores = None
+            for position, term in enumerate(terms):
+                prefix = position == len(terms) - 1 and len(term) >= MIN_PREFIX
+                matches = self._matches(term, prefix)
+                if scores is None:
+                    scores = matches
+                else:
+                    scores = {
+                        name: scores[name] + count
+                        for name, count in matches.items()
+                        if name in scores
+                    }
+                if not scores:
+                    return []
+            ranked = heapq.nsmallest(
+                limit,
+                (name for name in scores if name in self._order),
+                key=lambda name: (-scores[name], self._order[name]),
+            )
+            return [
+                {
+                    "num": self._order[name],
+                    "title": self._documents[name].title,
+                    "score": scores[name],
+                }
+                for name in ranked
+            ]
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _matches(self, term: str, prefix: bool) -> dict:
+        if not prefix:
+            return dict(self._postings.get(term, {}))
+        matches = {}
+        vocabulary = self._vocabulary
+        start = bisect.bisect_left(vocabulary, term)
+        for position in range(start, min(start + MAX_PREFIX_TERMS, len(vocabulary))):
+            token = vocabulary[position]
+            if not token.startswith(term):
+                break
+            for name, count in self._postings[token].items():
+                matches[name] = matches.get(name, 0) + count
+        return matches
+
+    def _add(self, filename: str, digest: str, source: str):
+        title_match = TITLE_REGEX.search(source)
+        title = html_text(title_match.group(1)).strip() if title_match else ""
+        terms = Counter(tokenize(html_text(source)))
+        for token in tokenize(title):
+            terms[token] += TITLE_WEIGHT - 1
+        self._documents[filename] = _Document(digest, title, terms)
+        for token, count in terms.items():
+            self._postings.setdefault(token, {})[filename] = count
+
+    def _remove(self, filename: str):
+        document = self._documents.pop(filename, None)
+        if document is None:
+            return
+        for token in document.terms:
+            postings = self._postings[token]
+            del postings[filename]
+            if not postings:
+                del self._postings[token]
+
+
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_search_index(slides_dir: str) -> SearchIndex:
+    """Return the shared :class:`SearchIndex` for ``slides_dir``."""
+    index = _INDEXES.get(slides_dir)
+    if index is None:
+        with _INDEXES_LOCK:
+            index = _INDEXES.setdefault(slides_dir, SearchIndex())
+    return index
@@ -0,0 +1,114 @@
+import os
+import re
+import threading
+
+# Gemeinsamer Folien-Index für Flask-App und statischen Export.
+# Das Verzeichnis wird nur neu gelesen, wenn sich seine mtime ändert.
+
+SLIDE_NUMBER_REGEX = re.compile(r"(\d+)")
+
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def extract_number(filename: str) -> int:
+    match = SLIDE_NUMBER_REGEX.match(os.path.splitext(filename)[0])
+    return int(match.group(1)) if match else 0
+
+
+def _dir_mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class SlideIndex:
+    """Number-sorted list of the Markdown slides in ``slides_dir``.
+
+    Without a watcher every access costs a single ``stat`` of the directory;
+    with :meth:`start_watcher` the directory is polled in the background and
+    accesses are plain lookups.
+    """
+
+    def __init__(self, slides_dir: str):
+        self.slides_dir = slides_dir
+        self._files = ()
+        self._mtime = None
+        self._scanned = False
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def files(self) -> tuple[str, ...]:
+        if self._watcher is None:
+            self.refresh()
+        return self._files
+
+    def get(self, slide_num: int) -> str | None:
+        """Return the file name of the 1-based ``slide_num`` or ``None``."""
+        files = self.files()
+        if 1 <= slide_num <= len(files):
+            return files[slide_num - 1]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.files())
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rescan the directory if its mtime changed; return whether it did."""
+        mtime = _dir_mtime(self.slides_dir)
+        if not force and self._scanned and mtime == self._mtime:
+            return False
+        with self._lock:
+            if not force and self._scanned and mtime == self._mtime:
+                return False
+            self._files = self._scan()
+            self._mtime = mtime
+            self._scanned = True
+        return True
+
+    def start_watcher(self, interval: float = 1.0, on_change=None):
+        """Poll the directory in a daemon thread and call ``on_change`` on updates."""
+        if self._watcher is not None:
+            return
+        self.refresh()
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                if self.refresh() and on_change is not None:
+                    on_change(self)
+
+        self._watcher = threading.Thread(
+            target=watch, name=f"slide-index:{self.slides_dir}", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watcher(self):
+        if self._watcher is None:
+            return
+        self._stop.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _scan(self) -> tuple[str, ...]:
+        try:
+            with os.scandir(self.slides_dir) as entries:
+                files = [
+                    entry.name
+                    for entry in entries
+                    if entry.name.endswith(".md") and entry.is_file()
+                ]
+        except FileNotFoundError:
+            return ()
+        return tuple(sorted(files, key=extract_number))
+
+
+def get_index(slides_dir: str) -> SlideIndex:
+    """Return the shared :class:`SlideIndex` for ``slides_dir``."""
+    index = _INDEXES.get(slides_dir)
+    if index is None:
+        with _INDEXES_LOCK:
+            index = _INDEXES.setdefault(slides_dir, SlideIndex(slides_dir))
+    return index
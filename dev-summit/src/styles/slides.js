@@ -0,0 +1,143 @@
+// Deck-Modus: Foliensatz einmalig laden und clientseitig navigieren.
+// Ohne Bundle (z.B. file://) bleibt die normale Link-Navigation aktiv.
+var deck = null;
+var currentSlide = parseInt(document.body.getAttribute('data-slide-num'), 10);
+
+function loadDeck() {
+    var deckUrl = document.body.getAttribute('data-deck-url');
+    if (!deckUrl || !window.fetch || !window.history.pushState) return;
+    fetch(deckUrl, {credentials: 'same-origin'})
+        .then(function(response) { return response.ok ? response.json() : null; })
+        .then(function(data) {
+            if (!data || !data.slides || data.total !== data.slides.length) return;
+            deck = data;
+            window.history.replaceState({slide: currentSlide}, '', window.location.href);
+            prefetchNeighbours(currentSlide);
+        })
+        .catch(function() { deck = null; });
+}
+
+function prefetchSlide(num) {
+    var slide = deck && deck.slides[num - 1];
+    if (!slide || slide.prefetched) return;
+    slide.prefetched = true;
+    // <template> parst inert; Bilder werden explizit vorgeladen
+    var parsed = document.createElement('template');
+    parsed.innerHTML = slide.html;
+    parsed.content.querySelectorAll('img').forEach(function(img) {
+        var preload = new Image();
+        if (img.getAttribute('sizes')) preload.sizes = img.getAttribute('sizes');
+        if (img.getAttribute('srcset')) preload.srcset = img.getAttribute('srcset');
+        preload.src = img.getAttribute('src');
+    });
+}
+
+function prefetchNeighbours(num) {
+    prefetchSlide(num + 1);
+    prefetchSlide(num - 1);
+}
+
+function setNavLink(link, slide) {
+    if (slide) {
+        link.setAttribute('href', slide.url);
+        link.classList.remove('disabled');
+    } else {
+        link.removeAttribute('href');
+        link.classList.add('disabled');
+    }
+}
+
+function showSlide(num, push) {
+    var slide = deck.slides[num - 1];
+    document.querySelector('.slide').innerHTML = slide.html;
+    document.querySelector('.slide-counter').textContent = 'Folie ' + num + ' / ' + deck.total;
+    var navLinks = document.querySelectorAll('.nav a');
+    setNavLink(navLinks[0], deck.slides[num - 2]);
+    setNavLink(navLinks[1], deck.slides[num]);
+    if (push) window.history.pushState({slide: num}, '', slide.url);
+    currentSlide = num;
+    prefetchNeighbours(num);
+    publishSlide(num);
+}
+
+function navigate(link, num) {
+    if (!link || link.classList.contains('disabled') || !link.getAttribute('href')) return;
+    if (deck && deck.slides[num - 1]) {
+        showSlide(num, true);
+    } else {
+        window.location.href = link.getAttribute('href');
+    }
+}
+
+window.addEventListener('popstate', function(e) {
+    if (deck && e.state && deck.slides[e.state.slide - 1]) showSlide(e.state.slide, false);
+});
+
+document.querySelectorAll('.nav a').forEach(function(link, i) {
+    link.addEventListener('click', function(e) {
+        if (!deck) return;
+        e.preventDefault();
+        navigate(link, i === 0 ? currentSlide - 1 : currentSlide + 1);
+    });
+});
+
+// Tastatur-Navigation: Links/Rechts und Presenter-Tasten für Slide-Wechsel
+document.addEventListener('keydown', function(e) {
+    if (e.target.tagName === 'INPUT' || e.target.tagName === 'TEXTAREA' || e.target.isContentEditable) return;
+    var navLinks = document.querySelectorAll('.nav a');
+    // navLinks[0] = Zurück, navLinks[1] = Weiter (immer diese Reihenfolge)
+    if (
+        e.key === 'ArrowLeft' ||
+        e.key === 'PageUp'    // Logitech Presenter "Zurück"
+    ) {
+        navigate(navLinks[0], currentSlide - 1);
+    } else if (
+        e.key === 'ArrowRight' ||
+        e.key === 'PageDown'  // Logitech Presenter "Weiter"
+    ) {
+        navigate(navLinks[1], currentSlide + 1);
+    }
+});
+
+// Presenter-Sync: Publikum folgt der Folie des Vortragenden (Server-Sent Events).
+// Der Vortragende öffnet eine Folie einmalig mit #presenter=<token>: das Fragment
+// geht weder an den Server (Logs) noch in den Referer und wird sofort aus der
+// Adresse und der History entfernt.
+// Jedes Deck hat seinen eigenen Kanal (?deck=<name>).
+var syncUrl = document.body.getAttribute('data-sync-url');
+var syncDeck = document.body.getAttribute('data-sync-deck');
+var syncQuery = syncDeck ? '?deck=' + encodeURIComponent(syncDeck) : '';
+var presenterToken = null;
+
+function publishSlide(num) {
+    if (!syncUrl || !presenterToken) return;
+    fetch(syncUrl + '/presenter' + syncQuery, {
+        method: 'POST',
+        headers: {'Authorization': 'Bearer ' + presenterToken, 'Content-Type': 'application/json'},
+        body: JSON.stringify({slide: num})
+    }).catch(function() {});
+}
+
+function followPresenter() {
+    if (!syncUrl || !window.EventSource) return;
+    var source = new EventSource(syncUrl + '/events' + syncQuery);
+    source.addEventListener('slide', function(e) {
+        var num = JSON.parse(e.data).slide;
+        if (num !== currentSlide && deck && deck.slides[num - 1]) showSlide(num, true);
+    });
+}
+
+if (syncUrl) {
+    presenterToken = new URLSearchParams(window.location.hash.slice(1)).get('presenter');
+    if (presenterToken) {
+        history.replaceState(history.state, '', window.location.pathname + window.location.search);
+    }
+    try {
+        if (presenterToken) window.sessionStorage.setItem('presenterToken', presenterToken);
+        else presenterToken = window.sessionStorage.getItem('presenterToken');
+    } catch (e) { /* sessionStorage nicht verfügbar */ }
+    if (presenterToken) publishSlide(currentSlide);
+    else followPresenter();
+}
+
+loadDeck();
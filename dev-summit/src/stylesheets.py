@@ -0,0 +1,76 @@
+import hashlib
+import os
+import re
+import threading
+
+from asset_manifest import fingerprinted_name
+from deck import file_digest
+
+# Gemeinsame Stylesheets für Flask-App, statischen Export und PDF-Renderer,
+# dazu das Navigations- und Sync-Skript der Seiten. Sie werden unter einem
+# Namen mit Inhalts-Hash ausgeliefert (slides.<hash>.css), damit Browser sie
+# unbegrenzt cachen dürfen; CSS wird zusätzlich minifiziert.
+
+STYLES_DIR = os.path.join(os.path.dirname(__file__), "styles")
+SCREEN_CSS = "slides.css"
+PRINT_CSS = "print.css"
+SCREEN_JS = "slides.js"
+STYLES_URL_PREFIX = "/styles/"
+
+COMMENT_REGEX = re.compile(r"/\*.*?\*/", re.DOTALL)
+WHITESPACE_REGEX = re.compile(r"\s+")
+# Leerraum um Block- und Listenzeichen ist nie signifikant; ":" nur danach,
+# davor trennt er in Selektoren ("a :hover")
+PUNCTUATION_REGEX = re.compile(r"\s*([{};,>])\s*")
+COLON_REGEX = re.compile(r":\s+")
+
+_STYLESHEETS = {}
+_LOCK = threading.Lock()
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace from ``css``."""
+    css = COMMENT_REGEX.sub("", css)
+    css = WHITESPACE_REGEX.sub(" ", css)
+    css = PUNCTUATION_REGEX.sub(r"\1", css)
+    css = COLON_REGEX.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+
+class Stylesheet:  # pylint: disable=too-few-public-methods
+    """A minified stylesheet and its fingerprinted file name."""
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = text
+        self.data = text.encode("utf-8")
+        digest = hashlib.sha256(self.data).hexdigest()
+        self.fingerprinted = fingerprinted_name(name, digest)
+
+
+def stylesheet(name: str) -> Stylesheet:
+    """Return the minified stylesheet (or script) ``name`` from ``STYLES_DIR``.
+
+    The file is minified again only when its content changed. Scripts are
+    served as they are.
+    """
+    path = os.path.join(STYLES_DIR, name)
+    digest = file_digest(path)
+    cached = _STYLESHEETS.get(name)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+        sheet = Stylesheet(name, minify_css(text) if name.endswith(".css") else text)
+    with _LOCK:
+        _STYLESHEETS[name] = (digest, sheet)
+    return sheet
+
+
+def find_stylesheet(fingerprinted: str) -> Stylesheet | None:
+    """Return the current stylesheet published as ``fingerprinted``."""
+    for name in (SCREEN_CSS, PRINT_CSS, SCREEN_JS):
+        sheet = stylesheet(name)
+        if sheet.fingerprinted == fingerprinted:
+            return sheet
+    return None
@@ -0,0 +1,233 @@
+import asyncio
+import contextlib
+import hmac
+import json
+import os
+import re
+from urllib.parse import parse_qs
+
+# Presenter-Sync über Server-Sent Events: eigener asyncio-Server, damit hunderte
+# offene Verbindungen keinen Thread pro Client belegen. Jedes Deck hat einen
+# eigenen Kanal (?deck=<name>, ohne Parameter: der Standard-Foliensatz).
+#
+#   GET  /events?deck=<name>     SSE-Stream mit der aktuellen Folie des Decks
+#   POST /presenter?deck=<name>  {"slide": n}, Authorization: Bearer <Token>
+#   GET  /healthz?deck=<name>    verbundene Clients und aktuelle Folie des Decks
+#
+# Optional: Dockerfile und Terraform starten nur die Flask-App. Für den Sync
+# läuft dieser Server als eigener Prozess (python sync_server.py) mit
+# SYNC_PRESENTER_TOKEN; die App bekommt seine öffentliche URL als SYNC_URL.
+# Der Zustand liegt im Speicher, also genau eine Instanz.
+
+SYNC_HOST = os.environ.get("SYNC_HOST", "0.0.0.0")
+SYNC_PORT = int(os.environ.get("SYNC_PORT", "8081"))
+PRESENTER_TOKEN = os.environ.get("SYNC_PRESENTER_TOKEN", "")
+ALLOWED_ORIGIN = os.environ.get("SYNC_ALLOWED_ORIGIN", "*")
+HEARTBEAT_INTERVAL = float(os.environ.get("SYNC_HEARTBEAT_INTERVAL", "15"))
+REQUEST_TIMEOUT = 10
+MAX_BODY = 1024
+# Clients mit mehr ungesendeten Bytes gelten als hängend und werden getrennt
+MAX_WRITE_BUFFER = 64 * 1024
+# drain() blockiert, solange ein Client nicht liest; danach wird getrennt
+DRAIN_TIMEOUT = float(os.environ.get("SYNC_DRAIN_TIMEOUT", "10"))
+# Obergrenze für gleichzeitig offene Deck-Kanäle
+MAX_DECKS = int(os.environ.get("SYNC_MAX_DECKS", "100"))
+# wie app.DECK_NAME_REGEX; "" ist der Standard-Foliensatz
+DECK_NAME_REGEX = re.compile(r"^(?:[A-Za-z0-9][A-Za-z0-9_.-]*)?$")
+
+HEARTBEAT = b": heartbeat\n\n"
+
+
+class BroadcastHub:
+    """Fans out slide changes to all subscribers.
+
+    Each subscriber has a queue of size one: a slow client only ever holds the
+    newest slide, older undelivered events are dropped.
+    """
+
+    def __init__(self):
+        self.slide = None
+        self.event_id = 0
+        self._message = None
+        self._subscribers = set()
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=1)
+        if self._message is not None:
+            queue.put_nowait(self._message)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, slide: int) -> int:
+        """Broadcast ``slide`` and return the number of subscribers reached."""
+        self.event_id += 1
+        self.slide = slide
+        # Nachricht einmal kodieren, alle Queues teilen sich dieselben Bytes
+        self._message = (
+            f"id: {self.event_id}\nevent: slide\n"
+            f"data: {json.dumps({'slide': slide})}\n\n"
+        ).encode("utf-8")
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(self._message)
+        return len(self._subscribers)
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def idle(self) -> bool:
+        """No subscribers and nothing published yet."""
+        return not self._subscribers and self._message is None
+
+
+def _response(status: str, body: bytes = b"", content_type="application/json"):
+    headers = [
+        f"HTTP/1.1 {status}",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {len(body)}",
+        f"Access-Control-Allow-Origin: {ALLOWED_ORIGIN}",
+        "Access-Control-Allow-Methods: GET, POST, OPTIONS",
+        "Access-Control-Allow-Headers: Authorization, Content-Type",
+        "Connection: close",
+    ]
+    return ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+class SyncServer:
+    """Minimal HTTP/1.1 server for the SSE streams and presenter updates.
+
+    Every deck gets its own ``BroadcastHub``, created on first use.
+    """
+
+    def __init__(self, token: str = PRESENTER_TOKEN):
+        self.hubs: dict[str, BroadcastHub] = {}
+        self.token = token
+
+    def hub(self, deck: str = "") -> BroadcastHub | None:
+        """Return the hub of ``deck``; None for invalid names or too many decks."""
+        hub = self.hubs.get(deck)
+        if hub is None:
+            if not DECK_NAME_REGEX.match(deck):
+                return None
+            # Kanäle ohne Zuhörer und ohne Folie werden nicht mehr gebraucht
+            for name in [name for name, other in self.hubs.items() if other.idle]:
+                del self.hubs[name]
+            if len(self.hubs) >= MAX_DECKS:
+                return None
+            hub = self.hubs[deck] = BroadcastHub()
+        return hub
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = await asyncio.wait_for(_read_headers(reader), REQUEST_TIMEOUT)
+            path, _, query = target.partition("?")
+            deck = parse_qs(query).get("deck", [""])[0]
+
+            if method == "GET" and path == "/events":
+                await self._stream(writer, deck)
+            elif method == "POST" and path == "/presenter":
+                writer.write(await self._presenter(reader, headers, deck))
+            elif method == "GET" and path == "/healthz":
+                hub = self.hubs.get(deck) or BroadcastHub()
+                status = {
+                    "clients": len(hub),
+                    "slide": hub.slide,
+                    "decks": len(self.hubs),
+                }
+                writer.write(_response("200 OK", json.dumps(status).encode()))
+            elif method == "OPTIONS":
+                writer.write(_response("204 No Content"))
+            else:
+                writer.write(_response("404 Not Found"))
+            await writer.drain()
+        except (ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _presenter(self, reader, headers, deck: str) -> bytes:
+        authorization = headers.get("authorization", "")
+        if not self.token or not hmac.compare_digest(
+            authorization.encode(), f"Bearer {self.token}".encode()
+        ):
+            return _response("403 Forbidden")
+        length = int(headers.get("content-length", "0"))
+        if length > MAX_BODY:
+            return _response("413 Payload Too Large")
+        body = await asyncio.wait_for(reader.readexactly(length), REQUEST_TIMEOUT)
+        try:
+            slide = int(json.loads(body)["slide"])
+        except (ValueError, KeyError, TypeError):
+            return _response("400 Bad Request")
+        hub = self.hub(deck)
+        if hub is None:
+            return _response("404 Not Found")
+        clients = hub.publish(slide)
+        return _response("200 OK", json.dumps({"clients": clients}).encode())
+
+    async def _stream(self, writer, deck: str):
+        hub = self.hub(deck)
+        if hub is None:
+            writer.write(_response("404 Not Found"))
+            return
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            + f"Access-Control-Allow-Origin: {ALLOWED_ORIGIN}\r\n".encode("latin-1")
+            + b"X-Accel-Buffering: no\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+            b"retry: 3000\n\n"
+        )
+        queue = hub.subscribe()
+        try:
+            await asyncio.wait_for(writer.drain(), DRAIN_TIMEOUT)
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    message = HEARTBEAT
+                if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                    writer.transport.abort()
+                    return
+                writer.write(message)
+                await asyncio.wait_for(writer.drain(), DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            # Hängender Client: Puffer verwerfen, sonst wartet close() ewig
+            writer.transport.abort()
+        finally:
+            hub.unsubscribe(queue)
+
+    async def serve(self, host: str = SYNC_HOST, port: int = SYNC_PORT):
+        return await asyncio.start_server(self.handle, host, port, backlog=1024)
+
+
+async def main():
+    server = await SyncServer().serve()
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,9 +1,15 @@
+import io
 import os
+import re
 import tempfile
+import threading
+import urllib.request
+from wsgiref.simple_server import WSGIRequestHandler, make_server
 
 import pytest
 
 from app import app, generate_qr_code, get_slide_files
+from pdf_cache import PdfCache
 
 
 @pytest.fixture
@@ -35,10 +41,15 @@ def temp_slides():
         original_dir = app_module.SLIDES_DIR
         app_module.SLIDES_DIR = temp_dir
 
+        # Isolate the on-disk PDF cache
+        original_pdf_cache = app_module.PDF_CACHE
+        app_module.PDF_CACHE = PdfCache(os.path.join(temp_dir, ".pdf-cache"))
+
         yield temp_dir
 
         # Restore original
         app_module.SLIDES_DIR = original_dir
+        app_module.PDF_CACHE = original_pdf_cache
 
 
 def test_get_slide_files_empty():
@@ -145,7 +156,7 @@ def test_qr_code_on_final_slide(client, temp_slides):
     content = response.get_data(as_text=True)
     assert 'class="qr-code-container"' in content
     assert "Scan to download slides" in content
-    assert "data:image/png;base64," in content
+    assert "data:image/svg+xml," in content
 
 
 def test_pdf_cache(client, temp_slides):
@@ -158,3 +169,640 @@ def test_pdf_cache(client, temp_slides):
     response2 = client.get("/export/pdf")
     assert response2.status_code == 200
     assert response1.data == response2.data
+
+
+def test_pdf_cache_invalidated_on_slide_change(client, temp_slides, monkeypatch):
+    """Test that editing a slide produces a new PDF and prunes the old one."""
+    import app as app_module
+
+    monkeypatch.setattr(app_module.DECK_CACHE, "recheck_interval", 0)
+    assert client.get("/export/pdf").status_code == 200
+    old_key = app_module.deck_version()
+    fragments = app_module._fragment_cache(temp_slides)
+    old_fragments = set(fragments.keys())
+    with open(os.path.join(temp_slides, "02_second.md"), "a", encoding="utf-8") as f:
+        f.write("\n\nEdited content")
+
+    assert client.get("/export/pdf").status_code == 200
+    assert app_module.PDF_CACHE.keys() == [app_module.deck_version()]
+    assert not os.path.exists(app_module.PDF_CACHE._lock_path(old_key))
+    # Das Fragment der unveränderten ersten Folie bleibt, das alte der zweiten nicht
+    assert len(fragments.keys()) == 2
+    assert len(set(fragments.keys()) & old_fragments) == 1
+
+
+def test_pdf_reuses_unchanged_slide_fragments(client, temp_slides, monkeypatch):
+    """Test that after editing one slide only that slide is rendered again."""
+    import app as app_module
+    import pdf_render
+
+    rendered = []
+    original_html = pdf_render._html_class()
+
+    def counting_html(string, **kwargs):
+        rendered.append(string)
+        return original_html(string=string, **kwargs)
+
+    monkeypatch.setattr(pdf_render, "_html_class", lambda: counting_html)
+    monkeypatch.setattr(pdf_render, "PDF_RENDER_WORKERS", 1)
+    monkeypatch.setattr(app_module.DECK_CACHE, "recheck_interval", 0)
+
+    assert client.get("/export/pdf").status_code == 200
+    assert len(rendered) == 2
+
+    with open(os.path.join(temp_slides, "02_second.md"), "a", encoding="utf-8") as f:
+        f.write("\n\nEdited content")
+    assert client.get("/export/pdf").status_code == 200
+    assert len(rendered) == 3
+    assert "Edited content" in rendered[-1]
+
+
+def test_metrics_endpoint(client, temp_slides):
+    """Test that /metrics reports request latencies, bytes and PDF phases."""
+    assert client.get("/slide/1").status_code == 200
+    assert client.get("/export/pdf").status_code == 200
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+
+    text = response.get_data(as_text=True)
+    assert (
+        'devsummit_request_duration_seconds_count{endpoint="show_slide",status="200"}'
+        in text
+    )
+    assert 'devsummit_response_bytes_total{endpoint="export_pdf"}' in text
+    assert 'devsummit_pdf_phase_seconds_count{phase="merge"}' in text
+    assert 'devsummit_cache_requests_total{cache="pdf",result="miss"}' in text
+    # Nur /metrics selbst ist gerade in Bearbeitung
+    assert "devsummit_requests_in_flight 1" in text
+
+
+def test_profile_query_parameter(client, temp_slides, monkeypatch):
+    """Test that ?profile=<token> writes a request and a PDF build profile."""
+    import app as app_module
+    import profiler
+
+    profile_dir = os.path.join(temp_slides, "profiles")
+    monkeypatch.setattr(profiler, "PROFILE_DIR", profile_dir)
+    monkeypatch.setattr(app_module, "PROFILE_TOKEN", "secret")
+
+    assert "X-Profile" not in client.get("/export/pdf?profile=wrong").headers
+    monkeypatch.setattr(
+        app_module, "PDF_CACHE", PdfCache(os.path.join(temp_slides, "fresh"))
+    )
+
+    response = client.get("/export/pdf?profile=secret")
+    assert response.status_code == 200
+    profiles = os.listdir(profile_dir)
+    assert response.headers["X-Profile"] in profiles
+    assert any(name.startswith("pdf-build-") for name in profiles)
+
+
+@pytest.mark.parametrize(
+    "module, unwanted",
+    [
+        ("app", ["weasyprint", "qrcode", "pypdf", "PIL"]),
+        ("generate_static", ["flask", "app", "weasyprint", "qrcode", "pypdf", "PIL"]),
+    ],
+)
+def test_heavy_dependencies_are_imported_lazily(module, unwanted):
+    """Test that rendering backends are not loaded at import time."""
+    import subprocess
+    import sys
+
+    code = f"import sys, {module}; print(' '.join(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = set(result.stdout.split())
+    assert not loaded & set(unwanted)
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+def test_serve_from_compiled_artifact(client, temp_slides, monkeypatch):
+    """Test that a compiled deck is served from the artifact without SLIDES_DIR."""
+    import gzip
+    import shutil
+
+    import app as app_module
+    from compile_deck import compile_deck
+    from deck_artifact import DeckArtifact
+
+    os.makedirs(os.path.join(temp_slides, "images"))
+    svg = '<svg xmlns="http://www.w3.org/2000/svg">' + " " * 600 + "</svg>"
+    with open(os.path.join(temp_slides, "images", "logo.svg"), "w") as f:
+        f.write(svg)
+    with open(os.path.join(temp_slides, "images", "materna-logo.png"), "wb") as f:
+        f.write(b"materna")
+    with open(os.path.join(temp_slides, "03_third.md"), "w", encoding="utf-8") as f:
+        f.write("# Third\n\n![Logo](/slide/images/logo.svg)")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "deck.artifact")
+        compile_deck(path, "https://summit.example")
+        expected = client.get("/slide/2").get_data()
+        # Das Template verweist relativ auf die Logos (images/...)
+        logo_ref = re.search(
+            r'src="(images/materna-logo\.[0-9a-f]+\.png)"', expected.decode()
+        )
+        logo_url = "/slide/" + logo_ref.group(1)
+
+        # Ohne Foliendateien: alles muss aus dem Artefakt kommen
+        shutil.rmtree(temp_slides)
+        os.makedirs(temp_slides)
+        artifact = DeckArtifact(path)
+        monkeypatch.setattr(app_module, "ARTIFACT", artifact)
+        assert artifact.get(logo_url) is not None
+        assert client.get(logo_url).data == b"materna"
+
+        assert client.get("/").status_code == 302
+        response = client.get("/slide/2", headers={"Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert response.get_data() == expected
+        assert response.headers["Content-Length"] == str(len(expected))
+
+        response = client.get("/slide/3", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        html = gzip.decompress(response.get_data()).decode("utf-8")
+        assert "data:image/svg+xml," in html
+        logo = re.search(r'src="(/slide/images/[^"]+)"', html).group(1)
+        assert client.get(logo, headers={"Accept-Encoding": "identity"}).data == (
+            svg.encode()
+        )
+
+        etag = response.headers["ETag"]
+        conditional = {"If-None-Match": etag, "Accept-Encoding": "gzip"}
+        assert client.get("/slide/3", headers=conditional).status_code == 304
+
+        pdf = client.get("/export/pdf")
+        assert pdf.mimetype == "application/pdf"
+        assert pdf.data.startswith(b"%PDF")
+        partial = client.get("/export/pdf", headers={"Range": "bytes=0-3"})
+        assert partial.status_code == 206
+        assert partial.data == b"%PDF"
+
+        # Echter WSGI-Server: wsgiref akzeptiert nur bytes als Body-Blöcke
+        server = make_server("127.0.0.1", 0, app, handler_class=_QuietHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            base = f"http://127.0.0.1:{server.server_port}"
+            request = urllib.request.Request(
+                f"{base}/slide/2", headers={"Accept-Encoding": "identity"}
+            )
+            with urllib.request.urlopen(request, timeout=10) as served:
+                assert served.read() == expected
+            with urllib.request.urlopen(f"{base}/export/pdf", timeout=10) as served:
+                assert served.read() == pdf.data
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_search(client, temp_slides, monkeypatch):
+    """Test /search results and incremental updates after a slide changes."""
+    import app as app_module
+
+    assert client.get("/search?q=uebergabe").json["results"] == []
+    response = client.get("/search?q=second")
+    assert response.status_code == 200
+    assert response.json["results"] == [
+        {"num": 2, "title": "Second Slide", "score": 3, "url": "/slide/2"}
+    ]
+
+    # Suchen fassen die Folien nicht an
+    def no_digest(path):
+        raise AssertionError(f"{path} checked on the query path")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(app_module, "file_digest", no_digest)
+        assert client.get("/search?q=first").json["results"][0]["num"] == 1
+
+    path = os.path.join(temp_slides, "02_second.md")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n\nÜbergabe an das Team")
+    os.utime(path, (0, 2_000_000_000))
+    assert client.get("/search?q=uebergabe").json["results"] == []
+    # Der Deck-Watcher bzw. das Aufwärmen gleicht den Index ab
+    app_module.sync_search_index(temp_slides)
+    results = client.get("/search?q=uebergabe").json["results"]
+    assert [result["num"] for result in results] == [2]
+
+
+def test_shared_stylesheet(client, temp_slides):
+    """Test that slide pages link a fingerprinted, long-cached stylesheet."""
+    page = client.get("/slide/1").get_data(as_text=True)
+    assert "<style>" not in page
+    href = re.search(r'<link rel="stylesheet" href="([^"]+)">', page).group(1)
+    assert re.fullmatch(r"/styles/slides\.[0-9a-f]{12}\.css", href)
+
+    response = client.get(href)
+    assert response.status_code == 200
+    assert response.mimetype == "text/css"
+    assert response.cache_control.immutable
+    assert ".materna-logo{" in response.get_data(as_text=True)
+    etag = response.headers["ETag"]
+    assert client.get(href, headers={"If-None-Match": etag}).status_code == 304
+
+    plain = client.get("/styles/slides.css")
+    assert plain.cache_control.no_cache
+    assert not plain.cache_control.immutable
+    assert client.get("/styles/slides.0123456789ab.css").status_code == 404
+
+
+def test_shared_script(client, temp_slides):
+    """Test that slide pages load the navigation script as a cached file."""
+    page = client.get("/slide/1").get_data(as_text=True)
+    assert "<script>" not in page
+    src = re.search(r'<script src="([^"]+)" defer></script>', page).group(1)
+    assert re.fullmatch(r"/styles/slides\.[0-9a-f]{12}\.js", src)
+
+    response = client.get(src)
+    assert response.status_code == 200
+    assert response.mimetype == "text/javascript"
+    assert response.cache_control.immutable
+    script = response.get_data(as_text=True)
+    assert "loadDeck" in script
+    # Presenter-Token nur aus dem Fragment, nie aus der Query (Logs, Referer)
+    assert "location.hash" in script
+    assert "location.search).get('presenter')" not in script
+    compressed = client.get(src, headers={"Accept-Encoding": "br"})
+    assert compressed.headers["Content-Encoding"] == "br"
+
+
+def test_pdf_slide_range(client, temp_slides):
+    """Test exporting a range of slides via ?slides=."""
+    from pypdf import PdfReader
+
+    response = client.get("/export/pdf?slides=2")
+    assert response.status_code == 200
+    assert "folien_2.pdf" in response.headers["Content-Disposition"]
+    assert len(PdfReader(io.BytesIO(response.data)).pages) == 1
+
+    full = client.get("/export/pdf?slides=1-")
+    assert "folien" not in full.headers["Content-Disposition"]
+    assert len(PdfReader(io.BytesIO(full.data)).pages) == 2
+
+    assert client.get("/export/pdf?slides=2-5").status_code == 400
+    assert client.get("/export/pdf?slides=abc").status_code == 400
+
+
+def test_pdf_slide_selections_are_bounded(client, temp_slides, monkeypatch):
+    """Test that ad-hoc selections are kept in a small LRU cache."""
+    import app as app_module
+
+    monkeypatch.setattr(app_module, "PDF_SELECTION_CACHE_SIZE", 1)
+    assert client.get("/export/pdf?slides=1").status_code == 200
+    assert client.get("/export/pdf?slides=2").status_code == 200
+
+    selections = app_module._pdf_cache((2,))
+    assert selections.keys() == [app_module._pdf_key(temp_slides, (2,))]
+    assert sorted(os.listdir(selections.cache_dir)) == sorted(
+        [f"{selections.keys()[0]}.pdf", f".{selections.keys()[0]}.lock"]
+    )
+    assert app_module.PDF_CACHE.keys() == []
+
+
+def test_pdf_build_is_single_flight(client, temp_slides, monkeypatch):
+    """Test that concurrent PDF requests share a single render."""
+    import threading
+    import time
+
+    import app as app_module
+
+    calls = []
+    original_render = app_module._render_pdf
+
+    def slow_render(*args):
+        calls.append(args)
+        time.sleep(0.2)
+        return original_render(*args)
+
+    monkeypatch.setattr(app_module, "_render_pdf", slow_render)
+
+    statuses = []
+
+    def fetch():
+        with app.test_client() as thread_client:
+            statuses.append(thread_client.get("/export/pdf").status_code)
+
+    threads = [threading.Thread(target=fetch) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [200] * 5
+    assert len(calls) == 1
+
+
+def test_pdf_build_in_progress_returns_202(client, temp_slides, monkeypatch):
+    """Test that requests get 202 with Retry-After while the PDF is built."""
+    import threading
+
+    import app as app_module
+
+    release = threading.Event()
+    original_render = app_module._render_pdf
+
+    def blocked_render(*args):
+        release.wait(5)
+        return original_render(*args)
+
+    monkeypatch.setattr(app_module, "_render_pdf", blocked_render)
+    monkeypatch.setattr(app_module, "PDF_WAIT_SECONDS", 0)
+
+    response = client.get("/export/pdf")
+    assert response.status_code == 202
+    assert response.headers["Retry-After"] == str(app_module.PDF_RETRY_AFTER)
+
+    build = app_module.PDF_BUILDER.pending(app_module._pdf_key(temp_slides))
+    release.set()
+    build.result(5)
+    assert client.get("/export/pdf").status_code == 200
+
+
+def test_pdf_etag_and_not_modified(client, temp_slides):
+    """Test that the PDF carries a strong ETag and honours If-None-Match."""
+    response = client.get("/export/pdf")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert not etag.startswith("W/")
+    assert "Last-Modified" in response.headers
+    assert "attachment" in response.headers["Content-Disposition"]
+
+    response = client.get("/export/pdf", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+
+
+def test_pdf_etag_changes_with_deck(client, temp_slides, monkeypatch):
+    """Test that editing a slide changes the PDF ETag."""
+    import app as app_module
+
+    monkeypatch.setattr(app_module.DECK_CACHE, "recheck_interval", 0)
+    etag = client.get("/export/pdf").headers["ETag"]
+    with open(os.path.join(temp_slides, "01_first.md"), "a", encoding="utf-8") as f:
+        f.write("\n\nEdited")
+
+    response = client.get("/export/pdf", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_pdf_key_is_memoized(client, temp_slides, monkeypatch):
+    """Test that repeated downloads do not walk the media directory again."""
+    import app as app_module
+
+    etag = client.get("/export/pdf").headers["ETag"]
+    fingerprints = []
+    original = app_module.deck_fingerprint
+    monkeypatch.setattr(
+        app_module,
+        "deck_fingerprint",
+        lambda *args: fingerprints.append(args) or original(*args),
+    )
+    response = client.get("/export/pdf", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert client.get("/export/pdf").status_code == 200
+    assert not fingerprints
+
+    # Nach dem Prüfintervall erkennt die mtime des Verzeichnisses neue Bilder
+    monkeypatch.setattr(app_module.DECK_CACHE, "recheck_interval", 0)
+    os.makedirs(os.path.join(temp_slides, "images"))
+    with open(os.path.join(temp_slides, "images", "new.png"), "wb") as f:
+        f.write(b"png")
+    response = client.get("/export/pdf", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(fingerprints) == 1
+
+
+def test_pdf_evicted_before_send_is_rebuilt(client, temp_slides, monkeypatch):
+    """Test that a PDF deleted right after its build is rebuilt, not a 500."""
+    import app as app_module
+
+    original = app_module._open_pdf
+    opened = []
+
+    def evicting_open(cache, key):
+        opened.append(key)
+        if len(opened) == 2:
+            # Ein anderer Prozess räumt das frisch gebaute PDF gleich wieder weg
+            os.unlink(cache.path(key))
+        return original(cache, key)
+
+    monkeypatch.setattr(app_module, "_open_pdf", evicting_open)
+    response = client.get("/export/pdf")
+    assert response.status_code == 200
+    assert response.data.startswith(b"%PDF")
+    assert len(opened) == 3
+
+
+def test_pdf_range_request(client, temp_slides):
+    """Test that byte ranges of the PDF can be requested."""
+    full = client.get("/export/pdf").data
+
+    response = client.get("/export/pdf", headers={"Range": "bytes=0-3"})
+    assert response.status_code == 206
+    assert response.data == full[:4]
+    assert response.headers["Content-Range"] == f"bytes 0-3/{len(full)}"
+
+
+def test_pdf_images_use_asset_urls(temp_slides):
+    """Test that PDF slides reference images via deck-asset URLs, not data URLs."""
+    import app as app_module
+
+    images_dir = os.path.join(temp_slides, "images")
+    os.makedirs(images_dir)
+    with open(os.path.join(images_dir, "pic.png"), "wb") as f:
+        f.write(b"png")
+    with open(os.path.join(temp_slides, "01_first.md"), "w", encoding="utf-8") as f:
+        f.write('<img src="images/pic.png">')
+
+    slides = app_module._prepare_slides(
+        ["01_first.md"], images_dir, "deck-asset:summit-logo.svg", temp_slides
+    )
+    assert 'src="deck-asset:pic.png"' in slides[0]
+    assert "data:" not in slides[0]
+
+
+def test_slide_images_are_responsive(client, temp_slides):
+    """Test srcset rewriting and resized image variants."""
+    from PIL import Image
+
+    images_dir = os.path.join(temp_slides, "images")
+    os.makedirs(images_dir)
+    Image.new("RGB", (1200, 600), (10, 20, 30)).save(
+        os.path.join(images_dir, "photo.jpg")
+    )
+    with open(os.path.join(temp_slides, "01_first.md"), "w", encoding="utf-8") as f:
+        f.write("![Foto](images/photo.jpg)")
+
+    content = client.get("/slide/1").get_data(as_text=True)
+    assert re.search(r"/slide/images/photo\.[0-9a-f]+\.jpg\?w=640 640w", content)
+    assert 'width="1200" height="600"' in content
+    assert 'loading="lazy"' in content
+
+    response = client.get("/slide/images/photo.jpg?w=640")
+    assert response.status_code == 200
+    assert "Accept" in response.headers["Vary"]
+    with Image.open(io.BytesIO(response.data)) as img:
+        assert img.size == (640, 320)
+
+    response = client.get(
+        "/slide/images/photo.jpg?w=640", headers={"Accept": "image/webp,*/*"}
+    )
+    assert response.content_type == "image/webp"
+    assert client.get("/slide/images/missing.jpg?w=640").status_code == 404
+
+
+def test_fingerprinted_assets_are_immutable(client, temp_slides):
+    """Test that slides reference hashed asset URLs served as immutable."""
+    images_dir = os.path.join(temp_slides, "images")
+    os.makedirs(images_dir)
+    with open(os.path.join(images_dir, "materna-logo.png"), "wb") as f:
+        f.write(b"logo")
+
+    content = client.get("/slide/1").get_data(as_text=True)
+    match = re.search(r'src="images/(materna-logo\.[0-9a-f]+\.png)"', content)
+    assert match is not None
+
+    response = client.get(f"/slide/images/{match.group(1)}")
+    assert response.status_code == 200
+    assert response.data == b"logo"
+    cache_control = response.headers["Cache-Control"]
+    assert cache_control == "public, max-age=31536000, immutable"
+    assert "no-cache" not in cache_control
+
+    response = client.get("/slide/images/materna-logo.png")
+    assert response.status_code == 200
+    assert "immutable" not in response.headers.get("Cache-Control", "")
+
+
+def test_slide_compressed_by_accept_encoding(client, temp_slides):
+    """Test that slide HTML is served gzip-encoded when accepted."""
+    import gzip
+
+    plain = client.get("/slide/1")
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    response = client.get("/slide/1", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == plain.data
+
+
+def test_svg_served_compressed(client, temp_slides):
+    """Test that SVG images are served gzip-encoded when accepted."""
+    import gzip
+
+    images_dir = os.path.join(temp_slides, "images")
+    os.makedirs(images_dir)
+    svg = "<svg xmlns='http://www.w3.org/2000/svg'>" + "<g/>" * 500 + "</svg>"
+    with open(os.path.join(images_dir, "logo.svg"), "w", encoding="utf-8") as f:
+        f.write(svg)
+
+    response = client.get("/slide/images/logo.svg", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data).decode("utf-8") == svg
+
+
+def test_deck_bundle(client, temp_slides):
+    """Test that the deck bundle contains every slide as HTML fragment."""
+    response = client.get("/deck.json")
+    assert response.status_code == 200
+    deck = response.get_json()
+    assert deck["total"] == 2
+    assert [slide["url"] for slide in deck["slides"]] == ["/slide/1", "/slide/2"]
+    assert "First Slide" in deck["slides"][0]["html"]
+    assert "qr-code-container" not in deck["slides"][0]["html"]
+    assert "qr-code-container" in deck["slides"][1]["html"]
+
+    etag = response.headers["ETag"]
+    response = client.get("/deck.json", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_slide_page_references_deck_bundle(client, temp_slides):
+    """Test that slide pages know where to load the deck bundle from."""
+    content = client.get("/slide/1").get_data(as_text=True)
+    assert 'data-deck-url="/deck.json"' in content
+    assert 'data-slide-num="1"' in content
+
+
+def test_readyz_after_warm_up(client, temp_slides):
+    """Test that readiness only turns green once warm_up() filled the caches."""
+    import app as app_module
+
+    app_module.READY.clear()
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+
+    app_module.warm_up()
+    assert client.get("/readyz").status_code == 200
+    assert app_module.PDF_CACHE.contains(app_module.deck_version())
+    assert client.get("/healthz").status_code == 200
+
+
+@pytest.fixture
+def decks_dir(temp_slides, monkeypatch):
+    """Host two additional decks below a DECKS_DIR."""
+    import app as app_module
+
+    decks_dir = os.path.join(temp_slides, "decks")
+    for name, title in (("talk-a", "Talk A"), ("talk-b", "Talk B")):
+        os.makedirs(os.path.join(decks_dir, name, "images"))
+        with open(os.path.join(decks_dir, name, "01_intro.md"), "w") as f:
+            f.write(f"# {title}\n\n![Logo](images/logo.svg)")
+        with open(os.path.join(decks_dir, name, "images", "logo.svg"), "w") as f:
+            f.write('<svg xmlns="http://www.w3.org/2000/svg"/>')
+    monkeypatch.setattr(app_module, "DECKS_DIR", decks_dir)
+    return decks_dir
+
+
+def test_multiple_decks(client, decks_dir):
+    """Test that named decks are served below /deck/<name>/."""
+    assert [d["name"] for d in client.get("/decks").get_json()["decks"]] == [
+        "talk-a",
+        "talk-b",
+    ]
+    assert client.get("/deck/talk-a/").location.endswith("/deck/talk-a/slide/1")
+
+    content = client.get("/deck/talk-b/slide/1").get_data(as_text=True)
+    assert "Talk B" in content
+    assert "/deck/talk-b/deck.json" in content
+    bundle = client.get("/deck/talk-b/deck.json").get_json()
+    assert bundle["slides"][0]["url"] == "/deck/talk-b/slide/1"
+    assert "qr-code-container" in bundle["slides"][0]["html"]
+
+    # Relative Bild-URLs lösen unterhalb des Decks auf
+    image = re.search(r'src="(images/logo\.[0-9a-f]+\.svg)"', content).group(1)
+    assert client.get(f"/deck/talk-b/slide/{image}").status_code == 200
+    assert client.get("/deck/talk-a/export/pdf").status_code == 200
+
+    # Default deck unverändert
+    assert "First Slide" in client.get("/slide/1").get_data(as_text=True)
+
+
+def test_decks_have_own_sync_channel(client, decks_dir):
+    """Test that each deck page names its own presenter channel."""
+    content = client.get("/deck/talk-b/slide/1").get_data(as_text=True)
+    assert 'data-sync-deck="talk-b"' in content
+    content = client.get("/slide/1").get_data(as_text=True)
+    assert 'data-sync-deck=""' in content
+
+
+def test_unknown_deck_is_404(client, decks_dir):
+    """Test that unknown or invalid deck names are rejected."""
+    assert client.get("/deck/missing/slide/1").status_code == 404
+    assert client.get("/deck/..%2Fdecks/slide/1").status_code == 404
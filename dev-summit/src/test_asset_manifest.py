@@ -0,0 +1,80 @@
+import os
+import tempfile
+
+import pytest
+
+from asset_manifest import AssetManifest, strip_fingerprint
+
+
+@pytest.fixture
+def media_root():
+    """Create a temporary slides directory with images and videos."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.makedirs(os.path.join(temp_dir, "images"))
+        os.makedirs(os.path.join(temp_dir, "videos"))
+        for rel_path, data in {
+            "images/logo.png": b"logo",
+            "images/.hidden.bkp": b"backup",
+            "videos/demo.mp4": b"video",
+        }.items():
+            with open(os.path.join(temp_dir, rel_path), "wb") as f:
+                f.write(data)
+        yield temp_dir
+
+
+def test_build_fingerprints_media(media_root):
+    """Test that media files get content-hashed names."""
+    manifest = AssetManifest.build(media_root)
+    assert set(manifest.entries) == {"images/logo.png", "videos/demo.mp4"}
+
+    fingerprinted = manifest.url("images/logo.png")
+    assert fingerprinted.startswith("images/logo.")
+    assert fingerprinted.endswith(".png")
+    assert manifest.resolve(fingerprinted) == "images/logo.png"
+    assert strip_fingerprint(fingerprinted[len("images/") :]) == "logo.png"
+    assert manifest.url("images/unknown.png") == "images/unknown.png"
+
+
+def test_fingerprint_changes_with_content(media_root):
+    """Test that a changed file gets a new URL and manifest version."""
+    before = AssetManifest.build(media_root)
+    with open(os.path.join(media_root, "images", "logo.png"), "wb") as f:
+        f.write(b"new logo")
+    after = AssetManifest.build(media_root)
+
+    assert after.url("images/logo.png") != before.url("images/logo.png")
+    assert after.version != before.version
+    assert after.resolve(before.url("images/logo.png")) is None
+
+
+def test_rewrite_keeps_prefixes(media_root):
+    """Test that references are rewritten for all supported prefixes."""
+    manifest = AssetManifest.build(media_root)
+    name = manifest.url("images/logo.png")[len("images/") :]
+    html = (
+        '<img src="images/logo.png"><img src="/slide/images/logo.png?w=320">'
+        '<img src="./images/logo.png"><video src="/slide/videos/demo.mp4">'
+        '<img src="images/missing.png">'
+    )
+    result = manifest.rewrite(html)
+    assert f'src="images/{name}"' in result
+    assert f'src="/slide/images/{name}?w=320"' in result
+    assert f'src="./images/{name}"' in result
+    assert "/slide/videos/demo." in result
+    assert 'src="images/missing.png"' in result
+
+
+def test_rewrite_leaves_external_urls(media_root):
+    """Test that absolute URLs to other hosts are not rewritten."""
+    manifest = AssetManifest.build(media_root)
+    name = manifest.url("images/logo.png")[len("images/") :]
+    external = (
+        '<img src="https://cdn.example/images/logo.png">'
+        '<img src="//cdn.example/slide/images/logo.png">'
+        '<a href="/other/images/logo.png">'
+    )
+    assert manifest.rewrite(external) == external
+    html = '<img src="/deck/talk-b/slide/images/logo.png" srcset="../images/logo.png">'
+    result = manifest.rewrite(html)
+    assert f'src="/deck/talk-b/slide/images/{name}"' in result
+    assert f'srcset="../images/{name}"' in result
@@ -0,0 +1,100 @@
+import os
+import tempfile
+
+import pytest
+
+from deck import DeckCache
+
+
+@pytest.fixture
+def slide_file():
+    """Create a temporary Markdown slide."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "01_slide.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# Original\n")
+        yield path
+
+
+def _rewrite(path, content, mtime_offset=10):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset * 10**9))
+
+
+def test_slide_html_is_cached(slide_file):
+    """Test that a compiled slide is reused while the file is unchanged."""
+    cache = DeckCache(recheck_interval=0)
+    first = cache.slide_html(slide_file)
+    assert "<h1>Original</h1>" in first
+    assert cache.slide_html(slide_file) is first
+
+
+def test_slide_html_recompiled_on_change(slide_file):
+    """Test that a changed slide is recompiled."""
+    cache = DeckCache(recheck_interval=0)
+    cache.slide_html(slide_file)
+    _rewrite(slide_file, "# Changed\n")
+    assert "<h1>Changed</h1>" in cache.slide_html(slide_file)
+
+
+def test_slide_html_touch_without_change(slide_file):
+    """Test that a new mtime with identical content keeps the compiled slide."""
+    cache = DeckCache(recheck_interval=0)
+    first = cache.slide_html(slide_file)
+    _rewrite(slide_file, "# Original\n")
+    assert cache.slide_html(slide_file) is first
+
+
+def test_recheck_interval_skips_stat(slide_file):
+    """Test that entries are not revalidated within the recheck interval."""
+    cache = DeckCache(recheck_interval=3600)
+    first = cache.slide_html(slide_file)
+    _rewrite(slide_file, "# Changed\n")
+    assert cache.slide_html(slide_file) is first
+
+
+def test_digest_memo_is_bounded(slide_file, monkeypatch):
+    """Test that file_digest() keeps at most DIGEST_CACHE_SIZE paths."""
+    import deck
+
+    monkeypatch.setattr(deck, "DIGEST_CACHE_SIZE", 2)
+    directory = os.path.dirname(slide_file)
+    paths = [os.path.join(directory, f"{num}.md") for num in range(3)]
+    for path in paths:
+        _rewrite(path, path)
+        deck.file_digest(path)
+    assert list(deck._DIGESTS) == paths[1:]
+
+    DeckCache().clear()
+    assert not deck._DIGESTS
+
+
+def test_derived_rebuilt_when_dependency_changes(slide_file):
+    """Test that derived values follow changes of their dependency files."""
+    cache = DeckCache(recheck_interval=0)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return cache.slide_html(slide_file, max_age=0).upper(), [slide_file]
+
+    assert "ORIGINAL" in cache.derived("upper", build)
+    assert "ORIGINAL" in cache.derived("upper", build)
+    assert len(builds) == 1
+
+    _rewrite(slide_file, "# Changed\n")
+    assert "CHANGED" in cache.derived("upper", build)
+    assert len(builds) == 2
+
+
+def test_budget_eviction_recompiles(slide_file):
+    """Test that entries evicted by the memory budget are compiled again."""
+    from memory_budget import MemoryBudget
+
+    cache = DeckCache(recheck_interval=3600, budget=MemoryBudget(max_bytes=1))
+    first = cache.slide_html(slide_file)
+    cache.derived("other", lambda: ("x" * 10, []))
+    assert len(cache) == 1
+    assert cache.slide_html(slide_file) == first
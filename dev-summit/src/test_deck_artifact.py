@@ -0,0 +1,55 @@
+import os
+import tempfile
+
+import pytest
+
+from deck_artifact import ArtifactError, DeckArtifact, DeckArtifactWriter
+
+
+def test_round_trip():
+    """Test that written entries are read back as slices of the mapped file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "deck.artifact")
+        with DeckArtifactWriter(path, {"version": "abc"}) as writer:
+            writer.add(
+                "/slide/1",
+                {"identity": b"<h1>Eins</h1>", "gzip": b"gz"},
+                headers={"Content-Type": "text/html"},
+            )
+            writer.add("/", {"identity": b""}, status=302, headers={"Location": "/x"})
+
+        artifact = DeckArtifact(path)
+        assert artifact.meta == {"version": "abc"}
+        assert len(artifact) == 2
+        entry = artifact.get("/slide/1")
+        view = artifact.data(entry)
+        assert isinstance(view, memoryview)
+        assert bytes(view) == b"<h1>Eins</h1>"
+        assert bytes(artifact.data(entry, "gzip")) == b"gz"
+        assert artifact.get("/")["status"] == 302
+        assert artifact.get("/missing") is None
+        chunks = list(artifact.chunks(entry, size=5))
+        assert chunks == [b"<h1>E", b"ins</", b"h1>"]
+        assert all(type(chunk) is bytes for chunk in chunks)
+        del view
+        artifact.close()
+
+
+def test_failed_write_leaves_no_file():
+    """Test that an exception while writing discards the partial artifact."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "deck.artifact")
+        with pytest.raises(RuntimeError):
+            with DeckArtifactWriter(path) as writer:
+                writer.add("/", {"identity": b"x"})
+                raise RuntimeError("boom")
+        assert os.listdir(temp_dir) == []
+
+
+def test_invalid_file_is_rejected():
+    """Test that files without the artifact header are rejected."""
+    with tempfile.NamedTemporaryFile(suffix=".artifact") as f:
+        f.write(b"not an artifact at all")
+        f.flush()
+        with pytest.raises(ArtifactError):
+            DeckArtifact(f.name)
@@ -1,10 +1,13 @@
 import os
 import tempfile
 
+import pytest
+
 from generate_static import (
     get_html_content,
     get_slide_files,
     prepare_page,
+    render_static_html,
 )
 
 
@@ -112,3 +115,166 @@ def test_prepare_page_last_slide():
     assert "Slide 3 of 3" in result
     assert "slide2.html" in result  # Previous should link to slide2
     assert "disabled" in result  # Next should be disabled
+
+
+@pytest.fixture
+def static_deck(monkeypatch):
+    """Create a temporary deck and output directory for static builds."""
+    import generate_static as gen_module
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        slides_dir = os.path.join(temp_dir, "slides")
+        os.makedirs(os.path.join(slides_dir, "images"))
+        for idx in range(1, 4):
+            path = os.path.join(slides_dir, f"0{idx}_slide.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"# Slide {idx}")
+        with open(os.path.join(slides_dir, "images", "logo.png"), "wb") as f:
+            f.write(b"logo")
+
+        monkeypatch.setattr(gen_module, "SLIDES_DIR", slides_dir)
+        monkeypatch.setattr(gen_module, "OUTPUT_DIR", os.path.join(temp_dir, "out"))
+        yield slides_dir, os.path.join(temp_dir, "out")
+
+
+def test_render_static_html_is_incremental(static_deck):
+    """Test that an unchanged deck renders nothing on the second build."""
+    slides_dir, output_dir = static_deck
+
+    written = render_static_html()
+    assert sorted(written) == [
+        "index.html",
+        "slide1.html",
+        "slide2.html",
+        "slide3.html",
+    ]
+    assert render_static_html() == []
+
+    with open(os.path.join(slides_dir, "02_slide.md"), "a", encoding="utf-8") as f:
+        f.write("\n\nEdited")
+    assert render_static_html() == ["slide2.html"]
+    with open(os.path.join(output_dir, "slide2.html"), encoding="utf-8") as f:
+        assert "Edited" in f.read()
+
+
+def test_qr_code_settings_rebuild_last_slide(static_deck, monkeypatch):
+    """Test that the QR format and target URL are inputs of the last page."""
+    import generate_static as gen_module
+
+    _, output_dir = static_deck
+    render_static_html()
+    monkeypatch.setattr(gen_module, "QR_FORMAT", "png")
+    assert render_static_html() == ["slide3.html"]
+    with open(os.path.join(output_dir, "slide3.html"), encoding="utf-8") as f:
+        assert "data:image/png;base64," in f.read()
+
+    monkeypatch.setattr(gen_module, "QR_PDF_URL", "https://summit.example/export/pdf")
+    assert render_static_html() == ["slide3.html"]
+
+
+def test_render_static_html_removes_stale_output(static_deck):
+    """Test that removed slides and replaced media are cleaned up."""
+    slides_dir, output_dir = static_deck
+    render_static_html()
+    old_media = os.listdir(os.path.join(output_dir, "images"))
+
+    os.unlink(os.path.join(slides_dir, "03_slide.md"))
+    with open(os.path.join(slides_dir, "images", "logo.png"), "wb") as f:
+        f.write(b"new logo")
+    render_static_html()
+
+    assert not os.path.exists(os.path.join(output_dir, "slide3.html"))
+    new_media = os.listdir(os.path.join(output_dir, "images"))
+    assert len(new_media) == 1
+    assert new_media != old_media
+
+
+def test_render_static_html_parallel(static_deck, monkeypatch):
+    """Test that the process pool produces the same pages as a serial build."""
+    import generate_static as gen_module
+
+    _, output_dir = static_deck
+    monkeypatch.setattr(gen_module, "STATIC_BUILD_WORKERS", 2)
+    monkeypatch.setattr(gen_module, "PARALLEL_THRESHOLD", 1)
+    render_static_html()
+    with open(os.path.join(output_dir, "slide3.html"), encoding="utf-8") as f:
+        assert "<h1>Slide 3</h1>" in f.read()
+
+
+def test_render_static_html_precompresses_pages(static_deck):
+    """Test that written pages get a gzip sibling."""
+    import gzip
+
+    _, output_dir = static_deck
+    render_static_html()
+    page_path = os.path.join(output_dir, "slide1.html")
+    with open(page_path, "rb") as page, open(page_path + ".gz", "rb") as gz:
+        assert gzip.decompress(gz.read()) == page.read()
+
+
+def test_render_static_html_writes_deck_bundle(static_deck):
+    """Test that the static export writes deck.json and links it."""
+    import json
+
+    _, output_dir = static_deck
+    render_static_html()
+    with open(os.path.join(output_dir, "deck.json"), encoding="utf-8") as f:
+        deck = json.load(f)
+    assert deck["total"] == 3
+    assert deck["slides"][2]["url"] == "slide3.html"
+    assert "qr-code-container" in deck["slides"][2]["html"]
+    with open(os.path.join(output_dir, "slide1.html"), encoding="utf-8") as f:
+        assert 'data-deck-url="deck.json"' in f.read()
+
+
+def test_deck_bundle_reuses_unchanged_fragments(static_deck, monkeypatch):
+    """Test that an incremental build converts only the edited slide's Markdown."""
+    import json
+
+    import generate_static as gen_module
+
+    slides_dir, output_dir = static_deck
+    render_static_html()
+    bundle_path = os.path.join(output_dir, "deck.json")
+
+    converted = []
+    original = gen_module.get_html_content
+
+    def spy(filename, slides_dir=None):
+        converted.append(filename)
+        return original(filename, slides_dir)
+
+    monkeypatch.setattr(gen_module, "get_html_content", spy)
+    with open(os.path.join(slides_dir, "02_slide.md"), "a", encoding="utf-8") as f:
+        f.write("\n\nEdited")
+    render_static_html()
+    assert converted == ["02_slide.md"]
+    with open(bundle_path, encoding="utf-8") as f:
+        slides = json.load(f)["slides"]
+    assert "Edited" in slides[1]["html"]
+    assert "<h1>Slide 3</h1>" in slides[2]["html"]
+
+    # Unverändertes Bundle wird weder neu geschrieben noch neu komprimiert
+    mtime = os.stat(bundle_path).st_mtime_ns
+    gen_module.write_deck_bundle(
+        gen_module.get_slide_files(), gen_module.AssetManifest.build(slides_dir)
+    )
+    assert os.stat(bundle_path).st_mtime_ns == mtime
+
+
+def test_render_static_html_links_stylesheet(static_deck):
+    """Test that pages link the shared, fingerprinted stylesheet."""
+    import re
+
+    _, output_dir = static_deck
+    render_static_html()
+    with open(os.path.join(output_dir, "slide2.html"), encoding="utf-8") as f:
+        page = f.read()
+    assert "<style>" not in page
+    href = re.search(r'<link rel="stylesheet" href="(styles/[^"]+\.css)">', page)
+    assert href
+    assert os.path.exists(os.path.join(output_dir, href.group(1)))
+    src = re.search(r'<script src="(styles/[^"]+\.js)" defer></script>', page)
+    assert src
+    assert os.path.exists(os.path.join(output_dir, src.group(1)))
+    assert os.path.exists(os.path.join(output_dir, src.group(1) + ".br"))
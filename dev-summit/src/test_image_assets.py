@@ -0,0 +1,137 @@
+import os
+import tempfile
+
+import pytest
+from PIL import Image
+
+from image_assets import (
+    asset_url,
+    print_variant,
+    print_width_px,
+    resolve_asset_url,
+    responsive_images,
+    web_variant,
+)
+
+
+@pytest.fixture
+def images_dir():
+    """Create a temporary images directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield temp_dir
+
+
+def _save(images_dir, filename, mode, size):
+    path = os.path.join(images_dir, filename)
+    color = (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30)
+    Image.new(mode, size, color).save(path)
+    return path
+
+
+def test_large_opaque_png_becomes_downscaled_jpeg(images_dir):
+    """Test that opaque images wider than the print width are shrunk to JPEG."""
+    src = _save(images_dir, "photo.png", "RGB", (4000, 2000))
+    cache_dir = os.path.join(images_dir, "cache")
+
+    variant = print_variant(src, dpi=150, cache_dir=cache_dir)
+    assert variant.endswith(".jpg")
+    with Image.open(variant) as img:
+        assert img.size == (print_width_px(150), print_width_px(150) // 2)
+
+
+def test_transparent_png_stays_png(images_dir):
+    """Test that images with alpha keep their transparency as PNG."""
+    src = _save(images_dir, "logo.png", "RGBA", (3000, 500))
+    variant = print_variant(src, cache_dir=os.path.join(images_dir, "cache"))
+    assert variant.endswith(".png")
+    with Image.open(variant) as img:
+        assert img.mode == "RGBA"
+        assert img.width == print_width_px()
+
+
+def test_variant_is_cached(images_dir):
+    """Test that a variant is reused for an unchanged source."""
+    src = _save(images_dir, "photo.png", "RGB", (4000, 2000))
+    cache_dir = os.path.join(images_dir, "cache")
+    first = print_variant(src, cache_dir=cache_dir)
+    mtime = os.stat(first).st_mtime_ns
+    assert print_variant(src, cache_dir=cache_dir) == first
+    assert os.stat(first).st_mtime_ns == mtime
+
+
+def test_svg_is_passed_through(images_dir):
+    """Test that vector images are not touched."""
+    src = os.path.join(images_dir, "logo.svg")
+    with open(src, "w", encoding="utf-8") as f:
+        f.write("<svg xmlns='http://www.w3.org/2000/svg'/>")
+    assert print_variant(src, cache_dir=os.path.join(images_dir, "cache")) == src
+
+
+def test_resolve_asset_url(images_dir):
+    """Test that deck-asset URLs resolve to file URLs inside the images dir."""
+    _save(images_dir, "small.jpg", "RGB", (10, 10))
+    assert resolve_asset_url("https://example.com/x.png", images_dir) == (
+        "https://example.com/x.png"
+    )
+    assert resolve_asset_url(asset_url("small.jpg"), images_dir).startswith("file://")
+    with pytest.raises(ValueError):
+        resolve_asset_url(asset_url("../secret.png"), images_dir)
+
+
+def test_web_variant_uses_width_buckets(images_dir):
+    """Test that browser variants are rounded up to a width bucket."""
+    src = _save(images_dir, "photo.jpg", "RGB", (2000, 1000))
+    cache_dir = os.path.join(images_dir, "cache")
+
+    variant = web_variant(src, 500, cache_dir=cache_dir)
+    with Image.open(variant) as img:
+        assert img.size == (640, 320)
+    assert web_variant(src, 600, cache_dir=cache_dir) == variant
+
+
+def test_web_variant_keeps_small_originals(images_dir):
+    """Test that images narrower than the bucket are served as-is."""
+    src = _save(images_dir, "icon.png", "RGB", (200, 200))
+    assert web_variant(src, 320, cache_dir=os.path.join(images_dir, "c")) == src
+
+
+def test_web_variant_webp(images_dir):
+    """Test that WebP variants are generated on request."""
+    src = _save(images_dir, "icon.png", "RGBA", (200, 200))
+    variant = web_variant(src, 320, webp=True, cache_dir=os.path.join(images_dir, "c"))
+    assert variant.endswith(".webp")
+    with Image.open(variant) as img:
+        assert img.format == "WEBP"
+
+
+def test_responsive_images_rewrites_tags(images_dir):
+    """Test that img tags get srcset, intrinsic size and lazy loading."""
+    _save(images_dir, "photo.jpg", "RGB", (1200, 600))
+    html = '<p><img alt="Foto" src="images/photo.jpg" /></p>'
+
+    result, used = responsive_images(html, images_dir, "/slide/images/")
+    assert 'src="/slide/images/photo.jpg"' in result
+    assert (
+        'srcset="/slide/images/photo.jpg?w=320 320w, '
+        "/slide/images/photo.jpg?w=640 640w, "
+        "/slide/images/photo.jpg?w=1024 1024w, "
+        '/slide/images/photo.jpg 1200w"'
+    ) in result
+    assert 'width="1200" height="600"' in result
+    assert 'loading="lazy"' in result
+    assert used == [os.path.join(images_dir, "photo.jpg")]
+
+
+def test_responsive_images_keeps_explicit_size(images_dir):
+    """Test that explicit widths are kept and used for sizes."""
+    _save(images_dir, "icon.png", "RGB", (512, 512))
+    html = '<img alt="KI" src="images/icon.png" width="200" />'
+    result, _ = responsive_images(html, images_dir, "/slide/images/")
+    assert 'sizes="200px"' in result
+    assert 'height="512"' not in result
+
+
+def test_responsive_images_ignores_missing_files(images_dir):
+    """Test that unknown images are left untouched."""
+    html = '<img src="images/missing.png" />'
+    assert responsive_images(html, images_dir, "/slide/images/") == (html, [])
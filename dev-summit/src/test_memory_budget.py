@@ -0,0 +1,39 @@
+from memory_budget import MemoryBudget, estimate_size
+
+
+class _Owner:
+    def __init__(self):
+        self.evicted = []
+
+    def evict(self, key):
+        self.evicted.append(key)
+
+
+def test_budget_evicts_least_recently_used_across_owners():
+    """Test that the oldest entry of any cache is evicted first."""
+    budget = MemoryBudget(max_bytes=100)
+    first, second = _Owner(), _Owner()
+    budget.charge(first, "a", 40)
+    budget.charge(second, "b", 40)
+    budget.touch(first, "a")
+    budget.charge(first, "c", 40)
+    assert second.evicted == ["b"]
+    assert first.evicted == []
+    assert budget.used == 80
+    assert budget.evictions == 1
+
+
+def test_budget_keeps_oversized_newest_entry():
+    """Test that a single entry above the budget is still kept."""
+    budget = MemoryBudget(max_bytes=10)
+    owner = _Owner()
+    budget.charge(owner, "small", 5)
+    budget.charge(owner, "large", 50)
+    assert owner.evicted == ["small"]
+    assert len(budget) == 1
+
+
+def test_estimate_size():
+    """Test size estimates for strings and tuples."""
+    assert estimate_size("abc") == 3
+    assert estimate_size(("ab", b"cd")) == 4
@@ -0,0 +1,106 @@
+import tempfile
+
+from metrics import (
+    Counter,
+    FunctionMetric,
+    Gauge,
+    Histogram,
+    Registry,
+    mark_process_dead,
+)
+
+
+def test_counter_and_gauge_render():
+    """Test the text exposition of counters and gauges with labels."""
+    registry = Registry()
+    counter = Counter("hits_total", "Hits.", ("cache",), registry=registry)
+    gauge = Gauge("in_flight", "In flight.", registry=registry)
+    counter.inc(cache="pdf")
+    counter.inc(2, cache="pdf")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    text = registry.render()
+    assert "# TYPE hits_total counter" in text
+    assert 'hits_total{cache="pdf"} 3' in text
+    assert "# TYPE in_flight gauge" in text
+    assert "in_flight 1" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test that histogram buckets, sum and count follow the Prometheus format."""
+    registry = Registry()
+    histogram = Histogram(
+        "latency_seconds", "Latency.", ("route",), buckets=(0.1, 1), registry=registry
+    )
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, route="/")
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{route="/",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/",le="+Inf"} 3' in text
+    assert 'latency_seconds_sum{route="/"} 5.55' in text
+    assert 'latency_seconds_count{route="/"} 3' in text
+
+
+def test_label_values_are_escaped():
+    """Test escaping of quotes, backslashes and newlines in label values."""
+    registry = Registry()
+    counter = Counter("c_total", "C.", ("path",), registry=registry)
+    counter.inc(path='a"b\\c\nd')
+    assert 'c_total{path="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_function_metric_is_read_at_render_time():
+    """Test that function metrics reflect the value at scrape time."""
+    registry = Registry()
+    state = {"used": 1}
+    FunctionMetric(
+        "used_bytes", "Used.", "gauge", lambda: [({}, state["used"])], registry=registry
+    )
+    state["used"] = 42
+    assert "used_bytes 42" in registry.render()
+
+
+def _worker_registry(requests: int, in_flight: int) -> Registry:
+    registry = Registry()
+    counter = Counter("requests_total", "Requests.", ("route",), registry=registry)
+    gauge = Gauge("in_flight", "In flight.", registry=registry)
+    histogram = Histogram("latency_seconds", "L.", buckets=(1,), registry=registry)
+    counter.inc(requests, route="/")
+    gauge.set(in_flight)
+    histogram.observe(0.5)
+    return registry
+
+
+def test_snapshots_of_all_workers_are_summed():
+    """Test that /metrics under gunicorn reports the sum over all workers."""
+    with tempfile.TemporaryDirectory() as metrics_dir:
+        _worker_registry(3, 1).write_snapshot(metrics_dir, "101")
+        text = _worker_registry(4, 2).render(metrics_dir)
+        assert text.count("# TYPE requests_total counter") == 1
+        assert 'requests_total{route="/"} 7' in text
+        assert "in_flight 3" in text
+        assert 'latency_seconds_bucket{le="1"} 2' in text
+        assert "latency_seconds_count 2" in text
+
+
+def test_dead_worker_keeps_counters_but_not_gauges():
+    """Test that counters of exited workers survive while their gauges vanish."""
+    with tempfile.TemporaryDirectory() as metrics_dir:
+        for pid in (101, 102):
+            _worker_registry(3, 1).write_snapshot(metrics_dir, str(pid))
+            mark_process_dead(pid, metrics_dir)
+        text = Registry().render(metrics_dir)
+        assert 'requests_total{route="/"} 6' in text
+        assert "in_flight" not in text
+        assert "latency_seconds_count 2" in text
+
+
+def test_reset_forgets_inherited_values():
+    """Test that a forked worker starts from zero after reset()."""
+    registry = _worker_registry(3, 1)
+    registry.reset()
+    assert "requests_total{" not in registry.render()
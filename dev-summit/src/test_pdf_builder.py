@@ -0,0 +1,44 @@
+import threading
+
+from pdf_builder import PdfBuildScheduler
+
+
+def test_submit_deduplicates_running_builds():
+    """Test that a running build is shared by all submitters of the same key."""
+    scheduler = PdfBuildScheduler(max_workers=2)
+    release = threading.Event()
+    calls = []
+
+    def build():
+        calls.append(1)
+        release.wait(5)
+        return "done"
+
+    first = scheduler.submit("key", build)
+    second = scheduler.submit("key", build)
+    assert first is second
+    assert scheduler.pending("key") is first
+
+    release.set()
+    assert first.result(5) == "done"
+    assert len(calls) == 1
+    scheduler.shutdown()
+
+
+def test_finished_build_is_forgotten():
+    """Test that a new build can start once the previous one finished."""
+    scheduler = PdfBuildScheduler()
+    scheduler.submit("key", lambda: 1).result(5)
+    assert scheduler.pending("key") is None
+    assert scheduler.submit("key", lambda: 2).result(5) == 2
+    scheduler.shutdown()
+
+
+def test_different_keys_build_independently():
+    """Test that builds for different keys are not merged."""
+    scheduler = PdfBuildScheduler(max_workers=2)
+    first = scheduler.submit("a", lambda: "a")
+    second = scheduler.submit("b", lambda: "b")
+    assert first is not second
+    assert (first.result(5), second.result(5)) == ("a", "b")
+    scheduler.shutdown()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+
+import pytest
+
+from pdf_cache import PdfCache, deck_fingerprint
+
+
+@pytest.fixture
+def deck_dir():
+    """Create a temporary deck with one slide and one image."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.makedirs(os.path.join(temp_dir, "images"))
+        with open(os.path.join(temp_dir, "01_a.md"), "w", encoding="utf-8") as f:
+            f.write("# A")
+        with open(os.path.join(temp_dir, "images", "logo.png"), "wb") as f:
+            f.write(b"png-bytes")
+        yield temp_dir
+
+
+def _fingerprint(deck_dir, css="css"):
+    slides = [os.path.join(deck_dir, "01_a.md")]
+    return deck_fingerprint(slides, os.path.join(deck_dir, "images"), css)
+
+
+def _rewrite(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_fingerprint_is_stable(deck_dir):
+    """Test that an unchanged deck keeps its fingerprint."""
+    assert _fingerprint(deck_dir) == _fingerprint(deck_dir)
+
+
+def test_fingerprint_changes_with_inputs(deck_dir):
+    """Test that slides, images and CSS all change the fingerprint."""
+    original = _fingerprint(deck_dir)
+    assert _fingerprint(deck_dir, css="other") != original
+
+    _rewrite(os.path.join(deck_dir, "images", "logo.png"), b"new-png-bytes")
+    with_new_image = _fingerprint(deck_dir)
+    assert with_new_image != original
+
+    _rewrite(os.path.join(deck_dir, "01_a.md"), b"# B")
+    assert _fingerprint(deck_dir) not in (original, with_new_image)
+
+
+def test_spool_is_visible_to_other_instances(deck_dir):
+    """Test that spooled PDFs are visible to other cache instances."""
+    cache_dir = os.path.join(deck_dir, "cache")
+    assert not PdfCache(cache_dir).contains("abc")
+
+    with PdfCache(cache_dir).spool("abc") as f:
+        f.write(b"%PDF-data")
+    path = PdfCache(cache_dir).path("abc")
+    assert os.path.basename(path) == "abc.pdf"
+    with open(path, "rb") as f:
+        assert f.read() == b"%PDF-data"
+    assert PdfCache(cache_dir).contains("abc")
+    assert os.listdir(cache_dir) == ["abc.pdf"]  # no leftover temp files
+
+
+def test_spool_failure_leaves_no_file(deck_dir):
+    """Test that an aborted spool neither creates the PDF nor leaks temp files."""
+    cache = PdfCache(os.path.join(deck_dir, "cache"))
+    with pytest.raises(RuntimeError):
+        with cache.spool("abc") as f:
+            f.write(b"%PDF-partial")
+            raise RuntimeError("render failed")
+    assert not cache.contains("abc")
+    assert os.listdir(cache.cache_dir) == []
+
+
+def test_prune_keeps_only_current_keys(deck_dir):
+    """Test that pruning deletes outdated PDFs together with their lock files."""
+    cache = PdfCache(os.path.join(deck_dir, "cache"))
+    for key in ("old", "current"):
+        with cache.lock(key), cache.spool(key) as f:
+            f.write(b"%PDF")
+    os.makedirs(os.path.join(cache.cache_dir, "fragments"))
+
+    assert cache.prune({"current"}) == ["old"]
+    assert sorted(os.listdir(cache.cache_dir)) == [
+        ".current.lock",
+        "current.pdf",
+        "fragments",
+    ]
+
+
+def test_evicts_least_recently_used(deck_dir):
+    """Test that a bounded cache evicts the entry used longest ago."""
+    cache = PdfCache(os.path.join(deck_dir, "cache"), max_entries=2)
+    for num, key in enumerate(("a", "b")):
+        with cache.spool(key) as f:
+            f.write(b"%PDF")
+        os.utime(cache.path(key), (num, num))
+    cache.touch("a")
+
+    with cache.spool("c") as f:
+        f.write(b"%PDF")
+    assert sorted(cache.keys()) == ["a", "c"]
@@ -0,0 +1,123 @@
+import io
+import os
+import tempfile
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+
+from pdf_fragments import (
+    format_slide_selection,
+    fragment_key,
+    merge_pdfs,
+    parse_slide_selection,
+)
+
+
+def test_parse_slide_selection():
+    """Test single slides, ranges, open ranges and lists."""
+    assert parse_slide_selection("3-5", 10) == (3, 4, 5)
+    assert parse_slide_selection("4", 10) == (4,)
+    assert parse_slide_selection("8-", 10) == (8, 9, 10)
+    assert parse_slide_selection("5, 1-2,2", 10) == (1, 2, 5)
+    for invalid in ("0", "3-2", "11", "a-b", ""):
+        with pytest.raises(ValueError):
+            parse_slide_selection(invalid, 10)
+
+
+def test_format_slide_selection():
+    """Test that consecutive slides are collapsed into ranges."""
+    assert format_slide_selection((1, 2, 3, 5, 7, 8)) == "1-3,5,7-8"
+    assert format_slide_selection(()) == ""
+
+
+def test_fragment_key_follows_referenced_images():
+    """Test that the key changes with the content of referenced images only."""
+    with tempfile.TemporaryDirectory() as images_dir:
+        for name in ("a.png", "b.png"):
+            with open(os.path.join(images_dir, name), "wb") as f:
+                f.write(b"original")
+        html = '<img src="deck-asset:a.png">'
+        key = fragment_key(html, images_dir)
+
+        with open(os.path.join(images_dir, "b.png"), "wb") as f:
+            f.write(b"unrelated change")
+        assert fragment_key(html, images_dir) == key
+
+        with open(os.path.join(images_dir, "a.png"), "wb") as f:
+            f.write(b"changed image")
+        assert fragment_key(html, images_dir) != key
+        assert fragment_key(html, images_dir, "print-dpi:300") != key
+
+
+def test_merge_pdfs():
+    """Test that fragments are concatenated in order."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for i, width in enumerate((100, 200, 300)):
+            writer = PdfWriter()
+            writer.add_blank_page(width, 100)
+            path = os.path.join(temp_dir, f"{i}.pdf")
+            with open(path, "wb") as f:
+                writer.write(f)
+            paths.append(path)
+
+        merged = io.BytesIO()
+        merge_pdfs(paths, merged)
+        pages = PdfReader(merged).pages
+        assert [int(page.mediabox.width) for page in pages] == [100, 200, 300]
+
+
+def _fragment(path: str, title: str, logo: bytes):
+    from pypdf.generic import (
+        DecodedStreamObject,
+        DictionaryObject,
+        NameObject,
+        NumberObject,
+    )
+
+    writer = PdfWriter()
+    page = writer.add_blank_page(100, 100)
+    image = DecodedStreamObject()
+    image.set_data(logo)
+    image.update(
+        {
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Image"),
+            NameObject("/Width"): NumberObject(len(logo) // 3),
+            NameObject("/Height"): NumberObject(1),
+            NameObject("/ColorSpace"): NameObject("/DeviceRGB"),
+            NameObject("/BitsPerComponent"): NumberObject(8),
+        }
+    )
+    xobjects = DictionaryObject({NameObject("/Logo"): writer._add_object(image)})
+    page[NameObject("/Resources")] = DictionaryObject(
+        {NameObject("/XObject"): xobjects}
+    )
+    content = DecodedStreamObject()
+    content.set_data(f"q 50 0 0 10 0 0 cm /Logo Do Q % {title}".encode())
+    page.replace_contents(content)
+    writer.add_outline_item(title, 0)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_merge_pdfs_shares_identical_objects():
+    """Test that a logo in every fragment is stored once and bookmarks survive."""
+    logo = bytes(range(256)) * 60
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for i in range(5):
+            paths.append(os.path.join(temp_dir, f"{i}.pdf"))
+            _fragment(paths[-1], f"Folie {i + 1}", logo)
+
+        merged = io.BytesIO()
+        merge_pdfs(paths, merged)
+        assert merged.getvalue().count(logo) == 1
+        reader = PdfReader(merged, strict=True)
+        assert len(reader.pages) == 5
+        for num, page in enumerate(reader.pages, 1):
+            assert f"Folie {num}".encode() in page.get_contents().get_data()
+            assert page["/Resources"]["/XObject"]["/Logo"].get_data() == logo
+        titles = [item.title for item in reader.outline]
+        assert titles == [f"Folie {num}" for num in range(1, 6)]
+        assert reader.get_destination_page_number(reader.outline[3]) == 3
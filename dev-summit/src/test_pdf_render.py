@@ -0,0 +1,33 @@
+import os
+import tempfile
+
+from pdf_cache import PdfCache
+from pdf_render import render_fragments
+
+
+def _jobs(count):
+    return [
+        (f"key{i}", f"<html><body><p>Folie {i}</p></body></html>") for i in range(count)
+    ]
+
+
+def test_render_fragments_in_process_pool():
+    """Test that missing fragments are rendered by a process pool."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PdfCache(temp_dir)
+        render_fragments(cache, _jobs(4), temp_dir, workers=2)
+        for key, _ in _jobs(4):
+            assert cache.contains(key)
+
+
+def test_render_fragments_skips_cached():
+    """Test that cached fragments are not rendered again."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PdfCache(temp_dir)
+        with cache.spool("key0") as f:
+            f.write(b"%PDF-cached")
+        render_fragments(cache, _jobs(2), temp_dir, workers=1)
+        with open(cache.path("key0"), "rb") as f:
+            assert f.read() == b"%PDF-cached"
+        assert cache.contains("key1")
+        assert len([f for f in os.listdir(temp_dir) if f.endswith(".pdf")]) == 2
@@ -0,0 +1,67 @@
+import gzip
+import os
+import tempfile
+
+import precompress
+from precompress import (
+    ENCODINGS,
+    MIN_SIZE,
+    CompressedCache,
+    compress,
+    write_precompressed,
+)
+
+
+def test_compress_roundtrip():
+    """Test that gzip output decompresses to the original data."""
+    data = b"<p>Folie</p>" * 100
+    assert gzip.decompress(compress(data, "gzip")) == data
+
+
+def test_write_precompressed_creates_siblings():
+    """Test that compressible files get smaller .gz/.br siblings."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "slide1.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("<p>Folie</p>" * 100)
+
+        written = write_precompressed(path)
+        assert path + ".gz" in written
+        assert len(written) == len(ENCODINGS)
+        for sibling in written:
+            assert os.path.getsize(sibling) < os.path.getsize(path)
+
+
+def test_write_precompressed_skips_small_files():
+    """Test that tiny files are left without siblings."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "tiny.svg")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("x" * (MIN_SIZE - 1))
+        assert write_precompressed(path) == []
+        assert not os.path.exists(path + ".gz")
+
+
+def test_compressed_cache_is_bounded():
+    """Test that the cache reuses results and evicts least recently used."""
+    cache = CompressedCache(max_entries=2)
+    first = cache.get(b"a" * 1000, "gzip")
+    assert cache.get(b"a" * 1000, "gzip") is first
+    cache.get(b"b" * 1000, "gzip")
+    cache.get(b"c" * 1000, "gzip")
+    assert len(cache) == 2
+    assert cache.get(b"a" * 1000, "gzip") is not first
+
+
+def test_compressed_cache_uses_dynamic_quality(monkeypatch):
+    """Test that on-the-fly compression uses the cheaper brotli quality."""
+    calls = []
+
+    def fake_compress(data, encoding, quality=precompress.BROTLI_QUALITY_STATIC):
+        calls.append(quality)
+        return data[:10]
+
+    monkeypatch.setattr(precompress, "compress", fake_compress)
+    CompressedCache().get(b"x" * 1000, "br")
+    assert calls == [precompress.BROTLI_QUALITY_DYNAMIC]
+    assert precompress.BROTLI_QUALITY_DYNAMIC < precompress.BROTLI_QUALITY_STATIC
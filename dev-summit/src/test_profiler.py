@@ -0,0 +1,57 @@
+import os
+import tempfile
+import time
+
+import generate_static
+from profiler import SamplingProfiler, profile_static_build
+
+
+def _busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profiler_samples_calling_thread():
+    """Test that the sampled stacks contain the running function, root first."""
+    with SamplingProfiler(interval=0.001, label="test") as profiler:
+        _busy_loop(0.1)
+
+    assert profiler.samples > 0
+    stack = next(s for s in profiler.stacks if "_busy_loop" in s)
+    frames = stack.split(";")
+    assert frames[0] == "test"
+    assert frames[-1].startswith("_busy_loop (test_profiler.py:")
+
+
+def test_profile_written_as_folded_stacks():
+    """Test the ``stack count`` line format of written profiles."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with SamplingProfiler(interval=0.001) as profiler:
+            _busy_loop(0.05)
+        path = profiler.write("unit", temp_dir)
+        assert os.path.basename(path).startswith("unit-")
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    assert lines
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == profiler.samples
+
+
+def test_profile_static_build(monkeypatch):
+    """Test profiling a full static build in-process."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        slides_dir = os.path.join(temp_dir, "slides")
+        os.makedirs(slides_dir)
+        for idx in range(1, 4):
+            with open(
+                os.path.join(slides_dir, f"{idx:02d}_slide.md"), "w", encoding="utf-8"
+            ) as f:
+                f.write(f"# Folie {idx}\n")
+        output_dir = os.path.join(temp_dir, "out")
+        monkeypatch.setattr(generate_static, "SLIDES_DIR", slides_dir)
+        monkeypatch.setattr(generate_static, "OUTPUT_DIR", output_dir)
+        monkeypatch.setattr(generate_static, "STATIC_BUILD_WORKERS", 4)
+
+        profiler = profile_static_build(output_dir, interval=0.0005)
+        assert os.path.exists(os.path.join(output_dir, "slide3.html"))
+    assert all(stack.startswith("static;") for stack in profiler.stacks)
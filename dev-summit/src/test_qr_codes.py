@@ -0,0 +1,37 @@
+from urllib.parse import unquote
+
+from qr_codes import QrCodeCache, generate_qr_code
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the cache is bounded and keeps recently used entries."""
+    cache = QrCodeCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+    assert "b" not in cache
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cache.get("b") is None
+    assert cache.misses == 1
+
+
+def test_pinned_entries_are_not_evicted():
+    """Test that precomputed entries survive any number of other hosts."""
+    cache = QrCodeCache(max_entries=1)
+    cache.put("canonical", "QR", pin=True)
+    for i in range(10):
+        cache.put(f"host-{i}", "x")
+    assert cache.get("canonical") == "QR"
+    assert len(cache) == 2
+
+
+def test_svg_qr_code():
+    """Test the SVG data URL rendering."""
+    data_url = generate_qr_code("https://slides.example.com/export/pdf", "svg")
+    assert data_url.startswith("data:image/svg+xml,")
+    assert '"' not in data_url
+    svg = unquote(data_url.split(",", 1)[1])
+    assert svg.startswith("<svg ") and svg.endswith("</svg>")
+    assert "<path stroke='black' d='M" in svg
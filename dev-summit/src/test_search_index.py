@@ -0,0 +1,81 @@
+from search_index import SearchIndex, normalize, tokenize
+
+SLIDES = {
+    "01_start.md": "<h1>Übersicht</h1><p>Agenda für den Tag</p>",
+    "02_kafka.md": "<h1>Kafka</h1><p>Streams und Größe der Partitionen</p>",
+    "03_fazit.md": "<h2>Fazit</h2><p>Kafka &amp; Flink im Überblick</p>",
+}
+
+
+def _index(slides=None):
+    slides = dict(SLIDES if slides is None else slides)
+    index = SearchIndex()
+    # Der Inhalt selbst dient im Test als Digest
+    index.sync(list(slides), slides.__getitem__, slides.__getitem__)
+    return index, slides
+
+
+def test_umlaut_normalization():
+    """Test that umlauts, ß and accents match their ASCII spellings."""
+    assert normalize("Übersicht") == normalize("uebersicht") == "uebersicht"
+    assert tokenize("Größe straße Café") == ["groesse", "strasse", "cafe"]
+
+
+def test_search_matches_all_terms():
+    """Test that results contain every term and link to the slide number."""
+    index, _ = _index()
+    assert [r["num"] for r in index.search("kafka")] == [2, 3]
+    assert index.search("kafka flink") == [{"num": 3, "title": "Fazit", "score": 2}]
+    assert index.search("uebersicht")[0]["title"] == "Übersicht"
+    assert index.search("GROESSE")[0]["num"] == 2
+    assert not index.search("kafka agenda")
+    assert not index.search("  ")
+
+
+def test_last_term_matches_as_prefix():
+    """Test search-as-you-type on the last query term."""
+    index, _ = _index()
+    assert [r["num"] for r in index.search("überb")] == [3]
+    assert [r["num"] for r in index.search("über")] == [1, 3]
+
+
+def test_title_matches_rank_first():
+    """Test that a heading match outranks a body match."""
+    index, _ = _index()
+    assert index.search("kafka")[0]["num"] == 2
+
+
+def test_incremental_update(monkeypatch):
+    """Test that only changed slides are re-indexed and removed ones dropped."""
+    index, slides = _index()
+    tokenized = []
+    original_add = SearchIndex._add
+
+    def counting_add(self, filename, digest, source):
+        tokenized.append(filename)
+        original_add(self, filename, digest, source)
+
+    monkeypatch.setattr(SearchIndex, "_add", counting_add)
+    slides["02_kafka.md"] = "<h1>Pulsar</h1>"
+    del slides["03_fazit.md"]
+    index.sync(list(slides), slides.get, slides.get)
+    assert tokenized == ["02_kafka.md"]
+    assert not index.search("kafka")
+    assert index.search("pulsar")[0]["num"] == 2
+    assert len(index) == 2
+
+
+def test_unchanged_digest_is_not_rendered():
+    """Test that slides with a known digest are neither rendered nor re-indexed."""
+    index = SearchIndex()
+    assert not index.synced
+    index.sync(["a"], lambda _: "v1", lambda _: "<p>eins</p>")
+    assert index.synced
+
+    def render(_):
+        raise AssertionError("rendered although the digest is unchanged")
+
+    index.sync(["a"], lambda _: "v1", render)
+    assert index.search("eins")
+    index.sync(["a"], lambda _: "v2", lambda _: "<p>zwei</p>")
+    assert index.search("zwei")
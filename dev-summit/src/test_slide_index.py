@@ -0,0 +1,88 @@
+import os
+import tempfile
+import time
+
+import pytest
+
+from slide_index import SlideIndex, extract_number, get_index
+
+
+def _touch(directory, filename, content="test"):
+    with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _bump_mtime(directory):
+    stat = os.stat(directory)
+    os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def slides_dir():
+    """Create a temporary slide directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for filename in ["10_slide.md", "2_slide.md", "1_slide.md", "notes.txt"]:
+            _touch(temp_dir, filename)
+        yield temp_dir
+
+
+def test_extract_number():
+    """Test slide number extraction from file names."""
+    assert extract_number("12_slide.md") == 12
+    assert extract_number("intro.md") == 0
+
+
+def test_files_sorted_by_number(slides_dir):
+    """Test that only Markdown files are listed, sorted by number."""
+    index = SlideIndex(slides_dir)
+    assert index.files() == ("1_slide.md", "2_slide.md", "10_slide.md")
+    assert len(index) == 3
+
+
+def test_get_by_slide_number(slides_dir):
+    """Test lookup by 1-based slide number."""
+    index = SlideIndex(slides_dir)
+    assert index.get(1) == "1_slide.md"
+    assert index.get(3) == "10_slide.md"
+    assert index.get(0) is None
+    assert index.get(4) is None
+
+
+def test_refresh_only_on_directory_change(slides_dir):
+    """Test that the directory is rescanned only when its mtime changes."""
+    index = SlideIndex(slides_dir)
+    index.files()
+    assert not index.refresh()
+
+    _touch(slides_dir, "3_slide.md")
+    _bump_mtime(slides_dir)
+    assert index.get(3) == "3_slide.md"
+    assert len(index) == 4
+
+
+def test_missing_directory():
+    """Test that a missing directory yields an empty index."""
+    index = SlideIndex(os.path.join(tempfile.gettempdir(), "does-not-exist-slides"))
+    assert index.files() == ()
+
+
+def test_watcher_notifies_on_change(slides_dir):
+    """Test that the background watcher picks up new slides."""
+    index = SlideIndex(slides_dir)
+    changes = []
+    index.start_watcher(interval=0.01, on_change=changes.append)
+    try:
+        _touch(slides_dir, "4_slide.md")
+        _bump_mtime(slides_dir)
+        deadline = time.monotonic() + 2
+        while not changes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert changes == [index]
+        assert "4_slide.md" in index.files()
+    finally:
+        index.stop_watcher()
+
+
+def test_get_index_is_shared(slides_dir):
+    """Test that the same index instance is returned per directory."""
+    assert get_index(slides_dir) is get_index(slides_dir)
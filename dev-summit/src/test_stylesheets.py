@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+
+import stylesheets
+from stylesheets import (
+    PRINT_CSS,
+    SCREEN_CSS,
+    SCREEN_JS,
+    find_stylesheet,
+    minify_css,
+    stylesheet,
+)
+
+
+def test_minify_css():
+    """Test that comments and insignificant whitespace are removed."""
+    css = """
+    /* Kommentar */
+    .nav a:hover,
+    .nav > a {
+        color: #555;
+        margin: 0 1em;
+    }
+    .slide :first-child { width: calc(100% - 2em); }
+    """
+    assert minify_css(css) == (
+        ".nav a:hover,.nav>a{color:#555;margin:0 1em}"
+        ".slide :first-child{width:calc(100% - 2em)}"
+    )
+
+
+def test_shipped_stylesheets_are_fingerprinted():
+    """Test the fingerprinted names of the screen and print stylesheets."""
+    for name in (SCREEN_CSS, PRINT_CSS):
+        sheet = stylesheet(name)
+        stem = name.rsplit(".", 1)[0]
+        assert sheet.fingerprinted.startswith(f"{stem}.")
+        assert sheet.fingerprinted.endswith(".css")
+        assert find_stylesheet(sheet.fingerprinted) is sheet
+    assert find_stylesheet("slides.000000000000.css") is None
+
+
+def test_script_is_fingerprinted_unminified():
+    """Test that the page script gets a fingerprint but keeps its text."""
+    sheet = stylesheet(SCREEN_JS)
+    assert sheet.fingerprinted.startswith("slides.")
+    assert sheet.fingerprinted.endswith(".js")
+    assert find_stylesheet(sheet.fingerprinted) is sheet
+    with open(os.path.join(stylesheets.STYLES_DIR, SCREEN_JS), encoding="utf-8") as f:
+        assert sheet.text == f.read()
+
+
+def test_changed_stylesheet_gets_new_name(monkeypatch):
+    """Test that editing a stylesheet changes its fingerprint."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name in (SCREEN_CSS, PRINT_CSS):
+            shutil.copy(os.path.join(stylesheets.STYLES_DIR, name), temp_dir)
+        monkeypatch.setattr(stylesheets, "STYLES_DIR", temp_dir)
+        monkeypatch.setattr(stylesheets, "_STYLESHEETS", {})
+        before = stylesheet(SCREEN_CSS)
+        assert stylesheet(SCREEN_CSS) is before
+
+        with open(os.path.join(temp_dir, SCREEN_CSS), "a", encoding="utf-8") as f:
+            f.write("\n.extra { color: red; }\n")
+        after = stylesheet(SCREEN_CSS)
+        assert after.fingerprinted != before.fingerprinted
+        assert after.text.endswith(".extra{color:red}")
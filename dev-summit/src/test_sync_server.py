@@ -0,0 +1,184 @@
+import asyncio
+import json
+import socket
+
+import sync_server
+from sync_server import BroadcastHub, SyncServer
+
+
+def test_hub_keeps_only_latest_slide_per_subscriber():
+    """Test that a slow subscriber only receives the newest slide."""
+
+    async def scenario():
+        hub = BroadcastHub()
+        queue = hub.subscribe()
+        assert hub.publish(2) == 1
+        hub.publish(5)
+        assert queue.qsize() == 1
+        assert b'"slide": 5' in await queue.get()
+
+    asyncio.run(scenario())
+
+
+def test_hub_sends_current_slide_on_subscribe():
+    """Test that late subscribers start with the current slide."""
+
+    async def scenario():
+        hub = BroadcastHub()
+        hub.publish(3)
+        queue = hub.subscribe()
+        assert b'"slide": 3' in queue.get_nowait()
+        hub.unsubscribe(queue)
+        assert len(hub) == 0
+
+    asyncio.run(scenario())
+
+
+async def _request(port, method, path, body=b"", headers=()):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    lines = [f"{method} {path} HTTP/1.1", "Host: localhost", *headers]
+    lines.append(f"Content-Length: {len(body)}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+def test_presenter_update_reaches_event_stream():
+    """Test the round trip from presenter POST to an audience SSE stream."""
+
+    async def scenario():
+        sync = SyncServer(token="secret")
+        server = await sync.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        head = await reader.readuntil(b"retry: 3000\n\n")
+        assert b"text/event-stream" in head
+
+        body = json.dumps({"slide": 4}).encode()
+        denied = await _request(port, "POST", "/presenter", body)
+        assert denied.startswith(b"HTTP/1.1 403")
+        assert sync.hub().slide is None
+
+        response = await _request(
+            port, "POST", "/presenter", body, ["Authorization: Bearer secret"]
+        )
+        assert response.startswith(b"HTTP/1.1 200")
+        assert json.loads(response.split(b"\r\n\r\n", 1)[1]) == {"clients": 1}
+
+        event = await asyncio.wait_for(reader.readuntil(b"\n\n"), 5)
+        assert event == b'id: 1\nevent: slide\ndata: {"slide": 4}\n\n'
+
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_presenter_rejects_invalid_body():
+    """Test that malformed presenter updates are rejected."""
+
+    async def scenario():
+        sync = SyncServer(token="secret")
+        server = await sync.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        response = await _request(
+            port, "POST", "/presenter", b"{}", ["Authorization: Bearer secret"]
+        )
+        assert response.startswith(b"HTTP/1.1 400")
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_decks_have_separate_channels():
+    """Test that a presenter update only reaches the audience of its deck."""
+
+    async def scenario():
+        sync = SyncServer(token="secret")
+        server = await sync.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        streams = {}
+        for deck in ("talk-a", "talk-b"):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET /events?deck={deck} HTTP/1.1\r\n\r\n".encode())
+            await reader.readuntil(b"retry: 3000\n\n")
+            streams[deck] = reader, writer
+
+        auth = ["Authorization: Bearer secret"]
+        for deck, slide in (("talk-a", 2), ("talk-b", 7)):
+            body = json.dumps({"slide": slide}).encode()
+            response = await _request(
+                port, "POST", f"/presenter?deck={deck}", body, auth
+            )
+            assert json.loads(response.split(b"\r\n\r\n", 1)[1]) == {"clients": 1}
+
+        for deck, slide in (("talk-a", 2), ("talk-b", 7)):
+            reader, writer = streams[deck]
+            event = await asyncio.wait_for(reader.readuntil(b"\n\n"), 5)
+            assert (
+                event == f'id: 1\nevent: slide\ndata: {{"slide": {slide}}}\n\n'.encode()
+            )
+            writer.close()
+        assert sync.hub().slide is None
+
+        body = json.dumps({"slide": 1}).encode()
+        invalid = await _request(port, "POST", "/presenter?deck=../x", body, auth)
+        assert invalid.startswith(b"HTTP/1.1 404")
+        health = await _request(port, "GET", "/healthz?deck=talk-b")
+        assert json.loads(health.split(b"\r\n\r\n", 1)[1])["slide"] == 7
+
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_deck_channels_are_bounded(monkeypatch):
+    """Test that invalid deck names and channels beyond the limit are refused."""
+    monkeypatch.setattr(sync_server, "MAX_DECKS", 2)
+    sync = SyncServer()
+    assert sync.hub("../x") is None
+    sync.hub("a").publish(1)
+    sync.hub("b").publish(1)
+    assert sync.hub("c") is None
+    assert sync.hub("a") is sync.hubs["a"]
+
+
+async def _wait_for_clients(hub, count, timeout=5):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while len(hub) != count:
+        assert loop.time() < deadline, f"{len(hub)} clients, expected {count}"
+        await asyncio.sleep(0.01)
+
+
+def test_stalled_client_is_disconnected(monkeypatch):
+    """Test that a client that never reads is dropped and unsubscribed."""
+    monkeypatch.setattr(sync_server, "HEARTBEAT", b": " + b"x" * 2**20 + b"\n\n")
+    monkeypatch.setattr(sync_server, "HEARTBEAT_INTERVAL", 0.01)
+    monkeypatch.setattr(sync_server, "DRAIN_TIMEOUT", 0.2)
+
+    async def scenario():
+        sync = SyncServer()
+        server = await sync.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        sock = socket.socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.connect(("127.0.0.1", port))
+        sock.sendall(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await _wait_for_clients(sync.hub(), 1)
+        # Der Client liest nie; der Server muss ihn trotzdem wieder loswerden
+        await _wait_for_clients(sync.hub(), 0)
+
+        sock.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
@@ -40,7 +40,7 @@ resource "google_cloud_run_v2_service" "dev_summit_backend" {
 
       liveness_probe {
         http_get {
-          path = "/"
+          path = "/healthz"
           port = local.port
         }
         period_seconds        = 60
@@ -49,7 +49,7 @@ resource "google_cloud_run_v2_service" "dev_summit_backend" {
 
       startup_probe {
         http_get {
-          path = "/"
+          path = "/readyz"
           port = local.port
         }
         period_seconds        = 5